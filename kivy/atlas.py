@@ -73,6 +73,25 @@ You can combine all the png into one, and generate the atlas file with::
 
 As you can see, we got 2 new files: ``myatlas.atlas`` and ``myatlas-0.png``.
 
+.. versionchanged:: 1.3.0
+
+    The images are packed with :class:`MaxRectsPacker`. You can give options
+    before the basename, after a ``--`` to separate them from the Kivy
+    options::
+
+        $ python -m kivy.atlas -- --heuristic=best-area-fit --trim \\
+            --padding=2 myatlas 256 *.png
+
+    - ``--heuristic``: one of :data:`MaxRectsPacker.heuristics`, default to
+      ``best-short-side-fit``
+    - ``--padding``: padding around each image, default to 1
+    - ``--trim``: remove the transparent borders of the images
+    - ``--no-duplicates``: disable the duplicate detection. By default,
+      identical images are stored only once in the atlas.
+
+    The packing efficiency (used area of the atlas images) is displayed at
+    the end.
+
 .. note::
 
     When using this script, the ids referenced in the atlas is the basename of
@@ -114,12 +133,40 @@ Manual usage of the Atlas
     ['bubble', 'bubble-red', 'button', 'button-down']
     >>> print atlas['button']
     <kivy.graphics.texture.TextureRegion object at 0x2404d10>
+
+Dynamic atlas
+-------------
+
+.. versionadded:: 1.3.0
+
+A :class:`DynamicAtlas` is filled at runtime: you ask for a free region of a
+given size, and get a :class:`~kivy.graphics.texture.TextureRegion` of one of
+the atlas textures. All the regions of the same page share the same OpenGL
+texture, so the graphics compiler can avoid binding the texture again between
+two drawings::
+
+    >>> from kivy.atlas import DynamicAtlas
+    >>> atlas = DynamicAtlas(size=512)
+    >>> region = atlas.allocate(64, 32)
+    >>> region.blit_buffer(data, colorfmt='rgba')
+
+The space used by a region is released as soon as the region is not used
+anymore (garbage collected). The core :class:`~kivy.core.text.Label` can use
+a shared atlas for small texts with the `atlas` option.
+
+.. warning::
+
+    The tex_coords of a region are not between 0 and 1. Don't use a region if
+    you need to compute texture coordinates yourself, or to repeat the
+    texture.
 '''
 
-__all__ = ('Atlas', )
+__all__ = ('Atlas', 'DynamicAtlas', 'MaxRectsPacker', 'ShelfPacker')
 
 import json
+from hashlib import md5
 from os.path import basename, dirname, join, splitext
+from weakref import ref
 from kivy.event import EventDispatcher
 from kivy.logger import Logger
 from kivy.properties import AliasProperty, DictProperty
@@ -190,10 +237,15 @@ class Atlas(EventDispatcher):
         self.textures = textures
 
     @staticmethod
-    def create(outname, filenames, size, padding=1):
+    def create(outname, filenames, size, padding=1,
+               heuristic='best-short-side-fit', trim=False, duplicates=True):
         '''This method can be used to create manually an atlas from a set of
         images.
 
+        .. versionchanged:: 1.3.0
+            `heuristic`, `trim` and `duplicates` have been added. The images
+            are now packed with :class:`MaxRectsPacker`.
+
         :Parameters:
             `outname`: str
                 Basename to use for ``.atlas`` creation and ``-<idx>.png``
@@ -207,10 +259,17 @@ class Atlas(EventDispatcher):
                 be some issues with OpenGL, because by default, Kivy texture are
                 using GL_CLAMP_TO_EDGE, and the edge is another image than
                 the image you'll want to display.
+            `heuristic`: str, default to 'best-short-side-fit'
+                Heuristic used to choose the place of an image. Check
+                :data:`MaxRectsPacker.heuristics`.
+            `trim`: bool, default to False
+                If True, the transparent borders of the images are removed.
+                The region of the image in the atlas will be smaller than the
+                original image.
+            `duplicates`: bool, default to True
+                If True, identical images are stored only once, and all their
+                ids reference the same region.
         '''
-        # Thanks to
-        # omnisaurusgames.com/2011/06/texture-atlas-generation-using-python/
-        # for its initial implementation.
         try:
             import Image
         except ImportError:
@@ -220,74 +279,68 @@ class Atlas(EventDispatcher):
         size = int(size)
 
         # open all of the images
-        ims = [(f, Image.open(f)) for f in filenames]
-
-        # sort by image area
-        ims = sorted(ims, key=lambda im: im[1].size[0] * im[1].size[1],
-                reverse=True)
-
-        # free boxes are empty space in our output image set
-        # the freebox tuple format is: outidx, x, y, w, h
-        freeboxes = [(0, 0, 0, size, size)]
-        numoutimages = 1
-        padding = 1
-
-        # full boxes are areas where we have placed images in the atlas
-        # the full box tuple format is: image, outidx, x, y, w, h, filename
+        ims = []
+        for filename in filenames:
+            im = Image.open(filename)
+            if trim and 'A' in im.getbands():
+                bbox = im.split()[-1].getbbox()
+                if bbox is not None:
+                    im = im.crop(bbox)
+            ims.append((filename, im))
+
+        # find the duplicates images, only the first one will be packed
+        # the image tuple format is: filename, image, list of filenames
+        images = []
+        if duplicates:
+            hashes = {}
+            for filename, im in ims:
+                data = im.tobytes() if hasattr(im, 'tobytes') \
+                        else im.tostring()
+                key = (im.size, im.mode, md5(data).hexdigest())
+                if key in hashes:
+                    hashes[key][2].append(filename)
+                    continue
+                hashes[key] = image = (filename, im, [filename])
+                images.append(image)
+        else:
+            images = [(filename, im, [filename]) for filename, im in ims]
+
+        # sort by the longest side, it's give the best results with maxrects
+        images = sorted(images, key=lambda im: max(im[1].size), reverse=True)
+
+        # pack the images, and add a new output image if the image doesn't
+        # fit in the current ones.
+        # the full box tuple format is: image, outidx, x, y, w, h, filenames
+        packers = []
         fullboxes = []
-
-        # do the actual atlasing by sticking the largest images we can have into
-        # the smallest valid free boxes
-        for imageinfo in ims:
-            im = imageinfo[1]
+        for filename, im, names in images:
             imw, imh = im.size
             imw += padding
             imh += padding
             if imw > size or imh > size:
                 Logger.error('Atlas: image %s is larger than the atlas size!'%\
-                    imageinfo[0])
+                    filename)
                 return
 
-            inserted = False
-            while not inserted:
-                for idx, fb in enumerate(freeboxes):
-                    # find the smallest free box that will contain this image
-                    if fb[3] >= imw and fb[4] >= imh:
-                        # we found a valid spot! Remove the current freebox, and
-                        # split the leftover space into (up to) two new
-                        # freeboxes
-                        del freeboxes[idx]
-                        if fb[3] > imw:
-                            freeboxes.append((
-                                fb[0], fb[1] + imw, fb[2],
-                                fb[3] - imw, imh))
-
-                        if fb[4] > imh:
-                            freeboxes.append((
-                                fb[0], fb[1], fb[2] + imh,
-                                fb[3], fb[4] - imh))
-
-                        # keep this sorted!
-                        freeboxes = sorted(freeboxes,
-                                key=lambda fb: fb[3] * fb[4])
-                        fullboxes.append((im,
-                            fb[0], fb[1] + padding,
-                            fb[2] + padding, imw - padding,
-                            imh - padding, imageinfo[0]))
-                        inserted = True
-                        break
+            for outidx, packer in enumerate(packers):
+                pos = packer.insert(imw, imh)
+                if pos is not None:
+                    break
+            else:
+                packer = MaxRectsPacker(size, size, heuristic)
+                packers.append(packer)
+                outidx = len(packers) - 1
+                pos = packer.insert(imw, imh)
 
-                if not inserted:
-                    # oh crap - there isn't room in any of our free boxes, so we
-                    # have to add a new output image
-                    freeboxes.append((numoutimages, 0, 0, size, size))
-                    numoutimages += 1
+            x, y = pos
+            fullboxes.append((im, outidx, x + padding, y + padding,
+                              imw - padding, imh - padding, names))
 
         # now that we've figured out where everything goes, make the output
         # images and blit the source images to the approriate locations
         Logger.info('Atlas: create an {0}x{0} rgba image'.format(size))
         outimages = [Image.new('RGBA', (size, size))
-                for i in range(0, int(numoutimages))]
+                for i in range(0, len(packers))]
         for fb in fullboxes:
             outimages[fb[1]].paste(fb[0], (fb[2], fb[3]))
 
@@ -304,11 +357,16 @@ class Atlas(EventDispatcher):
             else:
                 d = meta[fn]
 
-            # fb[6] contain the filename aka '../apok.png'. just get only 'apok'
-            # as the uniq id.
-            uid = splitext(basename(fb[6]))[0]
+            # fb[6] contain the filenames aka '../apok.png'. just get only
+            # 'apok' as the uniq id.
             x, y, w, h = fb[2:6]
-            d[uid] = x, size-y-h, w, h
+            for filename in fb[6]:
+                uid = splitext(basename(filename))[0]
+                d[uid] = x, size-y-h, w, h
+
+        for idx, packer in enumerate(packers):
+            Logger.info('Atlas: %s-%d.png efficiency is %.1f%%' % (
+                basename(outname), idx, packer.occupancy * 100))
 
         outfn = '%s.atlas' % outname
         with open(outfn, 'w') as fd:
@@ -316,13 +374,400 @@ class Atlas(EventDispatcher):
 
         return outfn, meta
 
+
+class MaxRectsPacker(object):
+    '''Pack rectangles inside a fixed area, using the MaxRects algorithm:
+    the packer keeps the list of the maximal free rectangles, and place each
+    new rectangle in the free rectangle choosen by the heuristic.
+
+    .. versionadded:: 1.3.0
+
+    :Parameters:
+        `width`: int
+            Width of the area
+        `height`: int
+            Height of the area
+        `heuristic`: str, default to 'best-short-side-fit'
+            One of :data:`heuristics`
+    '''
+
+    #: List of the available heuristics:
+    #:
+    #: - best-short-side-fit: minimize the shortest leftover side
+    #: - best-long-side-fit: minimize the longest leftover side
+    #: - best-area-fit: minimize the leftover area
+    #: - bottom-left: place the rectangle as low as possible
+    heuristics = ('best-short-side-fit', 'best-long-side-fit',
+                  'best-area-fit', 'bottom-left')
+
+    def __init__(self, width, height, heuristic='best-short-side-fit'):
+        if heuristic not in self.heuristics:
+            raise ValueError('Invalid heuristic %r, must be one of %r' % (
+                heuristic, self.heuristics))
+        self.width = width
+        self.height = height
+        self.heuristic = heuristic
+        self.free_rects = [(0, 0, width, height)]
+        self.used_area = 0
+
+    def insert(self, width, height):
+        '''Find a place for a rectangle of (width, height). Return the (x, y)
+        position of the rectangle, or None if there is no place left.
+        '''
+        heuristic = self.heuristic
+        best = None
+        best_score = None
+        for fx, fy, fw, fh in self.free_rects:
+            if fw < width or fh < height:
+                continue
+            dw = fw - width
+            dh = fh - height
+            if heuristic == 'best-short-side-fit':
+                score = min(dw, dh), max(dw, dh)
+            elif heuristic == 'best-long-side-fit':
+                score = max(dw, dh), min(dw, dh)
+            elif heuristic == 'best-area-fit':
+                score = fw * fh - width * height, min(dw, dh)
+            else:
+                score = fy + height, fx
+            if best_score is None or score < best_score:
+                best_score = score
+                best = fx, fy
+
+        if best is None:
+            return None
+        self._split(best[0], best[1], width, height)
+        self.used_area += width * height
+        return best
+
+    def _split(self, x, y, w, h):
+        # split all the free rectangles that intersect the new one
+        kept = []
+        splitted = []
+        for rect in self.free_rects:
+            fx, fy, fw, fh = rect
+            if x >= fx + fw or x + w <= fx or y >= fy + fh or y + h <= fy:
+                kept.append(rect)
+                continue
+            if x > fx:
+                splitted.append((fx, fy, x - fx, fh))
+            if x + w < fx + fw:
+                splitted.append((x + w, fy, fx + fw - x - w, fh))
+            if y > fy:
+                splitted.append((fx, fy, fw, y - fy))
+            if y + h < fy + fh:
+                splitted.append((fx, y + h, fw, fy + fh - y - h))
+
+        # remove the new free rectangles contained in another one. The kept
+        # rectangles can't be contained in a new one, no need to check them.
+        for index, rect in enumerate(splitted):
+            rx, ry, rw, rh = rect
+            for other_index, other in enumerate(splitted):
+                if other_index == index or other is None:
+                    continue
+                ox, oy, ow, oh = other
+                if ox <= rx and oy <= ry and rx + rw <= ox + ow and \
+                        ry + rh <= oy + oh:
+                    splitted[index] = None
+                    break
+            else:
+                for ox, oy, ow, oh in kept:
+                    if ox <= rx and oy <= ry and rx + rw <= ox + ow and \
+                            ry + rh <= oy + oh:
+                        splitted[index] = None
+                        break
+
+        kept.extend([rect for rect in splitted if rect is not None])
+        self.free_rects = kept
+
+    @property
+    def occupancy(self):
+        '''Ratio of the area used by the rectangles (readonly)
+        '''
+        return self.used_area / float(self.width * self.height)
+
+
+class _Shelf(object):
+
+    __slots__ = ('y', 'height', 'cursor', 'count', 'spans')
+
+    def __init__(self, y, height):
+        self.y = y
+        self.height = height
+        self.cursor = 0
+        self.count = 0
+        # free spans inside the shelf, left by removed rectangles: [x, width]
+        self.spans = []
+
+
+class ShelfPacker(object):
+    '''Allocate rectangles inside a fixed area, using shelves: the area is
+    cut in horizontal shelves, and rectangles are put side by side in the
+    shelf that waste the less height.
+
+    When a rectangle is removed, its place can be reused by another rectangle
+    of the same shelf. When a shelf is empty, it's merged with its empty
+    neighbours, and can be reused for rectangles of any height.
+
+    .. versionadded:: 1.3.0
+
+    :Parameters:
+        `width`: int
+            Width of the area
+        `height`: int
+            Height of the area
+        `padding`: int, default to 1
+            Space to keep on the right and on the top of each rectangle
+    '''
+
+    def __init__(self, width, height, padding=1):
+        self.width = width
+        self.height = height
+        self.padding = padding
+        self.shelves = []
+        self.count = 0
+        self.used_area = 0
+
+    def insert(self, width, height):
+        '''Find a place for a rectangle of (width, height). Return the (x, y)
+        position of the rectangle, or None if there is no place left.
+        '''
+        w = width + self.padding
+        h = height + self.padding
+        if w > self.width or h > self.height:
+            return None
+
+        # search the shelf that fit the best the rectangle
+        best = None
+        for index, shelf in enumerate(self.shelves):
+            if shelf.height < h:
+                continue
+            # don't waste a big shelf for a small rectangle, except if the
+            # shelf is empty: it will be splitted.
+            if shelf.count and shelf.height > h * 2:
+                continue
+            if shelf.count and self.width - shelf.cursor < w and \
+                    not [span for span in shelf.spans if span[1] >= w]:
+                continue
+            if best is None or shelf.height < self.shelves[best].height:
+                best = index
+                if shelf.height == h:
+                    break
+
+        if best is None:
+            # no shelf found, create a new one on the top
+            top = 0
+            if self.shelves:
+                top = self.shelves[-1].y + self.shelves[-1].height
+            if top + h > self.height:
+                return None
+            shelf = _Shelf(top, h)
+            self.shelves.append(shelf)
+        else:
+            shelf = self.shelves[best]
+            if shelf.count == 0 and shelf.height > h:
+                # split the empty shelf, keep the rest for others rectangles
+                self.shelves.insert(best + 1,
+                        _Shelf(shelf.y + h, shelf.height - h))
+                shelf.height = h
+
+        # first, reuse a free span
+        x = None
+        for span in shelf.spans:
+            if span[1] < w:
+                continue
+            x = span[0]
+            if span[1] == w:
+                shelf.spans.remove(span)
+            else:
+                span[0] += w
+                span[1] -= w
+            break
+        if x is None:
+            x = shelf.cursor
+            shelf.cursor += w
+
+        shelf.count += 1
+        self.count += 1
+        self.used_area += w * h
+        return x, shelf.y
+
+    def remove(self, x, y, width, height):
+        '''Release the place of a rectangle previously returned by
+        :meth:`insert`.
+        '''
+        w = width + self.padding
+        h = height + self.padding
+        shelves = self.shelves
+        for index, shelf in enumerate(shelves):
+            if shelf.y == y:
+                break
+        else:
+            return
+
+        shelf.count -= 1
+        self.count -= 1
+        self.used_area -= w * h
+
+        if shelf.count == 0:
+            shelf.cursor = 0
+            shelf.spans = []
+
+            # merge with empty neighbours
+            if index + 1 < len(shelves) and shelves[index + 1].count == 0:
+                shelf.height += shelves.pop(index + 1).height
+            if index > 0 and shelves[index - 1].count == 0:
+                shelves[index - 1].height += shelves.pop(index).height
+
+            # give back the space of the last empty shelf
+            if shelves and shelves[-1].count == 0:
+                shelves.pop()
+            return
+
+        # add a free span, merged with the adjacent ones
+        spans = shelf.spans
+        spans.append([x, w])
+        spans.sort()
+        merged = [spans[0]]
+        for span in spans[1:]:
+            last = merged[-1]
+            if last[0] + last[1] == span[0]:
+                last[1] += span[1]
+            else:
+                merged.append(span)
+        if merged[-1][0] + merged[-1][1] == shelf.cursor:
+            shelf.cursor = merged.pop()[0]
+        shelf.spans = merged
+
+    @property
+    def occupancy(self):
+        '''Ratio of the area used by the rectangles (readonly)
+        '''
+        return self.used_area / float(self.width * self.height)
+
+
+class DynamicAtlas(object):
+    '''Texture atlas filled at runtime. See module documentation for more
+    information.
+
+    .. versionadded:: 1.3.0
+
+    :Parameters:
+        `size`: int, default to 512
+            Size of one texture of the atlas
+        `colorfmt`: str, default to 'rgba'
+            Color format of the atlas textures
+        `padding`: int, default to 1
+            Space to keep between two regions
+        `max_item_size`: int, default to size / 4
+            Maximum width or height of a region. Bigger regions are refused.
+        `max_pages`: int, default to 4
+            Maximum number of textures to create.
+    '''
+
+    def __init__(self, size=512, colorfmt='rgba', padding=1,
+                 max_item_size=None, max_pages=4):
+        self.size = size
+        self.colorfmt = colorfmt
+        self.padding = padding
+        self.max_item_size = max_item_size or size / 4
+        self.max_pages = max_pages
+        self.pages = []
+        self._regions = {}
+
+    def allocate(self, width, height):
+        '''Allocate a region of (width, height) in the atlas. Return a
+        :class:`~kivy.graphics.texture.TextureRegion`, or None if the region is
+        too big or if the atlas is full.
+        '''
+        if width > self.max_item_size or height > self.max_item_size:
+            return None
+
+        pos = None
+        for page in self.pages:
+            pos = page[1].insert(width, height)
+            if pos is not None:
+                break
+
+        if pos is None:
+            if len(self.pages) >= self.max_pages:
+                return None
+            page = self._create_page()
+            pos = page[1].insert(width, height)
+            if pos is None:
+                return None
+
+        x, y = pos
+        region = page[0].get_region(x, y, width, height)
+        self._regions[ref(region, self._release)] = (page, x, y, width, height)
+        return region
+
+    def _create_page(self):
+        from kivy.graphics.texture import Texture
+        texture = Texture.create(size=(self.size, self.size),
+                                 colorfmt=self.colorfmt)
+        page = [texture, ShelfPacker(self.size, self.size, self.padding)]
+        self.pages.append(page)
+        Logger.debug('Atlas: Create a new dynamic atlas page (%d)' %
+                     len(self.pages))
+        return page
+
+    def _release(self, region_ref):
+        info = self._regions.pop(region_ref, None)
+        if info is None:
+            return
+        page, x, y, width, height = info
+        packer = page[1]
+        packer.remove(x, y, width, height)
+
+        # keep at least one page, but free the other empty ones.
+        if packer.count == 0 and len(self.pages) > 1 and page in self.pages:
+            self.pages.remove(page)
+
+
 if __name__ == '__main__':
 
     import sys
-    argv = sys.argv[1:]
+    from getopt import getopt, GetoptError
+
+    def usage():
+        print 'Usage: python -m kivy.atlas -- [--heuristic=<name>] ' \
+              '[--padding=<int>] [--trim] [--no-duplicates] ' \
+              '<outname> <size> <img1.png> [<img2.png>, ...]'
+        print 'Available heuristics:', ', '.join(MaxRectsPacker.heuristics)
+
+    try:
+        opts, argv = getopt(sys.argv[1:], 'h',
+            ['help', 'heuristic=', 'padding=', 'trim', 'no-duplicates'])
+    except GetoptError, err:
+        print 'Error:', err
+        usage()
+        sys.exit(1)
+
+    kwargs = {}
+    for opt, arg in opts:
+        if opt in ('-h', '--help'):
+            usage()
+            sys.exit(0)
+        elif opt == '--heuristic':
+            if arg not in MaxRectsPacker.heuristics:
+                print 'Error: invalid heuristic', arg
+                usage()
+                sys.exit(1)
+            kwargs['heuristic'] = arg
+        elif opt == '--padding':
+            try:
+                kwargs['padding'] = int(arg)
+            except ValueError:
+                print 'Error: padding must be an integer'
+                sys.exit(1)
+        elif opt == '--trim':
+            kwargs['trim'] = True
+        elif opt == '--no-duplicates':
+            kwargs['duplicates'] = False
+
     if len(argv) < 3:
-        print 'Usage: python -m kivy.atlas <outname> <size> <img1.png>' \
-              '[<img2.png>, ...]'
+        usage()
         sys.exit(1)
 
     outname = argv[0]
@@ -333,7 +778,7 @@ if __name__ == '__main__':
         sys.exit(1)
 
     filenames = argv[2:]
-    ret = Atlas.create(outname, filenames, size)
+    ret = Atlas.create(outname, filenames, size, **kwargs)
     if not ret:
         print 'Error while creating atlas!'
         sys.exit(1)
@@ -342,4 +787,7 @@ if __name__ == '__main__':
     print 'Atlas created at', fn
     print '%d image%s have been created' % (len(meta),
             's' if len(meta) > 1 else '')
-
+    used = sum([w * h for ids in meta.itervalues()
+                for x, y, w, h in set(ids.values())])
+    print 'Packing efficiency: %.1f%%' % (
+            used * 100. / (len(meta) * size * size))
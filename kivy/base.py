@@ -14,6 +14,7 @@ __all__ = (
     'stopTouchApp',
 )
 
+from time import sleep
 from kivy.config import Config
 from kivy.logger import Logger
 from kivy.clock import Clock
@@ -88,6 +89,14 @@ class EventLoopBase(EventDispatcher):
         self.input_events = []
         self.postproc_modules = []
         self.status = 'idle'
+        self.ondemand = Config.getint('graphics', 'ondemand')
+        self._frame_active = True
+
+        #: .. versionadded:: 1.3.0
+        #:     Maximum time in seconds the event loop will wait in on-demand
+        #:     mode. Input providers that are not driven by the window are
+        #:     read at least at this interval.
+        self.idle_max_timeout = .1
         self.input_providers = []
         self.event_listeners = []
         self.window = None
@@ -259,6 +268,9 @@ class EventLoopBase(EventDispatcher):
         for mod in self.postproc_modules:
             self.input_events = mod.process(events=self.input_events)
 
+        if self.input_events:
+            self._frame_active = True
+
         # real dispatch input
         for etype, me in self.input_events:
             self.post_dispatch_input(etype, me)
@@ -270,16 +282,22 @@ class EventLoopBase(EventDispatcher):
         * it "tick" the clock to the next frame
         * read all input and dispatch event
         * dispatch on_update + on_draw + on_flip on window
+
+        .. versionchanged:: 1.3.0
+            If `ondemand` is set in the graphics configuration, wait for the
+            next input or clock event when nothing changed during the frame.
         '''
 
         # update dt
         Clock.tick()
+        self._frame_active = False
 
         # read and dispatch input from providers
         self.dispatch_input()
 
         window = self.window
         if window and window.canvas.needs_redraw:
+            self._frame_active = True
             Clock.tick_draw()
             window.dispatch('on_draw')
             window.dispatch('on_flip')
@@ -291,8 +309,34 @@ class EventLoopBase(EventDispatcher):
             self.exit()
             return False
 
+        # nothing happened, sleep until something need to be done
+        timeout = self.get_idle_timeout()
+        if timeout:
+            if window:
+                window.idle_wait(timeout)
+            else:
+                sleep(timeout)
+
         return self.quit
 
+    def get_idle_timeout(self):
+        '''Return how many seconds the event loop can wait before doing the
+        next frame, or None if the next frame must be done immediately. This
+        is always None if `ondemand` is not set in the graphics configuration.
+
+        The event loop doesn't wait if input events have been dispatched, a
+        touch is still active or the window have been redrawn during the last
+        frame.
+
+        .. versionadded:: 1.3.0
+        '''
+        if not self.ondemand or self._frame_active or self.me_list:
+            return None
+        timeout = Clock.get_next_timeout()
+        if timeout is None or timeout > self.idle_max_timeout:
+            timeout = self.idle_max_timeout
+        return timeout
+
     def run(self):
         '''Main loop'''
         while not self.quit:
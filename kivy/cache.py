@@ -26,6 +26,7 @@ not used the label since 5 seconds, and you've reach the limit.
 
 __all__ = ('Cache', )
 
+import heapq
 from os import environ
 from kivy.logger import Logger
 from kivy.clock import Clock
@@ -79,10 +80,11 @@ class Cache(object):
             Logger.warning('Cache: category <%s> not exist' % category)
             return
         timeout = timeout or cat['timeout']
-        # FIXME: activate purge when limit is hit
-        #limit = cat['limit']
-        #if limit is not None and len(Cache._objects[category]) >= limit:
-        #    Cache._purge_oldest(category)
+        limit = cat['limit']
+        if limit is not None and key not in Cache._objects[category] and \
+                len(Cache._objects[category]) >= limit:
+            Cache._purge_oldest(category,
+                    len(Cache._objects[category]) - limit + 1)
         Cache._objects[category][key] = {
             'object': obj,
             'timeout': timeout,
@@ -161,23 +163,13 @@ class Cache(object):
 
     @staticmethod
     def _purge_oldest(category, maxpurge=1):
-        print 'PURGE', category
-        import heapq
-        heap_list = []
-        for key in Cache._objects[category]:
-            obj = Cache._objects[category][key]
-            if obj['lastaccess'] == obj['timestamp']:
-                continue
-            heapq.heappush(heap_list, (obj['lastaccess'], key))
-            print '<<<', obj['lastaccess']
-        n = 0
-        while n < maxpurge:
-            try:
-                lastaccess, key = heapq.heappop(heap_list)
-                print '=>', key, lastaccess, Clock.get_time()
-            except Exception:
-                return
-            del Cache._objects[category][key]
+        # keep get() and append() cheap, the least recently used objects are
+        # searched only when the limit is reached.
+        objects = Cache._objects[category]
+        keys = heapq.nsmallest(maxpurge, objects,
+                key=lambda key: objects[key]['lastaccess'])
+        for key in keys:
+            del objects[key]
 
     @staticmethod
     def _purge_by_timeout(dt):
@@ -312,6 +312,24 @@ class ClockBase(object):
         '''Get time in seconds from the application start'''
         return self._last_tick - self._start_tick
 
+    def get_next_timeout(self):
+        '''Get the time in seconds before the next scheduled event must be
+        called. Return 0 if an event is already due, or None if no event is
+        scheduled.
+
+        .. versionadded:: 1.3.0
+        '''
+        now = time()
+        timeout = None
+        for events in self._events.itervalues():
+            for event in events:
+                remaining = event._last_dt + event.timeout - now
+                if remaining <= 0:
+                    return 0
+                if timeout is None or remaining < timeout:
+                    timeout = remaining
+        return timeout
+
     def create_trigger(self, callback, timeout=0):
         '''Create a Trigger event. Check module documentation for more
         information.
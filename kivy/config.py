@@ -41,6 +41,11 @@ Available configuration tokens
 
     * `resizable` has been added to graphics section
 
+.. versionchanged:: 1.3.0
+
+    * `ondemand` and `texture_reload_cache` have been added to graphics
+      section
+
 :kivy:
 
     `log_level`: (debug, info, warning, error, critical)
@@ -121,6 +126,14 @@ Available configuration tokens
     `resizable`: (0, 1)
         If 0, the window will have a fixed size. If 1, the window will be
         resizable.
+    `ondemand`: (0, 1)
+        If 1, the window is redrawn only when a canvas have changed, and the
+        event loop sleeps until the next input or :class:`~kivy.clock.Clock`
+        event instead of running at `maxfps`.
+    `texture_reload_cache`: (0, 1)
+        If 1, the last decoded images are kept in memory, so their textures
+        are reloaded without decoding the files again after the OpenGL context
+        is lost. An image is released once its texture is reloaded.
 
 :input:
 
@@ -177,7 +190,7 @@ from kivy.logger import Logger
 from kivy.utils import OrderedDict
 
 # Version number of current configuration format
-KIVY_CONFIG_VERSION = 6
+KIVY_CONFIG_VERSION = 8
 
 #: Kivy configuration object
 Config = None
@@ -378,6 +391,12 @@ if not 'KIVY_DOC_INCLUDE' in environ:
         elif version == 5:
             Config.setdefault('graphics', 'resizable', '1')
 
+        elif version == 6:
+            Config.setdefault('graphics', 'ondemand', '0')
+
+        elif version == 7:
+            Config.setdefault('graphics', 'texture_reload_cache', '0')
+
         #elif version == 1:
         #   # add here the command for upgrading from configuration 0 to 1
         #
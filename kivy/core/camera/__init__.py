@@ -49,6 +49,7 @@ class CameraBase(EventDispatcher):
         self._resolution = kwargs.get('resolution')
         self._index = kwargs.get('index')
         self._buffer = None
+        self._stride = None
         self._format = 'rgb'
         self._texture = None
         self.capture_device = None
@@ -114,7 +115,8 @@ class CameraBase(EventDispatcher):
         if self._texture is None:
             Logger.debug('Camera: copy_to_gpu() failed, _texture is None !')
             return
-        self._texture.blit_buffer(self._buffer, colorfmt=self._format)
+        self._texture.blit_buffer(self._buffer, colorfmt=self._format,
+                                  stride=self._stride)
         self._buffer = None
         self.dispatch('on_texture')
 
@@ -5,7 +5,7 @@ GStreamer Camera: Implement CameraBase with GStreamer
 __all__ = ('CameraGStreamer', )
 
 from kivy.clock import Clock
-from kivy.graphics.texture import Texture
+from kivy.graphics.texture import TextureStream
 from kivy.core.camera import CameraBase
 
 try:
@@ -39,6 +39,7 @@ class CameraGStreamer(CameraBase):
         self._camerasink = None
         self._decodebin = None
         self._texturesize = None
+        self._stream = TextureStream(colorfmt='rgb', flip_vertical=True)
         self._video_src = kwargs.get('video_src', 'v4l2src')
         super(CameraGStreamer, self).__init__(**kwargs)
 
@@ -71,14 +72,17 @@ class CameraGStreamer(CameraBase):
         frame = self._camerasink.emit('pull-buffer')
         if frame is None:
             return
-        self._buffer = frame.data
         if self._texturesize is None:
             # try to get the camera image size
             for x in self._decodebin.src_pads():
                 for cap in x.get_caps():
                     self._texturesize = (cap['width'], cap['height'])
-                    Clock.schedule_once(self._update)
-                    return
+                    break
+            if self._texturesize is None:
+                return
+        # the frame is uploaded later in the main thread. gst.Buffer support
+        # the buffer protocol, no need to copy the data.
+        self._stream.push(frame, size=self._texturesize)
         Clock.schedule_once(self._update)
 
     def start(self):
@@ -90,11 +94,12 @@ class CameraGStreamer(CameraBase):
         self._pipeline.set_state(gst.STATE_PAUSED)
 
     def _update(self, dt):
-        if self._buffer is None:
+        if not self._stream.update():
             return
-        if self._texture is None and self._texturesize is not None:
-            self._texture = Texture.create(
-                size=self._texturesize, colorfmt='rgb')
-            self._texture.flip_vertical()
+        # the stream swap between multiple textures, to not stall while the
+        # previous frame is drawn.
+        loaded = self._texture is not None
+        self._texture = self._stream.texture
+        if not loaded:
             self.dispatch('on_load')
-        self._copy_to_gpu()
+        self.dispatch('on_texture')
@@ -83,11 +83,15 @@ class CameraOpenCV(CameraBase):
             frame = hg.cvQueryFrame(self._device)
             self._format = 'bgr'
             try:
+                # the rows of the image are aligned on 4 bytes, give the real
+                # length of a row to the texture instead of copying the rows.
                 self._buffer = frame.imageData
+                self._stride = frame.widthStep
             except AttributeError:
                 # On OSX there is no imageData attribute but a tostring()
                 # method.
                 self._buffer = frame.tostring()
+                self._stride = None
             self._copy_to_gpu()
         except:
             Logger.exception('OpenCV: Couldn\'t get image from Camera')
@@ -17,6 +17,7 @@ from kivy.event import EventDispatcher
 from kivy.core import core_register_libs
 from kivy.logger import Logger
 from kivy.cache import Cache
+from kivy.config import Config
 from kivy.clock import Clock
 from kivy.atlas import Atlas
 from kivy.resources import resource_find
@@ -34,6 +35,9 @@ Texture = TextureRegion = None
 # register image caching only for keep_data=True
 Cache.register('kv.image', timeout=60)
 Cache.register('kv.atlas')
+# decoded images, used for reloading the textures after a context loss without
+# decoding the files again, if texture_reload_cache is set in the config.
+Cache.register('kv.imagedata', limit=64)
 
 
 class ImageData(object):
@@ -58,6 +62,19 @@ class ImageData(object):
         #: Image source, if available
         self.source = source
 
+    def copy(self):
+        '''Return a copy of the image data. The pixels are not copied, but
+        releasing the data of the copy doesn't affect the original.
+
+        .. versionadded:: 1.3.0
+        '''
+        im = ImageData(self.width, self.height, self.fmt, self.data,
+                source=self.source)
+        for level, width, height, data in self.iterate_mipmaps():
+            if level:
+                im.add_mipmap(level, width, height, data)
+        return im
+
     def release_data(self):
         mm = self.mipmaps
         for item in mm.itervalues():
@@ -171,6 +188,13 @@ class ImageLoaderBase(object):
             # set as our current texture
             self._textures.append(texture)
 
+            # keep the decoded data for a fast reloading of the texture
+            data = self._data[count]
+            if data.source is not None and data.data is not None and \
+                    Config.getint('graphics', 'texture_reload_cache'):
+                Cache.append('kv.imagedata', '%s|%d' % (data.source, count),
+                        data.copy())
+
             # release data if ask
             if not self.keep_data:
                 self._data[count].release_data()
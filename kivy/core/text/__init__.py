@@ -10,11 +10,20 @@ rendering can be more or less accurate.
     text have a width <= 1.
 '''
 
-__all__ = ('LabelBase', 'Label')
+__all__ = ('LabelBase', 'Label', 'GlyphAtlas', 'LabelRenderer')
 
 import re
 import os
+from collections import deque
+from functools import partial
+from math import ceil
+from threading import Thread
+from Queue import Queue
+from weakref import ref, WeakKeyDictionary
 from kivy import kivy_data_dir
+from kivy.cache import Cache
+from kivy.clock import Clock
+from kivy.logger import Logger
 from kivy.graphics.texture import Texture
 from kivy.core import core_select_lib
 from kivy.utils import platform
@@ -27,6 +36,9 @@ FONT_ITALIC = 1
 FONT_BOLD = 2
 FONT_BOLDITALIC = 3
 
+# layout of the labels (lines and size), shared by the identical labels
+Cache.register('kv.label.layout', limit=1000)
+
 
 class LabelBase(object):
     '''Core text label.
@@ -43,6 +55,15 @@ class LabelBase(object):
     .. versionadded::
         In 1.0.8, `size` have been deprecated and replaced with `text_size`
 
+    .. versionchanged:: 1.3.0
+        The layout and the texture of a label are cached. The labels with the
+        same text and options share their texture, and refreshing a label
+        that didn't change doesn't render it again.
+
+    .. versionchanged:: 1.3.0
+        The text can be rendered in a worker thread with
+        :func:`refresh_async`.
+
     :Parameters:
         `font_size`: int, default to 12
             Font size of the text
@@ -72,9 +93,24 @@ class LabelBase(object):
             unexpected results.
         `mipmap` : bool, default to False
             Create mipmap for the texture
+        `atlas` : bool, default to False
+            Put the texture in a shared :class:`~kivy.atlas.DynamicAtlas` if
+            it's small enough. Not used if `mipmap` is True.
+
+            .. versionadded:: 1.3.0
+        `glyph_atlas` : bool, default to False
+            Don't render the text in a texture, but compute :data:`glyphs`:
+            quads taken from the shared :class:`GlyphAtlas`. Each glyph is
+            rasterized only once per font, and changing the text only
+            changes the quads. The color of the text is not applied, use a
+            :class:`~kivy.graphics.Color` instruction. The texture is still
+            rendered if a glyph doesn't fit in the atlas.
+
+            .. versionadded:: 1.3.0
     '''
 
-    __slots__ = ('options', 'texture', '_label', '_text_size')
+    __slots__ = ('options', 'texture', 'glyphs', 'glyphs_size', '_label',
+                 '_text_size')
 
     _cache_glyphs = {}
 
@@ -82,6 +118,17 @@ class LabelBase(object):
 
     _fonts_cache = {}
 
+    _atlas = None
+
+    _glyph_atlas = None
+
+    # rendered textures, by render key, and the ones used by several labels
+    _textures = {}
+
+    _shared_textures = WeakKeyDictionary()
+
+    _renderer = None
+
     def __init__(self, **kwargs):
         if 'font_size' not in kwargs:
             kwargs['font_size'] = 12
@@ -103,6 +150,10 @@ class LabelBase(object):
             kwargs['shorten'] = False
         if 'mipmap' not in kwargs:
             kwargs['mipmap'] = False
+        if 'atlas' not in kwargs:
+            kwargs['atlas'] = False
+        if 'glyph_atlas' not in kwargs:
+            kwargs['glyph_atlas'] = False
         if 'color' not in kwargs:
             kwargs['color'] = (1, 1, 1, 1)
         if 'padding' not in kwargs:
@@ -151,6 +202,13 @@ class LabelBase(object):
 
         self.options = kwargs
         self.texture = None
+        self.glyphs = None
+        self.glyphs_size = (0, 0)
+        self._lines = []
+        self._render_key = None
+        self._texture_reload = False
+        self._async_key = None
+        self._rasterize_only = False
         self.resolve_font_name()
         if 'text' in kwargs:
             self.text = kwargs['text']
@@ -282,11 +340,23 @@ class LabelBase(object):
         options = self.options
         render_text = self._render_text
         get_extents = self.get_extents
+        glyph_atlas = options['glyph_atlas']
+        if glyph_atlas:
+            # place the text glyph by glyph, with the size of each glyph
+            fontid = self.fontid
+            cache = self._cache_glyphs.get(fontid)
+            if cache is None:
+                cache = self._cache_glyphs[fontid] = {}
+            get_extents = partial(self._get_glyphs_extents, cache)
+            render_text = partial(self._render_glyphs, fontid, cache)
         uw, uh = self.text_size
         w, h = 0, 0
         x, y = 0, 0
         if real:
-            self._render_begin()
+            if glyph_atlas:
+                self._glyphs_begin()
+            else:
+                self._render_begin()
             halign = options['halign']
             valign = options['valign']
             if valign == 'bottom':
@@ -298,9 +368,18 @@ class LabelBase(object):
 
         # no width specified, faster method
         if uw is None:
-            for line in self.text.split('\n'):
-                lw, lh = get_extents(line)
-                if real:
+            if not real:
+                # first pass, measure the lines
+                lines = self._lines = []
+                for line in self.text.split('\n'):
+                    lw, lh = get_extents(line)
+                    lines.append(((lw, lh), line))
+                    w = max(w, int(lw))
+                    self._internal_height += int(lh)
+                h = self._internal_height if uh is None else uh
+            else:
+                for size, line in self._lines:
+                    lw, lh = size
                     x = 0
                     if halign == 'center':
                         x = int((self.width - lw) / 2.)
@@ -309,25 +388,19 @@ class LabelBase(object):
                     if len(line):
                         render_text(line, x, y)
                     y += int(lh)
-                else:
-                    w = max(w, int(lw))
-                    self._internal_height += int(lh)
-            h = self._internal_height if uh is None else uh
 
         # constraint
-        else:
+        elif not real:
             # precalculate id/name
             if not self.fontid in self._cache_glyphs:
                 self._cache_glyphs[self.fontid] = {}
             cache = self._cache_glyphs[self.fontid]
 
-            if not real:
-                # verify that each glyph have size
-                glyphs = list(set(self.text)) + ['.']
-                for glyph in glyphs:
-                    if not glyph in cache:
-                        cache[glyph] = get_extents(glyph)
-
+            # verify that each glyph have size
+            glyphs = list(set(self.text)) + ['.']
+            for glyph in glyphs:
+                if not glyph in cache:
+                    cache[glyph] = get_extents(glyph)
 
             # Shorten the text that we actually display
             text = self.text
@@ -336,7 +409,7 @@ class LabelBase(object):
 
             # first, split lines
             glyphs = []
-            lines = []
+            lines = self._lines = []
             lw = lh = 0
             for word in re.split(r'( |\n)', text):
 
@@ -379,24 +452,25 @@ class LabelBase(object):
             if lw != 0:
                 lines.append(((lw, lh), glyphs))
 
-            if not real:
-                self._internal_height = sum([size[1] for size, glyphs in lines])
-                h = self._internal_height if uh is None else uh
-                w = uw
-            else:
-                # really render now.
-                for size, glyphs in lines:
-                    x = 0
-                    if halign == 'center':
-                        x = int((self.width - size[0]) / 2.)
-                    elif halign == 'right':
-                        x = int(self.width - size[0])
-                    for glyph in glyphs:
-                        lw, lh = cache[glyph]
-                        if glyph != ' ' and glyph != '\n':
-                            render_text(glyph, x, y)
-                        x += lw
-                    y += size[1]
+            self._internal_height = sum([size[1] for size, glyphs in lines])
+            h = self._internal_height if uh is None else uh
+            w = uw
+
+        else:
+            # really render now, with the lines of the first pass.
+            cache = self._cache_glyphs[self.fontid]
+            for size, glyphs in self._lines:
+                x = 0
+                if halign == 'center':
+                    x = int((self.width - size[0]) / 2.)
+                elif halign == 'right':
+                    x = int(self.width - size[0])
+                for glyph in glyphs:
+                    lw, lh = cache[glyph]
+                    if glyph != ' ' and glyph != '\n':
+                        render_text(glyph, x, y)
+                    x += lw
+                y += size[1]
 
         if not real:
             # was only the first pass
@@ -405,9 +479,27 @@ class LabelBase(object):
             h = int(max(h, 1))
             return w, h
 
+        if glyph_atlas:
+            if self._glyphs_end():
+                return
+            # a glyph is missing in the atlas, render the texture instead
+            options['glyph_atlas'] = False
+            try:
+                return self.render(real=True)
+            finally:
+                options['glyph_atlas'] = True
+
         # get data from provider
         data = self._render_end()
         assert(data)
+        if self._rasterize_only:
+            # rendered by a worker, the texture is created on the main thread
+            self._data = data
+            return
+        self._update_texture(data)
+
+    def _update_texture(self, data):
+        options = self.options
 
         # if data width is too tiny, just create texture, don't really render!
         if data.width <= 1:
@@ -420,9 +512,14 @@ class LabelBase(object):
         mipmap = options['mipmap']
         if texture is None or \
                 self.width != texture.width or \
-                self.height != texture.height:
-            texture = Texture.create_from_data(data, mipmap=mipmap)
-            data = None
+                self.height != texture.height or \
+                self._is_texture_shared(texture):
+            texture = None
+            if options['atlas'] and not mipmap:
+                texture = self._atlas_allocate(data)
+            if texture is None:
+                texture = Texture.create_from_data(data, mipmap=mipmap)
+                data = None
             texture.flip_vertical()
             texture.add_reload_observer(self._texture_refresh)
             self.texture = texture
@@ -433,21 +530,306 @@ class LabelBase(object):
         if data is not None and data.width > 1:
             texture.blit_data(data)
 
+    def _get_glyphs_extents(self, cache, text):
+        # size of a text placed glyph by glyph
+        if not text:
+            return self.get_extents(text)
+        w = h = 0
+        for glyph in text:
+            size = cache.get(glyph)
+            if size is None:
+                size = cache[glyph] = self.get_extents(glyph)
+            w += size[0]
+            h = max(h, size[1])
+        return w, h
+
+    def _glyphs_begin(self):
+        self.texture = None
+        self._glyph_quads = {}
+        if LabelBase._glyph_atlas is None:
+            LabelBase._glyph_atlas = GlyphAtlas()
+
+    def _render_glyphs(self, fontid, cache, text, x, y):
+        # add the quads of the glyphs of the text. The y axis goes down while
+        # rendering, and up in the quads.
+        quads = self._glyph_quads
+        if quads is None:
+            return
+        atlas = self._glyph_atlas
+        height = self.height
+        for glyph in text:
+            gw, gh = cache[glyph]
+            if glyph != ' ' and glyph != '\n' and gw > 0 and gh > 0:
+                entry = atlas.get(self, fontid, glyph)
+                if entry is None:
+                    self._glyph_quads = None
+                    return
+                texture, region = entry[:2]
+                u0, v0, u1, v1, u2, v2, u3, v3 = region.tex_coords
+                gy = height - y - gh
+                quad = quads.get(texture)
+                if quad is None:
+                    quad = quads[texture] = ([], [])
+                vertices, indices = quad
+                i = len(vertices) / 4
+                vertices.extend((x, gy, u0, v0, x + gw, gy, u1, v1,
+                                 x + gw, gy + gh, u2, v2, x, gy + gh, u3, v3))
+                indices.extend((i, i + 1, i + 2, i + 2, i + 3, i))
+            x += gw
+
+    def _glyphs_end(self):
+        quads = self._glyph_quads
+        self._glyph_quads = None
+        if quads is None:
+            self.glyphs = None
+            return False
+        self.glyphs = [(texture, vertices, indices) for texture,
+                       (vertices, indices) in quads.iteritems()]
+        self.glyphs_size = self._size
+        return True
+
+    def _render_glyph(self, glyph):
+        # rasterize a single glyph in white, for the glyph atlas
+        options = self.options
+        color = options['color']
+        size = getattr(self, '_size', None)
+        w, h = self.get_extents(glyph)
+        if w <= 0 or h <= 0:
+            return None
+        options['color'] = (1, 1, 1, 1)
+        self._size = w, h
+        try:
+            self._render_begin()
+            self._render_text(glyph, 0, 0)
+            return self._render_end()
+        finally:
+            options['color'] = color
+            self._size = size
+
+    def _atlas_allocate(self, data):
+        # allocate a region of the shared atlas for small texts
+        atlas = LabelBase._atlas
+        if atlas is None:
+            from kivy.atlas import DynamicAtlas
+            atlas = LabelBase._atlas = DynamicAtlas()
+        if data.fmt != atlas.colorfmt:
+            return None
+        return atlas.allocate(data.width, data.height)
+
     def _texture_refresh(self, *l):
-        self.refresh()
+        # the content of the texture is lost, render it again, even if it's
+        # shared with other labels. Ignore the textures we don't use anymore.
+        if l and l[0] is not self.texture:
+            return
+        self._texture_reload = True
+        try:
+            self.refresh()
+        finally:
+            self._texture_reload = False
+
+    def _get_render_key(self):
+        # everything that can change the rendering of the label. The text
+        # given at the creation is in the options, but is not the current one.
+        options = self.options
+        return (self.__class__, self._text, tuple(self._text_size),
+                tuple([(k, repr(options[k])) for k in sorted(options)
+                       if k != 'text']))
+
+    def _get_layout(self):
+        return self._internal_height, self._lines
+
+    def _set_layout(self, layout):
+        self._internal_height, self._lines = layout
+
+    def _get_render_data(self):
+        return None
+
+    def _set_render_data(self, data):
+        pass
+
+    def _is_texture_shared(self, texture):
+        # a shared texture is never modified, except when reloading it
+        return not self._texture_reload and texture in self._shared_textures
+
+    def _get_shared_texture(self, key):
+        entry = LabelBase._textures.get(key)
+        if entry is None:
+            return None
+        texture = entry[0]()
+        if texture is None:
+            return None
+        if texture is not self.texture:
+            LabelBase._shared_textures[texture] = True
+            texture.remove_reload_observer(self._texture_refresh)
+            texture.add_reload_observer(self._texture_refresh)
+        self._set_render_data(entry[1])
+        return texture
+
+    def _share_texture(self, key):
+        texture = self.texture
+        if texture is None:
+            return
+        textures = LabelBase._textures
+
+        def _remove(wr):
+            if key in textures and textures[key][0] is wr:
+                del textures[key]
+        textures[key] = (ref(texture, _remove), self._get_render_data())
+
+    def _release_texture(self, key):
+        # the texture of the label is about to be drawn again: if it's not
+        # shared, it must be removed from the cache.
+        texture = self.texture
+        if texture is None or key is None or self._is_texture_shared(texture):
+            return
+        entry = LabelBase._textures.get(key)
+        if entry is not None and entry[0]() is texture:
+            del LabelBase._textures[key]
 
     def refresh(self):
         '''Force re-rendering of the text
+
+        .. versionchanged:: 1.3.0
+            The layout is taken from the cache, and the texture is shared
+            with an identical label if there is one.
         '''
         self.resolve_font_name()
+        self.glyphs = None
+        self._async_key = None
+        options = self.options
+        previous_key = self._render_key
+        key = self._render_key = self._get_render_key()
 
         # first pass, calculating width/height
+        layout = Cache.get('kv.label.layout', key)
+        if layout is None:
+            sz = self.render()
+            Cache.append('kv.label.layout', key, (sz, self._get_layout()))
+        else:
+            sz = layout[0]
+            self._set_layout(layout[1])
+        self._size = sz
+
+        # second pass, render for real if there is no identical texture
+        texture = None
+        if not self._texture_reload and not options['glyph_atlas']:
+            texture = self._get_shared_texture(key)
+        if texture is not None:
+            self.texture = texture
+        else:
+            self._release_texture(previous_key)
+            self.render(real=True)
+            self._share_texture(key)
+        self._size = sz[0] + options['padding_x'] * 2, \
+                     sz[1] + options['padding_y'] * 2
+
+    def refresh_async(self, callback=None):
+        '''Render the text in a worker thread, and create the texture later on
+        the main thread. Return the size of the texture to expect, taken from
+        the cache or estimated from the font size, or None if the label has
+        been rendered immediately. The `callback` is called with the label
+        when the :data:`texture` is ready.
+
+        The label is rendered immediately if an identical texture exists, or
+        with the `glyph_atlas` option.
+
+        .. versionadded:: 1.3.0
+        '''
+        self.resolve_font_name()
+        options = self.options
+        key = self._get_render_key()
+        entry = LabelBase._textures.get(key)
+        if options['glyph_atlas'] or (entry is not None and
+                entry[0]() is not None):
+            self.refresh()
+            if callback is not None:
+                callback(self)
+            return None
+
+        self.glyphs = None
+        self._async_key = key
+        layout = Cache.get('kv.label.layout', key)
+        if layout is None:
+            sz = self._estimate_size()
+        else:
+            sz = layout[0]
+        self._size = sz[0] + options['padding_x'] * 2, \
+                     sz[1] + options['padding_y'] * 2
+
+        renderer = LabelBase._renderer
+        if renderer is None:
+            renderer = LabelBase._renderer = LabelRenderer()
+        renderer.render(self, key, callback)
+        return sz
+
+    def _estimate_size(self):
+        # size of the text before being measured, from the font size
+        fs = self.options['font_size'] * 1.333
+        uw, uh = self.text_size
+        lines = self.text.split('\n')
+        if uw is None:
+            w = max([len(line) for line in lines]) * fs * .5
+            h = len(lines) * fs
+        else:
+            w = uw
+            h = sum([max(1, ceil(len(line) * fs * .5 / uw))
+                     for line in lines]) * fs
+        if uh is not None:
+            h = uh
+        return int(max(w, 1)), int(max(h, 1))
+
+    def _copy(self):
+        # the workers render a copy of the label, the changes done on the
+        # label while it's rendered are not seen.
+        options = dict(self.options)
+        options['glyph_atlas'] = False
+        label = self.__class__(**options)
+        label.text = self._text
+        label._text_size = self._text_size
+        label._rasterize_only = True
+        return label
+
+    def _rasterize(self):
+        # both passes, without creating the texture: called by the workers
+        # on a copy of the label.
+        self._data = None
         sz = self.render()
         self._size = sz
-        # second pass, render for real
         self.render(real=True)
-        self._size = sz[0] + self.options['padding_x'] * 2, \
-                     sz[1] + self.options['padding_y'] * 2
+        return sz, self._get_layout(), self._data, self._get_render_data()
+
+    def _rasterize_done(self, key, result):
+        # called on the main thread, return False if the text or the options
+        # changed since the label have been queued.
+        if key != self._async_key:
+            return False
+        self._async_key = None
+        if result is None:
+            # failed in the worker, try again here
+            self.refresh()
+            return True
+
+        sz, layout, data, render_data = result
+        Cache.append('kv.label.layout', key, (sz, layout))
+        options = self.options
+        previous_key = self._render_key
+        self._render_key = key
+        self._set_layout(layout)
+        self._size = sz
+        texture = self._get_shared_texture(key)
+        if texture is not None:
+            self.texture = texture
+        else:
+            self._release_texture(previous_key)
+            self._set_render_data(render_data)
+            if data is None:
+                self.texture = None
+            else:
+                self._update_texture(data)
+            self._share_texture(key)
+        self._size = sz[0] + options['padding_x'] * 2, \
+                     sz[1] + options['padding_y'] * 2
+        return True
 
     def _get_text(self):
         return self._text
@@ -517,6 +899,140 @@ class LabelBase(object):
     usersize = property(_get_text_size, _set_text_size,
         doc='''(deprecated) Use text_size instead.''')
 
+
+class GlyphAtlas(object):
+    '''Shared textures holding the glyphs of the labels created with the
+    `glyph_atlas` option. Each glyph is rasterized once per font name, size
+    and style, and kept until the end of the application.
+
+    .. versionadded:: 1.3.0
+
+    :Parameters:
+        `size`: int, default to 512
+            Size of one texture of the atlas
+        `max_pages`: int, default to 4
+            Maximum number of textures to create. When the atlas is full, the
+            labels fall back to render a texture.
+    '''
+
+    def __init__(self, size=512, max_pages=4):
+        from kivy.atlas import DynamicAtlas
+        self.atlas = DynamicAtlas(size=size, max_pages=max_pages)
+        self.glyphs = {}
+        self._pages = []
+
+    def get(self, label, fontid, glyph):
+        '''Return a tuple (texture, region, data) for the glyph of the font
+        `fontid`, rasterized with the label if it's not in the atlas yet. The
+        texture is the page of the atlas where the region is. Return None if
+        the glyph can't be put in the atlas.
+        '''
+        glyphs = self.glyphs.get(fontid)
+        if glyphs is None:
+            glyphs = self.glyphs[fontid] = {}
+        entry = glyphs.get(glyph)
+        if entry is not None:
+            return entry
+
+        data = label._render_glyph(glyph)
+        if data is None or data.fmt != self.atlas.colorfmt:
+            return None
+        region = self.atlas.allocate(data.width, data.height)
+        if region is None:
+            return None
+        region.flip_vertical()
+        region.blit_data(data)
+
+        entry = glyphs[glyph] = (self._get_page(region), region, data)
+        return entry
+
+    def _get_page(self, region):
+        for page in self.atlas.pages:
+            texture = page[0]
+            if texture.id != region.id:
+                continue
+            if texture not in self._pages:
+                # the content of the pages is lost with the GL context
+                texture.add_reload_observer(self._reload_page)
+                self._pages.append(texture)
+            return texture
+
+    def _reload_page(self, texture):
+        for glyphs in self.glyphs.itervalues():
+            for page, region, data in glyphs.itervalues():
+                if page is texture:
+                    region.blit_data(data)
+
+
+class LabelRenderer(object):
+    '''Workers rendering the labels for :func:`LabelBase.refresh_async`. The
+    text is measured and rasterized in an :class:`~kivy.core.image.ImageData`
+    by the workers, and the textures are created on the main thread, a few
+    per frame.
+
+    .. versionadded:: 1.3.0
+
+    :Parameters:
+        `num_workers`: int, default to 2
+            Number of threads rendering the labels
+        `max_upload_per_frame`: int, default to 10
+            Maximum number of textures created per frame. The others are
+            created during the next frames.
+    '''
+
+    def __init__(self, num_workers=2, max_upload_per_frame=10):
+        self.num_workers = num_workers
+        self.max_upload_per_frame = max_upload_per_frame
+        self._q_load = Queue()
+        self._q_done = deque()
+        self._workers = []
+        self._trigger_update = Clock.create_trigger(self._update)
+
+    def render(self, label, key, callback=None):
+        '''Queue the rendering of the label. The result is dropped if the
+        label have been refreshed again in the meantime.
+        '''
+        if not self._workers:
+            for x in xrange(self.num_workers):
+                worker = Thread(target=self._run)
+                worker.daemon = True
+                worker.start()
+                self._workers.append(worker)
+        self._q_load.put((ref(label), key, label._copy(), callback))
+
+    def _run(self):
+        q_load = self._q_load
+        while True:
+            label, key, copy, callback = q_load.get()
+            current = label()
+            if current is None or current._async_key != key:
+                # already rendered again, don't do it for nothing
+                continue
+            current = None
+            try:
+                result = copy._rasterize()
+            except Exception:
+                Logger.exception('Label: Unable to render the text')
+                result = None
+            self._q_done.append((label, key, result, callback))
+            self._trigger_update()
+
+    def _update(self, *largs):
+        q_done = self._q_done
+        count = 0
+        while q_done and count < self.max_upload_per_frame:
+            label, key, result, callback = q_done.popleft()
+            label = label()
+            if label is None or not label._rasterize_done(key, result):
+                continue
+            count += 1
+            if callback is not None:
+                callback(label)
+        if q_done:
+            # continue on the next frame
+            self._trigger_update()
+
+
 # Load the appropriate provider
 Label = core_select_lib('text', (
     ('pygame', 'text_pygame', 'LabelPygame'),
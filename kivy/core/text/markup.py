@@ -42,6 +42,7 @@ from kivy.utils import platform
 from kivy.parser import parse_color
 from kivy.logger import Logger
 import re
+from kivy.core.image import ImageData
 from kivy.core.text import Label, LabelBase
 from copy import copy
 
@@ -50,16 +51,54 @@ MarkupLabelBase = Label
 if Label is None:
     MarkupLabelBase = LabelBase
 
+_markup_split = re.compile('(\[.*?\])')
+
+_markup_tags = ('b', '/b', 'i', '/i', '/size', '/color', '/font', '/ref')
+
+_markup_args = ('size', 'color', 'font', 'ref', 'anchor')
+
+
+def _markup_token(item):
+    # convert an item of the markup to a (tag, value) token. The text is
+    # a token without tag, and the unknown tags are text.
+    if item[0] == '[' and item[-1] == ']':
+        tag = item[1:-1]
+        if tag in _markup_tags:
+            return tag, None
+        name, sep, value = tag.partition('=')
+        if sep and name in _markup_args:
+            return name, value
+    return None, item.replace('&bl;', '[').replace(
+            '&br;', ']').replace('&amp;', '&')
+
+
+def _copy_lines(lines):
+    # copy the last line, the only one that can be changed by the next words
+    if not lines:
+        return []
+    line = lines[-1]
+    return lines[:-1] + [[line[0], line[1], list(line[2])]]
+
 
 class MarkupLabel(MarkupLabelBase):
     '''Markup text label.
 
     See module documentation for more informations.
+
+    .. versionchanged:: 1.3.0
+        The markup is parsed once. When text is appended to the label, only
+        the new text is parsed and measured, and only the last lines are
+        rendered again. The pixels of the previous rendering are kept only
+        while text is appended.
     '''
 
     def __init__(self, *largs, **kwargs):
         self._style_stack = {}
         self._refs = {}
+        self._parsed = None
+        self._pre_render_state = None
+        self._rendered = None
+        self._appending = False
         super(MarkupLabel, self).__init__(*largs, **kwargs)
 
     @property
@@ -102,6 +141,20 @@ class MarkupLabel(MarkupLabelBase):
         v = self._style_stack[k].pop()
         self.options[k] = v
 
+    def _get_layout(self):
+        return self._lines, self._anchors
+
+    def _set_layout(self, layout):
+        self._lines, self._anchors = layout
+        self._refs = {}
+        self._appending = False
+
+    def _get_render_data(self):
+        return self._refs
+
+    def _set_render_data(self, refs):
+        self._refs = refs
+
     def render(self, real=False):
         options = copy(self.options)
         if not real:
@@ -111,72 +164,117 @@ class MarkupLabel(MarkupLabelBase):
         self.options = options
         return ret
 
+    def _parse_markup(self):
+        # return the tokens of the text, the number of tokens before the last
+        # text (which can change if text is appended), and the number of
+        # tokens kept from the previous parsing.
+        text = self.label
+        parsed = self._parsed
+        if parsed is not None and text.startswith(parsed[0]):
+            offset, kept, tokens = parsed[1:]
+            tokens = tokens[:kept]
+        else:
+            offset = kept = 0
+            tokens = []
+
+        # the last item of the split is always a text, maybe empty.
+        items = _markup_split.split(text[offset:])
+        for item in items[:-1]:
+            offset += len(item)
+            if item != '':
+                tokens.append(_markup_token(item))
+        stable = len(tokens)
+        if items[-1] != '':
+            tokens.append(_markup_token(items[-1]))
+        self._parsed = text, offset, stable, tokens
+        return tokens, stable, kept
+
     def _pre_render(self):
         # split markup, words, and lines
         # result: list of word with position and width/height
         # during the first pass, we don't care about h/valign
-        self._lines = lines = []
+        tokens, stable, kept = self._parse_markup()
+        settings = self._get_render_key()[2:]
+        state = self._pre_render_state
+        self._appending = state is not None and state[0] == settings and \
+                state[1] <= kept
+        if self._appending:
+            # text have been appended, continue after the last known tokens
+            index, lines, stack, options, anchors = state[1:]
+            self._lines = lines = _copy_lines(lines)
+            self._style_stack = dict([(k, list(v)) for k, v in
+                                      stack.iteritems()])
+            self.options = copy(options)
+            self._anchors = dict(anchors)
+        else:
+            index = 0
+            self._lines = lines = []
+            self._style_stack = {}
+            self._anchors = {}
+            self.options['_ref'] = None
         self._refs = {}
-        self._anchors = {}
         spush = self._push_style
         spop = self._pop_style
         options = self.options
-        options['_ref'] = None
-        for item in self.markup:
-            if item == '[b]':
+        for index in xrange(index, len(tokens) + 1):
+            if index == stable:
+                # the tokens until here are kept if text is appended
+                self._pre_render_state = (settings, index, _copy_lines(lines),
+                    dict([(k, list(v)) for k, v in
+                          self._style_stack.iteritems()]),
+                    copy(options), dict(self._anchors))
+            if index == len(tokens):
+                break
+            tag, value = tokens[index]
+            if tag is None:
+                self._pre_render_label(value, options, lines)
+            elif tag == 'b':
                 spush('bold')
                 options['bold'] = True
                 self.resolve_font_name()
-            elif item == '[/b]':
+            elif tag == '/b':
                 spop('bold')
                 self.resolve_font_name()
-            elif item == '[i]':
+            elif tag == 'i':
                 spush('italic')
                 options['italic'] = True
                 self.resolve_font_name()
-            elif item == '[/i]':
+            elif tag == '/i':
                 spop('italic')
                 self.resolve_font_name()
-            elif item[:6] == '[size=':
+            elif tag == 'size':
                 try:
-                    size = int(item[6:-1])
+                    size = int(value)
                 except ValueError:
                     size = options['font_size']
                 spush('font_size')
                 options['font_size'] = size
-            elif item == '[/size]':
+            elif tag == '/size':
                 spop('font_size')
-            elif item[:7] == '[color=':
-                color = parse_color(item[7:-1])
+            elif tag == 'color':
+                color = parse_color(value)
                 spush('color')
                 options['color'] = color
-            elif item == '[/color]':
+            elif tag == '/color':
                 spop('color')
-            elif item[:6] == '[font=':
-                fontname = item[6:-1]
+            elif tag == 'font':
                 spush('font_name')
-                options['font_name'] = fontname
+                options['font_name'] = value
                 self.resolve_font_name()
-            elif item == '[/font]':
+            elif tag == '/font':
                 spop('font_name')
                 self.resolve_font_name()
-            elif item[:5] == '[ref=':
-                ref = item[5:-1]
+            elif tag == 'ref':
                 spush('_ref')
-                options['_ref'] = ref
-            elif item == '[/ref]':
+                options['_ref'] = value
+            elif tag == '/ref':
                 spop('_ref')
-            elif item[:8] == '[anchor=':
-                ref = item[8:-1]
+            elif tag == 'anchor':
                 if len(lines):
                     x, y = lines[-1][0:2]
                 else:
                     x = y = 0
-                self._anchors[ref] = x, y
-            else:
-                item = item.replace('&bl;', '[').replace(
-                        '&br;', ']').replace('&amp;', '&')
-                self._pre_render_label(item, options, lines)
+                self._anchors[value] = x, y
 
         # calculate the texture size
         w, h = self.text_size
@@ -253,20 +351,42 @@ class MarkupLabel(MarkupLabelBase):
                 line = [pw, ph, [(pw, ph, part, options)]]
                 lines.append(line)
 
+    def _get_rendered_lines(self, ah):
+        # return the number and the height of the first lines that are the
+        # same as the last rendering: their pixels can be reused.
+        rendered = self._rendered
+        if rendered is None:
+            return 0, 0
+        lines, size, halign, data = rendered
+        w, h = self._size
+        if size[0] != w or halign != ah:
+            return 0, 0
+        count = top = 0
+        for line, previous in zip(self._lines, lines):
+            if line is not previous or top + line[1] >= min(h, size[1]):
+                break
+            count += 1
+            top += line[1]
+        return count, top
+
     def _real_render(self):
         # use the lines to do the rendering !
-        self._render_begin()
-
-        r = self._render_text
 
         # convert halign/valign to int, faster comparaison
         #av = {'top': 0, 'middle': 1, 'bottom': 2}[self.options['valign']]
         ah = {'left': 0, 'center': 1, 'right': 2}[self.options['halign']]
 
+        # when text is appended, the first lines are not rendered again
+        count, top = self._get_rendered_lines(ah)
+        w, h = size = self._size
+        self._size = w, h - top
+        self._render_begin()
+
+        r = self._render_text
+
         y = 0
-        w, h = self._size
         refs = self._refs
-        for line in self._lines:
+        for index, line in enumerate(self._lines):
             lh = line[1]
 
             # horizontal alignement
@@ -279,7 +399,8 @@ class MarkupLabel(MarkupLabelBase):
 
             for pw, ph, part, options in line[2]:
                 self.options = options
-                r(part, x, y + (lh - ph) / 1.25)
+                if index >= count:
+                    r(part, x, y - top + (lh - ph) / 1.25)
 
                 # should we record refs ?
                 ref = options['_ref']
@@ -295,7 +416,25 @@ class MarkupLabel(MarkupLabelBase):
         # get data from provider
         data = self._render_end()
         assert(data)
+        self._size = size
+        if top:
+            previous = self._rendered[3]
+            stride = len(previous.data) / previous.height
+            data = ImageData(w, h, data.fmt,
+                             previous.data[:top * stride] + data.data)
+        if self._appending:
+            # keep the pixels while text is appended, the first lines will be
+            # copied by the next rendering.
+            self._rendered = self._lines, size, ah, data
+        else:
+            self._rendered = None
+        if self._rasterize_only:
+            # rendered by a worker, the texture is created on the main thread
+            self._data = data
+            return
+        self._update_texture(data)
 
+    def _update_texture(self, data):
         # create texture is necessary
         texture = self.texture
         mipmap = self.options['mipmap']
@@ -311,7 +450,8 @@ class MarkupLabel(MarkupLabelBase):
             else:
                 texture = Texture.create_from_data(data, mipmap=mipmap)
             texture.flip_vertical()
-        elif self.width != texture.width or self.height != texture.height:
+        elif self.width != texture.width or self.height != texture.height \
+                or self._is_texture_shared(texture):
             if data is None:
                 texture = Texture.create(size=self.size, mipmap=mipmap)
             else:
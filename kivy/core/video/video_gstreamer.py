@@ -19,9 +19,8 @@ except:
     raise
 
 from os import path
-from threading import Lock
 from urllib import pathname2url
-from kivy.graphics.texture import Texture
+from kivy.graphics.texture import TextureStream
 from kivy.logger import Logger
 from functools import partial
 from weakref import ref
@@ -43,8 +42,7 @@ def _gst_new_buffer(obj, appsink):
     obj = obj()
     if not obj:
         return
-    with obj._buffer_lock:
-        obj._buffer = obj._videosink.emit('pull-buffer')
+    obj._push_buffer(obj._videosink.emit('pull-buffer'))
 
 
 def _on_gst_message(bus, message):
@@ -66,8 +64,7 @@ def _on_gst_eos(obj, *largs):
 class VideoGStreamer(VideoBase):
 
     def __init__(self, **kwargs):
-        self._buffer_lock = Lock()
-        self._buffer = None
+        self._stream = TextureStream(colorfmt='rgb', flip_vertical=True)
         self._texture = None
         self._gst_init()
         super(VideoGStreamer, self).__init__(**kwargs)
@@ -95,27 +92,26 @@ class VideoGStreamer(VideoBase):
         self._bus.connect('message::eos', partial(
             _on_gst_eos, ref(self)))
 
-    def _update_texture(self, buf):
-        # texture will be updated with newest buffer/frame
+    def _push_buffer(self, buf):
+        # called from the gstreamer thread, the frame will be uploaded in
+        # the next _update(). gst.Buffer support the buffer protocol, don't use
+        # buf.data that would copy the frame.
+        if buf is None:
+            return
         caps = buf.get_caps()[0]
         size = caps['width'], caps['height']
-        if not self._texture:
-            # texture is not allocated yet, so create it first
-            self._texture = Texture.create(size=size, colorfmt='rgb')
-            self._texture.flip_vertical()
-        # upload texture data to GPU
-        self._texture.blit_buffer(buf.data, size=size, colorfmt='rgb')
+        self._stream.push(buf, size=size, colorfmt='rgb')
 
     def _update(self, dt):
-        with self._buffer_lock:
-            if self._buffer is not None:
-                self._update_texture(self._buffer)
-                self._buffer = None
-                self.dispatch('on_frame')
+        # the stream swap between multiple textures, to not stall while the
+        # previous frame is drawn.
+        if self._stream.update():
+            self._texture = self._stream.texture
+            self.dispatch('on_frame')
 
     def unload(self):
         self._playbin.set_state(gst.STATE_NULL)
-        self._buffer = None
+        self._stream.clear()
         self._texture = None
 
     def load(self):
@@ -140,8 +136,7 @@ class VideoGStreamer(VideoBase):
 
         #if pipeline is not playing, we need to pull pre-roll to update frame
         if not self._state == 'playing':
-            with self._buffer_lock:
-                self._buffer = self._videosink.emit('pull-preroll')
+            self._push_buffer(self._videosink.emit('pull-preroll'))
 
     def _get_uri(self):
         uri = self.filename
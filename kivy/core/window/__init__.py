@@ -10,6 +10,7 @@ __all__ = ('Keyboard', 'WindowBase', 'Window')
 
 from os.path import join, exists
 from os import getcwd
+from time import sleep
 
 from kivy.core import core_select_lib
 from kivy.clock import Clock
@@ -531,12 +532,23 @@ class WindowBase(EventDispatcher):
         '''Flip between buffers'''
         pass
 
+    def idle_wait(self, timeout):
+        '''Called by the event loop when nothing need to be done, in
+        on-demand mode. Wait at most `timeout` seconds. A window provider
+        should override this method to return as soon as an event is
+        available.
+
+        .. versionadded:: 1.3.0
+        '''
+        sleep(timeout)
+
     def _update_childsize(self, instance, value):
         self.update_childsize([instance])
 
     def add_widget(self, widget):
         '''Add a widget on window'''
         widget.parent = self
+        widget.invalidate_window_matrix()
         self.children.insert(0, widget)
         self.canvas.add(widget.canvas)
         self.update_childsize([widget])
@@ -554,6 +566,7 @@ class WindowBase(EventDispatcher):
         self.children.remove(widget)
         self.canvas.remove(widget.canvas)
         widget.parent = None
+        widget.invalidate_window_matrix()
         widget.unbind(
             pos_hint=self._update_childsize,
             size_hint=self._update_childsize,
@@ -32,6 +32,8 @@ glReadPixels = GL_RGBA = GL_UNSIGNED_BYTE = None
 
 class WindowPygame(WindowBase):
 
+    _idle_event = pygame.USEREVENT + 1
+
     def create_window(self, *largs):
         # ensure the mouse is still not up after window creation, otherwise, we
         # have some weird bugs
@@ -196,6 +198,18 @@ class WindowPygame(WindowBase):
         pygame.display.flip()
         super(WindowPygame, self).flip()
 
+    def idle_wait(self, timeout):
+        # use a timer to be waked up by the first of the pygame events or the
+        # timeout, and put back the event for the next _mainloop().
+        ms = int(timeout * 1000)
+        if ms <= 0:
+            return
+        pygame.time.set_timer(self._idle_event, ms)
+        event = pygame.event.wait()
+        pygame.time.set_timer(self._idle_event, 0)
+        if event.type != self._idle_event:
+            pygame.event.post(event)
+
     def toggle_fullscreen(self):
         if self.flags & pygame.FULLSCREEN:
             self.flags &= ~pygame.FULLSCREEN
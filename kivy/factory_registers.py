@@ -59,6 +59,8 @@ r('StencilPush', module='kivy.graphics.stencil_instructions')
 r('StencilPop', module='kivy.graphics.stencil_instructions')
 r('StencilUse', module='kivy.graphics.stencil_instructions')
 r('StencilUnUse', module='kivy.graphics.stencil_instructions')
+r('ScissorPush', module='kivy.graphics.stencil_instructions')
+r('ScissorPop', module='kivy.graphics.stencil_instructions')
 r('Triangle', module='kivy.graphics.vertex_instructions')
 r('Quad', module='kivy.graphics.vertex_instructions')
 r('Rectangle', module='kivy.graphics.vertex_instructions')
@@ -67,6 +69,7 @@ r('Ellipse', module='kivy.graphics.vertex_instructions')
 r('Line', module='kivy.graphics.vertex_instructions')
 r('Point', module='kivy.graphics.vertex_instructions')
 r('Bezier', module='kivy.graphics.vertex_instructions')
+r('InstancedMesh', module='kivy.graphics.vertex_instructions')
 r('MotionEventFactory', module='kivy.input.factory')
 r('MotionEventProvider', module='kivy.input.provider')
 r('Shape', module='kivy.input.shape')
@@ -80,6 +83,7 @@ r('Button', module='kivy.uix.button')
 r('Bubble', module='kivy.uix.bubble')
 r('BubbleButton', module='kivy.uix.bubble')
 r('Camera', module='kivy.uix.camera')
+r('CodeInput', module='kivy.uix.codeinput')
 r('FloatLayout', module='kivy.uix.floatlayout')
 r('FileChooserListView', module='kivy.uix.filechooser')
 r('FileChooserIconView', module='kivy.uix.filechooser')
@@ -73,9 +73,12 @@ cdef class Buffer:
         cdef int i, block
         cdef void *p
 
-        # Ensure that our buffer is enough for having all the elements
+        # Ensure that our buffer is enough for having all the elements. Grow
+        # at least by the half of the current size, to avoid a realloc on
+        # every small add.
         if count > self.block_count - self.i_free:
-            self.grow(self.block_count + count)
+            self.grow(max(self.block_count + count,
+                          self.block_count + self.block_count / 2))
 
         # Add all the block inside our buffer
         for i in xrange(count):
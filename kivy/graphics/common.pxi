@@ -11,6 +11,9 @@ cdef extern from "math.h":
     double sin(double) nogil
     double sqrt(double) nogil
     double pow(double x, double y) nogil
+    double atan2(double y, double x) nogil
+    double fabs(double x) nogil
+    double ceil(double x) nogil
 
 cdef extern from "stdlib.h":
     ctypedef unsigned long size_t
@@ -20,8 +23,8 @@ cdef extern from "stdlib.h":
     void *calloc(size_t nmemb, size_t size) nogil
 
 cdef extern from "string.h":
-    void *memcpy(void *dest, void *src, size_t n)
-    void *memset(void *dest, int c, size_t len)
+    void *memcpy(void *dest, void *src, size_t n) nogil
+    void *memset(void *dest, int c, size_t len) nogil
 
 cdef extern from "Python.h":
     object PyString_FromStringAndSize(char *s, Py_ssize_t len)
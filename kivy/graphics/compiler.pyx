@@ -117,9 +117,10 @@ cdef class GraphicsCompiler:
                     # on texture case, bindtexture don't use context_state
                     # to transfer changes on render context, but use directly
                     # rendercontext.set_texture(). So we have no choice to try the
-                    # apply(), and saving in cs, as a texture0
-                    if 'texture0' not in cs:
-                        cs.append('texture0')
+                    # apply(), and saving in cs, as a texture<index>
+                    state = 'texture%d' % (<BindTexture>ci)._index
+                    if state not in cs:
+                        cs.append(state)
                         needed = 1
 
                 else:
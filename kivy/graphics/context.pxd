@@ -18,6 +18,10 @@ cdef class Context:
     cdef list lr_vbo
     cdef list lr_fbo
 
+    cdef list reload_queue
+    cdef double reload_start
+    cdef public double reload_budget
+
     cdef void register_texture(self, Texture texture)
     cdef void register_canvas(self, Canvas canvas)
     cdef void register_vbo(self, VBO vbo)
@@ -32,6 +36,7 @@ cdef class Context:
     cdef void dealloc_fbo(self, Fbo fbo)
 
     cdef object trigger_gl_dealloc
+    cdef object trigger_gl_reload
     cdef void flush(self)
 
 cpdef Context get_context()
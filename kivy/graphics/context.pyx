@@ -39,8 +39,11 @@ cdef class Context:
         self.l_vertexbatch = []
         self.l_shader = []
         self.l_fbo = []
+        self.reload_queue = []
+        self.reload_budget = .004
         self.flush()
         self.trigger_gl_dealloc = Clock.create_trigger(self.gl_dealloc, 0)
+        self.trigger_gl_reload = Clock.create_trigger(self.gl_reload, 0)
 
     cdef void flush(self):
         self.lr_texture = []
@@ -69,6 +72,9 @@ cdef class Context:
     cdef void dealloc_texture(self, Texture texture):
         if texture._nofree or texture.__class__ is TextureRegion:
             return
+        if texture._id == -1:
+            # lost with the context, and never reloaded
+            return
         self.lr_texture.append(texture.id)
         self.trigger_gl_dealloc()
 
@@ -116,6 +122,17 @@ cdef class Context:
                 continue
 
     def reload(self):
+        '''Reload all the graphics objects after a context loss.
+
+        VBOs, shaders and canvas are reloaded immediately. Textures are
+        reloaded when they are used for the first time, and the others are
+        reloaded in the background, with a time budget of
+        :data:`reload_budget` seconds per frame (default to 0.004). The reload
+        observers are called when all the textures are reloaded.
+
+        .. versionchanged:: 1.3.0
+            Textures are reloaded lazily.
+        '''
         cdef VBO vbo
         cdef VertexBatch batch
         cdef Texture texture
@@ -139,25 +156,28 @@ cdef class Context:
         # then merged from the cache cause of the same source
         Logger.debug('Context: Reload textures')
         cdef list l = self.l_texture[:]
+        cdef list queue = []
         for item in l:
             texture = item()
             if texture is None:
                 continue
             texture._id = -1
 
-        # First time, only reload base texture
+        # Textures are not reloaded now, that would freeze the application if
+        # many images are used. A texture is reloaded the first time it's
+        # bound, and the others are reloaded in the background, few per
+        # frame. Base textures must be reloaded before the texture regions.
         for item in l:
             texture = item()
-            if texture is None or isinstance(texture, TextureRegion):
-                continue
-            texture.reload()
-
-        # Second time, update texture region id
+            if texture is not None and not isinstance(texture, TextureRegion):
+                queue.append(item)
         for item in l:
             texture = item()
-            if texture is None or not isinstance(texture, TextureRegion):
-                continue
-            texture.reload()
+            if texture is not None and isinstance(texture, TextureRegion):
+                queue.append(item)
+        queue.reverse()
+        self.reload_queue = queue
+        self.reload_start = start
 
         Logger.debug('Context: Reload vbos')
         for item in self.l_vbo[:]:
@@ -184,18 +204,84 @@ cdef class Context:
                 Logger.trace('Context: reloaded %r' % item())
                 canvas.reload()
 
-        # call reload observers that want to do something after a whole gpu
-        # reloading.
-        for callback in self.observers[:]:
-            if callback.is_dead():
-                self.observers.remove(callback)
-                continue
-            callback()(self)
-
         glFinish()
         dt = time() - start
-        Logger.info('Context: Reloading done in %2.4fs' % dt)
+        Logger.info('Context: Reloading done in %2.4fs, %d textures pending' % (
+            dt, len(queue)))
+        self.gl_reload()
+
+    def get_memory_usage(self):
+        '''Return an estimation of the GPU memory used by the graphics objects,
+        in bytes. The result is a dict with the keys `texture`, `vbo`, `fbo`
+        and `total`.
+
+        Textures are counted with their power-of-two padding and mipmaps.
+        Texture regions are not counted, only the texture they belong to.
 
+        .. versionadded:: 1.3.0
+        '''
+        usage = {'texture': 0, 'vbo': 0, 'fbo': 0}
+        for kind, name, size in self._iterate_memory():
+            usage[kind] += size
+        usage['total'] = sum(usage.values())
+        return usage
+
+    def get_memory_consumers(self, count=10):
+        '''Return the `count` biggest GPU memory consumers, as a list of
+        (size, kind, name) sorted by size. The objects are grouped by name:
+        the source of the texture if any, or the object representation.
+
+        .. versionadded:: 1.3.0
+        '''
+        consumers = {}
+        for kind, name, size in self._iterate_memory():
+            key = kind, name
+            consumers[key] = consumers.get(key, 0) + size
+        result = [(size, kind, name) for (kind, name), size in
+                  consumers.iteritems()]
+        result.sort(reverse=True)
+        return result[:count]
+
+    def _iterate_memory(self):
+        cdef Texture texture
+        cdef VBO vbo
+        cdef VertexBatch batch
+        cdef Fbo fbo
+        cdef set ids = set()
+
+        for item in self.l_texture:
+            texture = item()
+            if texture is None or texture._id == -1 or \
+                    isinstance(texture, TextureRegion):
+                continue
+            # the same opengl texture can be shared between textures
+            if texture._id in ids:
+                continue
+            ids.add(texture._id)
+            name = texture._source
+            if name is None:
+                name = '<Texture size=%r colorfmt=%r>' % (
+                    texture.size, texture.colorfmt)
+            yield 'texture', name, texture.get_gpu_size()
+
+        for item in self.l_vbo:
+            vbo = item()
+            if vbo is not None and vbo.have_id():
+                yield 'vbo', '<VBO>', vbo.vbo_size
+
+        for item in self.l_vertexbatch:
+            batch = item()
+            if batch is not None and batch.have_id():
+                yield 'vbo', '<VertexBatch>', batch.elements_size
+
+        for item in self.l_fbo:
+            fbo = item()
+            if fbo is None or fbo.depthbuffer_id == -1:
+                continue
+            # the texture of the fbo is already counted, only add the depth
+            # buffer (estimated to 32 bits per pixel).
+            yield 'fbo', '<Fbo size=%r>' % (fbo.size, ), \
+                    fbo._width * fbo._height * 4
 
     def gc(self, *largs):
         self.l_texture = [x for x in self.l_texture if x() is not None]
@@ -226,6 +312,35 @@ cdef class Context:
                 if j != -1:
                     glDeleteRenderbuffers(1, &j)
 
+    def gl_reload(self, *largs):
+        # reload the pending textures, until the time budget for this frame is
+        # exhausted.
+        cdef Texture texture
+        cdef list queue = self.reload_queue
+        start = time()
+        while len(queue):
+            texture = queue.pop()()
+            if texture is None:
+                continue
+            # already reloaded if it have been used since the context loss
+            texture.reload()
+            if time() - start > self.reload_budget:
+                break
+        if len(queue):
+            self.trigger_gl_reload()
+            return
+
+        # call reload observers that want to do something after a whole gpu
+        # reloading.
+        for callback in self.observers[:]:
+            if callback.is_dead():
+                self.observers.remove(callback)
+                continue
+            callback()(self)
+
+        Logger.info('Context: Textures reloaded in %2.4fs' % (
+            time() - self.reload_start))
+
 
 cpdef Context get_context():
     global context
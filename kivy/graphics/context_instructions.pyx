@@ -265,9 +265,16 @@ cdef class BindTexture(ContextInstruction):
         def __get__(self):
             return self._texture
         def __set__(self, object texture):
+            cdef Texture current = self._texture
+            cdef Texture new
             if not texture:
                 texture = get_default_texture()
-            self._texture = texture
+            self._texture = new = texture
+            # the compiler may ignore this instruction if it was binding the
+            # same texture as the previous one: compile again if it changes.
+            if current is None or current._id != new._id or \
+                    current._target != new._target:
+                self.flag_update()
 
     property index:
         def __get__(self):
@@ -1,6 +1,8 @@
 from c_opengl cimport *
 from instructions cimport RenderContext, Canvas
 from texture cimport Texture
+from transformation cimport matrix_t
+from vbo cimport VertexBatch
 
 cdef class Fbo(RenderContext):
     cdef int _width
@@ -11,6 +13,8 @@ cdef class Fbo(RenderContext):
     cdef GLuint buffer_id
     cdef GLuint depthbuffer_id
     cdef GLint _viewport[4]
+    cdef GLint _scissor_box[4]
+    cdef int _scissor_enabled
     cdef Texture _texture
     cdef int _is_bound
     cdef list observers
@@ -25,3 +29,32 @@ cdef class Fbo(RenderContext):
     cdef void raise_exception(self, str message, int status=?)
     cdef str resolve_status(self, int status)
     cdef void reload(self)
+
+cdef class FboPool:
+    cdef public int limit
+    cdef public double timeout
+    cdef list pool
+    cdef list transients
+    cdef object trigger_release_transients
+    cdef long _hits
+    cdef long _misses
+
+cdef class CachedCanvas(Canvas):
+    cdef Fbo _fbo
+    cdef VertexBatch batch
+    cdef int _cache
+    cdef int _is_cached
+    cdef int _width
+    cdef int _height
+    cdef matrix_t _modelview_mat
+    cdef matrix_t _projection_mat
+    cdef list _color
+    cdef dict _textures
+    cdef long _hits
+    cdef long _misses
+
+    cdef void apply(self)
+    cdef void reload(self)
+    cdef int cache_is_valid(self, RenderContext context, int width, int height)
+    cdef void render_cache(self, RenderContext context)
+    cdef void draw_cache(self, RenderContext context)
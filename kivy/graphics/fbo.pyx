@@ -63,14 +63,76 @@ function that will be automatically called when needed::
 This way, you could use the same method for initialization and for reloading.
 But it's up to you.
 
+Reusing framebuffers
+--------------------
+
+.. versionadded:: 1.3.0
+
+Creating a framebuffer allocate a texture and a framebuffer object on the GPU,
+and it's slow. If you need offscreen rendering for a short time (screenshot,
+transition between two screens, blur effect...), you can take a framebuffer
+from the :data:`fbo_pool`, and give it back when you don't need it anymore::
+
+    from kivy.graphics.fbo import fbo_pool
+
+    fbo = fbo_pool.acquire((256, 256))
+    with fbo:
+        # .. put your Color / Rectangle / ... here
+    fbo.draw()
+    # use fbo.texture
+    fbo_pool.release(fbo)
+
+The released framebuffers are kept in the pool, and reused by the next
+:func:`FboPool.acquire` with the same size, color format and depth buffer. The
+least recently released are deleted when the pool is full, or when they have
+not been used for :data:`FboPool.timeout` seconds.
+
+If you need the framebuffer only for the current frame, use
+:func:`FboPool.acquire_transient`: it will be released automatically after the
+next frame is drawn.
+
+Caching a static part of the graphics tree
+------------------------------------------
+
+.. versionadded:: 1.3.0
+
+When a frame need to be drawn, all the instructions of all the canvas are
+applied again, even if only one of them have changed. If a part of your graphics
+tree is mostly static (a dashboard background, a complex drawing that rarely
+change...), you can put it inside a :class:`CachedCanvas`::
+
+    from kivy.graphics import CachedCanvas, Color, Rectangle
+
+    with self.canvas:
+        self.cache = CachedCanvas()
+    with self.cache:
+        Color(1, 0, 0)
+        Rectangle(pos=self.pos, size=self.size)
+        # ... lot of instructions
+
+The first time, the children are drawn into a framebuffer that have the size of
+the current viewport. Then, as long as none of the children have changed and the
+modelview/projection matrices, the current color and the textures bound on the
+other units than 0 are the same, the framebuffer is drawn instead of walking
+again through all the children.
+
+.. note::
+
+    The states changed by the children of a :class:`CachedCanvas` (color,
+    texture, matrix...) are restored after it, they don't leak on the next
+    instructions. Any other state set before it (like a custom shader uniform)
+    is not tracked: set it inside the :class:`CachedCanvas`, or call
+    :func:`CachedCanvas.invalidate` when it change.
+
 '''
 
-__all__ = ('Fbo', )
+__all__ = ('Fbo', 'FboPool', 'fbo_pool', 'CachedCanvas')
 
 include "config.pxi"
 include "opcodes.pxi"
 
 from os import environ
+from kivy.clock import Clock
 from kivy.logger import Logger
 from kivy.weakmethod import WeakMethod
 from kivy.graphics.texture cimport Texture
@@ -80,7 +142,11 @@ from kivy.graphics.context cimport get_context
 from kivy.graphics.c_opengl cimport *
 IF USE_OPENGL_DEBUG == 1:
     from kivy.graphics.c_opengl_debug cimport *
-from kivy.graphics.instructions cimport RenderContext, Canvas
+from kivy.graphics.instructions cimport RenderContext, Canvas, \
+    getActiveContext
+from kivy.graphics.vbo cimport VertexBatch
+from kivy.graphics.vertex cimport vertex_t
+from libc.string cimport memcmp, memcpy
 
 cdef list fbo_stack = [0]
 cdef list fbo_release_list = []
@@ -178,6 +244,9 @@ cdef class Fbo(RenderContext):
         if self._texture is None:
             self._texture = Texture.create(size=(self._width, self._height))
             do_clear = 1
+        elif self._texture._id == -1:
+            # the context have been lost, the texture may not be reloaded yet.
+            self._texture.reload()
 
         # create framebuffer
         glGenFramebuffers(1, &f_id)
@@ -242,6 +311,12 @@ cdef class Fbo(RenderContext):
         fbo_stack.append(self.buffer_id)
         glBindFramebuffer(GL_FRAMEBUFFER, self.buffer_id)
 
+        # the clipping rectangle of the window don't apply to us
+        self._scissor_enabled = glIsEnabled(GL_SCISSOR_TEST)
+        if self._scissor_enabled:
+            glGetIntegerv(GL_SCISSOR_BOX, <GLint *>self._scissor_box)
+            glDisable(GL_SCISSOR_TEST)
+
         # if asked, push the viewport
         if self._push_viewport:
             glGetIntegerv(GL_VIEWPORT, <GLint *>self._viewport)
@@ -259,6 +334,11 @@ cdef class Fbo(RenderContext):
         fbo_stack.pop()
         glBindFramebuffer(GL_FRAMEBUFFER, fbo_stack[-1])
 
+        if self._scissor_enabled:
+            glEnable(GL_SCISSOR_TEST)
+            glScissor(self._scissor_box[0], self._scissor_box[1],
+                      self._scissor_box[2], self._scissor_box[3])
+
         # if asked, restore the viewport
         if self._push_viewport:
             glViewport(self._viewport[0], self._viewport[1],
@@ -366,3 +446,327 @@ cdef class Fbo(RenderContext):
         def __get__(self):
             return self._texture
 
+
+
+cdef class FboPool:
+    '''Pool of framebuffers, check the module documentation for more
+    information. Use the :data:`fbo_pool` instance instead of creating your
+    own pool.
+
+    .. versionadded:: 1.3.0
+
+    :Parameters:
+        `limit`: int, default to 8
+            Maximum number of unused framebuffers kept in the pool.
+        `timeout`: float, default to 10
+            Unused framebuffers are deleted after `timeout` seconds.
+    '''
+
+    def __init__(self, limit=8, timeout=10):
+        self.limit = limit
+        self.timeout = timeout
+        self.pool = []
+        self.transients = []
+        self._hits = self._misses = 0
+        self.trigger_release_transients = Clock.create_trigger(
+                self.release_transients, 0)
+
+    def acquire(self, size, colorfmt='rgba', with_depthbuffer=False,
+            clear_color=(0, 0, 0, 0), push_viewport=True):
+        '''Return a framebuffer of the requested size and format, cleared
+        with `clear_color`. The framebuffer is taken from the pool if
+        possible, or created.
+
+        Give the framebuffer back with :func:`release` when you don't need it
+        anymore.
+        '''
+        cdef Fbo fbo
+        cdef int i, width, height
+        cdef int depth = int(with_depthbuffer)
+        width, height = size
+
+        # search from the most recently released
+        for i in xrange(len(self.pool) - 1, -1, -1):
+            fbo = self.pool[i][1]
+            if fbo._width != width or fbo._height != height or \
+                    fbo._depthbuffer_attached != depth or \
+                    fbo._texture.colorfmt != colorfmt:
+                continue
+            del self.pool[i]
+            self._hits += 1
+            fbo.clear_color = clear_color
+            fbo._push_viewport = int(push_viewport)
+            fbo.bind()
+            fbo.clear_buffer()
+            fbo.release()
+            return fbo
+
+        self._misses += 1
+        fbo = Fbo(size=(width, height), with_depthbuffer=depth,
+                  clear_color=clear_color, push_viewport=push_viewport,
+                  texture=Texture.create(size=(width, height),
+                                         colorfmt=colorfmt),
+                  noadd=True)
+        # the pool don't want to own it, let the user canvas remove it.
+        fbo.flags &= ~GI_NO_REMOVE
+        fbo.bind()
+        fbo.clear_buffer()
+        fbo.release()
+        return fbo
+
+    def acquire_transient(self, size, colorfmt='rgba', with_depthbuffer=False,
+            clear_color=(0, 0, 0, 0), push_viewport=True):
+        '''Same as :func:`acquire`, but the framebuffer is automatically
+        released after the next frame. Don't keep any reference to it, or to
+        its texture.
+        '''
+        fbo = self.acquire(size, colorfmt, with_depthbuffer, clear_color,
+                           push_viewport)
+        self.transients.append((Clock.get_time(), fbo))
+        self.trigger_release_transients()
+        return fbo
+
+    def release(self, Fbo fbo):
+        '''Give a framebuffer back to the pool. Its children are removed, and
+        it's removed from its parent canvas.
+        '''
+        if fbo._is_bound:
+            fbo.raise_exception('FBO cannot be released to the pool (binded).')
+        if fbo.parent is not None:
+            fbo.parent.remove(fbo)
+        fbo.clear()
+        del fbo.observers[:]
+        self.pool.append((Clock.get_time(), fbo))
+        # the least recently released are deleted first
+        if len(self.pool) > self.limit:
+            del self.pool[:len(self.pool) - self.limit]
+        Clock.unschedule(self.purge)
+        Clock.schedule_once(self.purge, self.timeout)
+
+    def release_transients(self, *largs):
+        cdef double now = Clock.get_time()
+        # the transient acquired during this frame must survive until the
+        # frame is drawn.
+        for item in self.transients[:]:
+            if item[0] < now:
+                self.transients.remove(item)
+                self.release(item[1])
+        if len(self.transients):
+            self.trigger_release_transients()
+
+    def purge(self, *largs):
+        '''Delete the framebuffers that have not been used for
+        :data:`timeout` seconds.
+        '''
+        cdef double now = Clock.get_time()
+        self.pool = [x for x in self.pool if now - x[0] < self.timeout]
+        if len(self.pool):
+            Clock.schedule_once(self.purge, self.timeout)
+
+    def clear(self):
+        '''Delete all the unused framebuffers.
+        '''
+        self.pool = []
+        Clock.unschedule(self.purge)
+
+    property stats:
+        '''Return a tuple (hits, misses, unused) of how many framebuffers
+        have been reused, created, and how many are currently unused in the
+        pool (readonly).
+        '''
+        def __get__(self):
+            return (self._hits, self._misses, len(self.pool))
+
+
+#: Default framebuffer pool
+fbo_pool = FboPool()
+
+
+cdef class CachedCanvas(Canvas):
+    '''Canvas that keep the result of its drawing in a framebuffer, and draw
+    the framebuffer instead of its children as long as nothing changed. Check
+    the module documentation for more information.
+
+    .. versionadded:: 1.3.0
+
+    :Parameters:
+        `cache`: bool, default to True
+            If False, the children are always drawn, like a normal
+            :class:`~kivy.graphics.instructions.Canvas`.
+    '''
+
+    def __init__(self, **kwargs):
+        Canvas.__init__(self, **kwargs)
+        self._cache = int(kwargs.get('cache', True))
+        self._is_cached = 0
+        self._width = self._height = 0
+        self._hits = self._misses = 0
+        self._color = None
+        self._textures = None
+        self._fbo = None
+        self.batch = VertexBatch()
+        self.batch.set_mode('triangles')
+
+    cdef void apply(self):
+        cdef RenderContext context = getActiveContext()
+        cdef GLint viewport[4]
+
+        if not self._cache or context is None:
+            Canvas.apply(self)
+            return
+
+        glGetIntegerv(GL_VIEWPORT, <GLint *>viewport)
+        if not self.cache_is_valid(context, viewport[2], viewport[3]):
+            self._misses += 1
+            self.render_cache(context)
+        else:
+            self._hits += 1
+        self.draw_cache(context)
+
+    cdef int cache_is_valid(self, RenderContext context, int width, int height):
+        cdef Matrix mv = context.get_state('modelview_mat')
+        cdef Matrix proj = context.get_state('projection_mat')
+        cdef int valid = self._is_cached
+
+        if self.flags & GI_NEEDS_UPDATE:
+            valid = 0
+        if width != self._width or height != self._height:
+            self._width = width
+            self._height = height
+            valid = 0
+        if memcmp(mv.mat, self._modelview_mat, sizeof(matrix_t)) != 0:
+            memcpy(self._modelview_mat, mv.mat, sizeof(matrix_t))
+            valid = 0
+        if memcmp(proj.mat, self._projection_mat, sizeof(matrix_t)) != 0:
+            memcpy(self._projection_mat, proj.mat, sizeof(matrix_t))
+            valid = 0
+        # the children can use the color and the textures set before us. The
+        # texture 0 is left by the previous frame, and bound again by each
+        # vertex instruction, don't track it.
+        color = context.get_state('color')
+        if color != self._color:
+            self._color = list(color)
+            valid = 0
+        textures = dict(context.bind_texture)
+        textures.pop(0, None)
+        if textures != self._textures:
+            self._textures = textures
+            valid = 0
+        return valid
+
+    cdef void render_cache(self, RenderContext context):
+        cdef Fbo fbo = self._fbo
+        cdef int width = self._width, height = self._height
+        cdef float w = width, h = height
+        cdef vertex_t vertices[4]
+        cdef unsigned short *indices = [0, 1, 2, 2, 3, 0]
+        cdef Texture texture
+
+        if fbo is None or fbo._width != width or fbo._height != height:
+            # the viewport size changed, take another framebuffer from the
+            # pool instead of reallocating ours.
+            if fbo is not None:
+                fbo_pool.release(fbo)
+            self._fbo = fbo = fbo_pool.acquire((width, height),
+                                               push_viewport=False)
+            # creating the framebuffer upload the uniforms of the fbo on the
+            # current program, restore ours.
+            context.enter()
+
+            # the framebuffer have the same size as the viewport.
+            texture = fbo._texture
+            vertices[0].x = 0
+            vertices[0].y = 0
+            vertices[0].s0 = texture._tex_coords[0]
+            vertices[0].t0 = texture._tex_coords[1]
+            vertices[1].x = w
+            vertices[1].y = 0
+            vertices[1].s0 = texture._tex_coords[2]
+            vertices[1].t0 = texture._tex_coords[3]
+            vertices[2].x = w
+            vertices[2].y = h
+            vertices[2].s0 = texture._tex_coords[4]
+            vertices[2].t0 = texture._tex_coords[5]
+            vertices[3].x = 0
+            vertices[3].y = h
+            vertices[3].s0 = texture._tex_coords[6]
+            vertices[3].t0 = texture._tex_coords[7]
+            self.batch.set_data(vertices, 4, indices, 6)
+
+        fbo.bind()
+        fbo.clear_buffer()
+
+        # accumulate the alpha in the framebuffer, the result is a
+        # premultiplied image.
+        glBlendFuncSeparate(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA,
+                            GL_ONE, GL_ONE_MINUS_SRC_ALPHA)
+        # clear our flag before drawing the children: the children changed
+        # during the drawing (a Callback moving a Rectangle) flag us again, and
+        # the cache is drawn again on the next frame, not twice in this one.
+        context.save_states()
+        if self.compiler is not None and self.flags & GI_NEEDS_UPDATE:
+            # build() clear the flag, and the compiler apply the children.
+            self.build()
+            self.flags &= ~GI_NO_APPLY_ONCE
+        else:
+            self.flag_update_done()
+            Canvas.apply(self)
+        context.restore_states()
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+        fbo.release()
+        self._is_cached = 1
+
+    cdef void draw_cache(self, RenderContext context):
+        cdef Matrix projection_mat = Matrix()
+        cdef Texture texture = context.bind_texture.get(0)
+        projection_mat.view_clip(0.0, self._width, 0.0, self._height,
+                                 -1.0, 1.0, 0)
+
+        context.save_states()
+        context.set_state('projection_mat', projection_mat)
+        context.set_state('modelview_mat', Matrix())
+        context.set_state('color', [1.0, 1.0, 1.0, 1.0])
+        context.set_texture(0, self._fbo._texture)
+        glBlendFunc(GL_ONE, GL_ONE_MINUS_SRC_ALPHA)
+        self.batch.draw()
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        context.restore_states()
+        if texture is not None:
+            context.set_texture(0, texture)
+
+    cdef void reload(self):
+        self._is_cached = 0
+        self.flag_update()
+
+    def invalidate(self):
+        '''Force the children to be drawn again into the framebuffer on the
+        next frame.
+        '''
+        self._is_cached = 0
+        self.flag_update()
+
+    property cache:
+        '''If True, the children are drawn into a framebuffer, and the
+        framebuffer is reused until something changed.
+        '''
+        def __get__(self):
+            return bool(self._cache)
+        def __set__(self, value):
+            cdef int ivalue = int(value)
+            if ivalue == self._cache:
+                return
+            self._cache = ivalue
+            self._is_cached = 0
+            if not ivalue and self._fbo is not None:
+                fbo_pool.release(self._fbo)
+                self._fbo = None
+            self.flag_update()
+
+    property stats:
+        '''Return a tuple (hits, misses) of how many times the framebuffer
+        have been drawn, and how many times the children have been drawn into
+        the framebuffer (readonly).
+        '''
+        def __get__(self):
+            return (self._hits, self._misses)
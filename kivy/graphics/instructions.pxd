@@ -94,6 +94,8 @@ cdef class Canvas(CanvasBase):
 cdef class RenderContext(Canvas):
     cdef Shader _shader
     cdef dict state_stacks
+    cdef dict saved_states
+    cdef list saved_states_stack
     #cdef TextureManager texture_manager
     cdef Texture default_texture
     cdef dict bind_texture
@@ -106,9 +108,12 @@ cdef class RenderContext(Canvas):
     cdef void push_states(self, list names)
     cdef void pop_state(self, str name)
     cdef void pop_states(self, list names)
+    cdef void save_states(self)
+    cdef void restore_states(self)
     cdef void enter(self)
     cdef void leave(self)
     cdef void apply(self)
     cpdef draw(self)
     cdef void reload(self)
 
+cdef RenderContext getActiveContext()
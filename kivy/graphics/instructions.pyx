@@ -122,8 +122,10 @@ cdef class InstructionGroup(Instruction):
                 c.apply()
 
     cdef void build(self):
-        self.compiled_children = self.compiler.compile(self)
+        # the instructions changed during the compilation (a Line creating
+        # its texture when it's built) flag us again for the next frame.
         self.flag_update_done()
+        self.compiled_children = self.compiler.compile(self)
 
     cpdef add(self, Instruction c):
         '''Add a new :class:`Instruction` to our list.
@@ -601,6 +603,33 @@ from kivy.cache import Cache
 from kivy.core.image import Image
 from kivy.graphics.transformation cimport Matrix
 
+# Counters of the state stack operations done during the current frame. They
+# are resetted each time a toplevel RenderContext start to draw.
+cdef long _stats_push = 0
+cdef long _stats_pop = 0
+cdef long _stats_restore = 0
+cdef long _stats_skip = 0
+
+
+def get_frame_stats():
+    '''Return a dict with the number of state operations done by all the
+    :class:`RenderContext` during the last frame:
+
+    - `push`: states explicitly pushed (:class:`PushMatrix`...)
+    - `pop`: states explicitly popped (:class:`PopMatrix`...)
+    - `restore`: states restored after drawing a render context, because one
+      of the children instructions changed them
+    - `skip`: states left untouched after drawing a render context
+
+    .. versionadded:: 1.3.0
+    '''
+    return {
+        'push': _stats_push,
+        'pop': _stats_pop,
+        'restore': _stats_restore,
+        'skip': _stats_skip}
+
+
 cdef class RenderContext(Canvas):
     '''The render context stores all the necessary information for drawing, i.e.:
 
@@ -608,10 +637,17 @@ cdef class RenderContext(Canvas):
     - The fragment shader
     - The default texture
     - The state stack (color, texture, matrix...)
+
+    .. versionchanged:: 1.3.0
+        The states are not pushed/popped anymore around the drawing of the
+        render context. Only the states changed by the children instructions
+        are saved, and restored when the drawing is done.
     '''
     def __init__(self, *args, **kwargs):
         cdef str key
         self.bind_texture = dict()
+        self.saved_states = None
+        self.saved_states_stack = []
         Canvas.__init__(self, **kwargs)
         vs_src = kwargs.get('vs', None)
         fs_src = kwargs.get('fs', None)
@@ -646,6 +682,11 @@ cdef class RenderContext(Canvas):
         else:
             d = self.state_stacks[name]
             if value != d[-1]:
+                # remember the value seen before the first change, in order to
+                # restore it when the drawing will be done.
+                if self.saved_states is not None and \
+                        name not in self.saved_states:
+                    self.saved_states[name] = d[-1]
                 d[-1] = value
                 self.flag_update()
         self._shader.set_uniform(name, value)
@@ -659,8 +700,10 @@ cdef class RenderContext(Canvas):
             self.set_state(name, value)
 
     cdef void push_state(self, str name):
+        global _stats_push
         stack = self.state_stacks[name]
         stack.append(stack[-1])
+        _stats_push += 1
         self.flag_update()
 
     cdef void push_states(self, list names):
@@ -669,8 +712,10 @@ cdef class RenderContext(Canvas):
             self.push_state(name)
 
     cdef void pop_state(self, str name):
+        global _stats_pop
         stack = self.state_stacks[name]
         oldvalue = stack.pop()
+        _stats_pop += 1
         if oldvalue != stack[-1]:
             self.set_state(name, stack[-1])
             self.flag_update()
@@ -680,6 +725,28 @@ cdef class RenderContext(Canvas):
         for name in names:
             self.pop_state(name)
 
+    cdef void save_states(self):
+        # start to track the states changed by our children
+        self.saved_states_stack.append(self.saved_states)
+        self.saved_states = {}
+
+    cdef void restore_states(self):
+        # restore only the states that have been changed since save_states(),
+        # and reupload them in the shader.
+        global _stats_restore, _stats_skip
+        cdef dict saved = self.saved_states
+        cdef str name
+        cdef list stack
+        self.saved_states = self.saved_states_stack.pop()
+        for name, value in saved.iteritems():
+            stack = self.state_stacks[name]
+            if stack[-1] == value:
+                continue
+            stack[-1] = value
+            self._shader.set_uniform(name, value)
+            _stats_restore += 1
+        _stats_skip += len(self.state_stacks) - len(saved)
+
     cdef void set_texture(self, int index, Texture texture):
         # TODO this code is actually broken,
         # the binded texture can be already set, but we may changed if we came
@@ -688,12 +755,22 @@ cdef class RenderContext(Canvas):
         #   self.bind_texture[index] is texture:
         #    return
         global _active_texture
+        cdef Texture current = self.bind_texture.get(index)
         self.bind_texture[index] = texture
         if _active_texture != index:
             _active_texture = index
             glActiveTexture(GL_TEXTURE0 + index)
+        if texture._id == -1:
+            # the texture is used before the context finished to reload it in
+            # the background, do it now.
+            texture.reload()
         glBindTexture(texture._target, texture._id)
-        self.flag_update()
+        # don't flag the context if the same opengl texture is already binded
+        # (regions of the same atlas), the compiler will ignore the next
+        # BindTexture.
+        if current is None or current._id != texture._id or \
+                current._target != texture._target:
+            self.flag_update()
 
     cdef void enter(self):
         self._shader.use()
@@ -702,13 +779,16 @@ cdef class RenderContext(Canvas):
         self._shader.stop()
 
     cdef void apply(self):
-        cdef list keys = self.state_stacks.keys()
+        global _stats_push, _stats_pop, _stats_restore, _stats_skip
+        if getActiveContext() is None:
+            # toplevel context, a new frame is starting.
+            _stats_push = _stats_pop = _stats_restore = _stats_skip = 0
         pushActiveContext(self)
         if _need_reset_gl:
             reset_gl_context()
-        self.push_states(keys)
+        self.save_states()
         Canvas.apply(self)
-        self.pop_states(keys)
+        self.restore_states()
         popActiveContext()
         self.flag_update_done()
 
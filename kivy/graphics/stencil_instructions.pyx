@@ -87,9 +87,36 @@ Here is an example, in kv style::
 
     StencilPop
 
+Clipping to a rectangle
+-----------------------
+
+.. versionadded:: 1.3.0
+
+If you only want to clip the drawing to a rectangle, use
+:class:`ScissorPush` and :class:`ScissorPop` instead::
+
+    ScissorPush:
+        pos: 100, 100
+        size: 100, 100
+
+    # all the drawing here is clipped to the rectangle
+    Color:
+        rgb: 0, 1, 0
+    Rectangle:
+        size: 900, 900
+
+    ScissorPop
+
+As long as the rectangle is not rotated by the current matrices, the clipping
+is done with the OpenGL scissor test: nothing need to be drawn in the stencil
+buffer, and that's a lot faster. Otherwise, the rectangle is drawn in the
+stencil buffer, as you would do with :class:`StencilPush`. The clipping
+rectangles can be nested, the drawing is clipped to their intersection.
+
 '''
 
-__all__ = ('StencilPush', 'StencilPop', 'StencilUse')
+__all__ = ('StencilPush', 'StencilPop', 'StencilUse', 'StencilUnUse',
+           'ScissorPush', 'ScissorPop')
 
 include "config.pxi"
 include "opcodes.pxi"
@@ -97,51 +124,81 @@ include "opcodes.pxi"
 from c_opengl cimport *
 IF USE_OPENGL_DEBUG == 1:
     from c_opengl_debug cimport *
-from instructions cimport Instruction
+from instructions cimport Instruction, RenderContext, getActiveContext
+from transformation cimport Matrix
+from vbo cimport VertexBatch
+from vertex cimport vertex_t
+from libc.string cimport memset
 
 cdef int _stencil_level = 0
 cdef int _stencil_in_push = 0
 
+# (context, push instruction, scissor box or None if the stencil is used)
+cdef list _scissor_stack = []
+
+
+cdef void stencil_push():
+    global _stencil_level, _stencil_in_push
+    if _stencil_in_push:
+        raise Exception('Cannot use StencilPush inside another '
+                        'StencilPush.\nUse StencilUse before.')
+    _stencil_in_push = 1
+    _stencil_level += 1
+
+    if _stencil_level == 1:
+        glStencilMask(0xff)
+        glClearStencil(0)
+        glClear(GL_STENCIL_BUFFER_BIT)
+    if _stencil_level > 128:
+        raise Exception('Cannot push more than 8 level of stencil.'
+                        ' (stack overflow)')
+
+    glEnable(GL_STENCIL_TEST)
+    glStencilFunc(GL_ALWAYS, 0, 0)
+    glStencilOp(GL_INCR, GL_INCR, GL_INCR)
+    glColorMask(0, 0, 0, 0)
+
+
+cdef void stencil_pop():
+    global _stencil_level, _stencil_in_push
+    if _stencil_level == 0:
+        raise Exception('Too much StencilPop (stack underflow)')
+    _stencil_level -= 1
+    _stencil_in_push = 0
+    glColorMask(1, 1, 1, 1)
+    if _stencil_level == 0:
+        glDisable(GL_STENCIL_TEST)
+        return
+    # reset for previous
+    glStencilFunc(GL_EQUAL, _stencil_level, 0xff)
+    glStencilOp(GL_KEEP, GL_KEEP, GL_KEEP)
+
+
+cdef void stencil_use():
+    global _stencil_in_push
+    _stencil_in_push = 0
+    glColorMask(1, 1, 1, 1)
+    glStencilFunc(GL_EQUAL, _stencil_level, 0xff)
+    glStencilOp(GL_KEEP, GL_KEEP, GL_KEEP)
+
+
+cdef void stencil_unuse():
+    glStencilFunc(GL_ALWAYS, 0, 0)
+    glStencilOp(GL_DECR, GL_DECR, GL_DECR)
+    glColorMask(0, 0, 0, 0)
+
+
 cdef class StencilPush(Instruction):
     '''Push the stencil stack. See module documentation for more information.
     '''
     cdef void apply(self):
-        global _stencil_level, _stencil_in_push
-        if _stencil_in_push:
-            raise Exception('Cannot use StencilPush inside another '
-                            'StencilPush.\nUse StencilUse before.')
-        _stencil_in_push = 1
-        _stencil_level += 1
-
-        if _stencil_level == 1:
-            glStencilMask(0xff)
-            glClearStencil(0)
-            glClear(GL_STENCIL_BUFFER_BIT)
-        if _stencil_level > 128:
-            raise Exception('Cannot push more than 8 level of stencil.'
-                            ' (stack overflow)')
-
-        glEnable(GL_STENCIL_TEST)
-        glStencilFunc(GL_ALWAYS, 0, 0)
-        glStencilOp(GL_INCR, GL_INCR, GL_INCR)
-        glColorMask(0, 0, 0, 0)
+        stencil_push()
 
 cdef class StencilPop(Instruction):
     '''Pop the stencil stack. See module documentation for more information.
     '''
     cdef void apply(self):
-        global _stencil_level, _stencil_in_push
-        if _stencil_level == 0:
-            raise Exception('Too much StencilPop (stack underflow)')
-        _stencil_level -= 1
-        _stencil_in_push = 0
-        glColorMask(1, 1, 1, 1)
-        if _stencil_level == 0:
-            glDisable(GL_STENCIL_TEST)
-            return
-        # reset for previous
-        glStencilFunc(GL_EQUAL, _stencil_level, 0xff)
-        glStencilOp(GL_KEEP, GL_KEEP, GL_KEEP)
+        stencil_pop()
 
 
 cdef class StencilUse(Instruction):
@@ -149,16 +206,184 @@ cdef class StencilUse(Instruction):
     information.
     '''
     cdef void apply(self):
-        global _stencil_in_push
-        _stencil_in_push = 0
-        glColorMask(1, 1, 1, 1)
-        glStencilFunc(GL_EQUAL, _stencil_level, 0xff)
-        glStencilOp(GL_KEEP, GL_KEEP, GL_KEEP)
+        stencil_use()
 
 cdef class StencilUnUse(Instruction):
     '''Use current stencil buffer to unset the mask.
     '''
     cdef void apply(self):
-        glStencilFunc(GL_ALWAYS, 0, 0)
-        glStencilOp(GL_DECR, GL_DECR, GL_DECR)
-        glColorMask(0, 0, 0, 0)
+        stencil_unuse()
+
+
+cdef class ScissorPush(Instruction):
+    '''Clip the next drawing to a rectangle, until the next
+    :class:`ScissorPop`. See module documentation for more information.
+
+    .. versionadded:: 1.3.0
+
+    :Parameters:
+        `pos`: list
+            Position of the rectangle, in the format (x, y)
+        `size`: list
+            Size of the rectangle, in the format (width, height)
+    '''
+    cdef float x, y, w, h
+    cdef int dirty
+    cdef VertexBatch batch
+
+    def __init__(self, **kwargs):
+        Instruction.__init__(self, **kwargs)
+        v = kwargs.get('pos')
+        self.pos = v if v is not None else (0, 0)
+        v = kwargs.get('size')
+        self.size = v if v is not None else (100, 100)
+
+    cdef void apply(self):
+        cdef RenderContext context = getActiveContext()
+        cdef Matrix mv, proj
+        cdef double *m
+        cdef double *p
+        cdef double x0, y0, x1, y1
+        cdef GLint viewport[4]
+        cdef int box[4]
+
+        self.flag_update_done()
+        if context is None:
+            self.apply_stencil(context)
+            return
+        mv = context.get_state('modelview_mat')
+        proj = context.get_state('projection_mat')
+        m = &mv.mat[0]
+        p = &proj.mat[0]
+
+        # the rectangle is still a rectangle in the window only if the
+        # matrices don't rotate it, and the projection is orthographic.
+        if m[1] != 0 or m[4] != 0 or p[1] != 0 or p[4] != 0 or \
+                p[3] != 0 or p[7] != 0 or p[15] != 1:
+            self.apply_stencil(context)
+            return
+
+        # rectangle in normalized device coordinates
+        x0 = p[0] * (m[0] * self.x + m[12]) + p[12]
+        y0 = p[5] * (m[5] * self.y + m[13]) + p[13]
+        x1 = p[0] * (m[0] * (self.x + self.w) + m[12]) + p[12]
+        y1 = p[5] * (m[5] * (self.y + self.h) + m[13]) + p[13]
+        if x1 < x0:
+            x0, x1 = x1, x0
+        if y1 < y0:
+            y0, y1 = y1, y0
+
+        # then in window coordinates
+        glGetIntegerv(GL_VIEWPORT, viewport)
+        box[0] = <int>(viewport[0] + (x0 + 1.) * viewport[2] * .5 + .5)
+        box[1] = <int>(viewport[1] + (y0 + 1.) * viewport[3] * .5 + .5)
+        box[2] = <int>(viewport[0] + (x1 + 1.) * viewport[2] * .5 + .5)
+        box[3] = <int>(viewport[1] + (y1 + 1.) * viewport[3] * .5 + .5)
+
+        # intersect with the parent clipping rectangle
+        parent = scissor_get_box(context)
+        if parent is not None:
+            box[0] = max(box[0], parent[0])
+            box[1] = max(box[1], parent[1])
+            box[2] = min(box[2], parent[2])
+            box[3] = min(box[3], parent[3])
+        if box[2] < box[0]:
+            box[2] = box[0]
+        if box[3] < box[1]:
+            box[3] = box[1]
+
+        _scissor_stack.append((context, self, (box[0], box[1], box[2], box[3])))
+        glEnable(GL_SCISSOR_TEST)
+        glScissor(box[0], box[1], box[2] - box[0], box[3] - box[1])
+
+    cdef void apply_stencil(self, RenderContext context):
+        cdef vertex_t vertices[4]
+        cdef unsigned short *indices = [0, 1, 2, 2, 3, 0]
+        if self.batch is None:
+            self.batch = VertexBatch()
+            self.batch.set_mode('triangles')
+            self.dirty = 1
+        if self.dirty:
+            memset(vertices, 0, sizeof(vertices))
+            vertices[0].x = self.x
+            vertices[0].y = self.y
+            vertices[1].x = self.x + self.w
+            vertices[1].y = self.y
+            vertices[2].x = self.x + self.w
+            vertices[2].y = self.y + self.h
+            vertices[3].x = self.x
+            vertices[3].y = self.y + self.h
+            self.batch.set_data(vertices, 4, indices, 6)
+            self.dirty = 0
+
+        _scissor_stack.append((context, self, None))
+        stencil_push()
+        self.batch.draw()
+        stencil_use()
+
+    cdef void unapply_stencil(self):
+        stencil_unuse()
+        self.batch.draw()
+        stencil_pop()
+
+    property pos:
+        '''Position of the clipping rectangle, in the format (x, y)
+        '''
+        def __get__(self):
+            return (self.x, self.y)
+        def __set__(self, pos):
+            cdef float x, y
+            x, y = pos
+            if self.x == x and self.y == y:
+                return
+            self.x = x
+            self.y = y
+            self.dirty = 1
+            self.flag_update()
+
+    property size:
+        '''Size of the clipping rectangle, in the format (width, height)
+        '''
+        def __get__(self):
+            return (self.w, self.h)
+        def __set__(self, size):
+            cdef float w, h
+            w, h = size
+            if self.w == w and self.h == h:
+                return
+            self.w = w
+            self.h = h
+            self.dirty = 1
+            self.flag_update()
+
+
+cdef class ScissorPop(Instruction):
+    '''Remove the clipping rectangle of the last :class:`ScissorPush`. See
+    module documentation for more information.
+
+    .. versionadded:: 1.3.0
+    '''
+    cdef void apply(self):
+        cdef ScissorPush push
+        if not _scissor_stack:
+            raise Exception('Too much ScissorPop (stack underflow)')
+        context, push, box = _scissor_stack.pop()
+        if box is None:
+            push.unapply_stencil()
+            return
+        box = scissor_get_box(context)
+        if box is None:
+            glDisable(GL_SCISSOR_TEST)
+        else:
+            glScissor(box[0], box[1], box[2] - box[0], box[3] - box[1])
+
+
+cdef object scissor_get_box(RenderContext context):
+    # return the current clipping rectangle in this context, as
+    # (x0, y0, x1, y1), or None if there is none.
+    for item in reversed(_scissor_stack):
+        if item[0] is not context:
+            return None
+        if item[2] is not None:
+            return item[2]
+    return None
@@ -29,6 +29,7 @@ cdef class Texture:
     cdef void set_mag_filter(self, str x)
     cdef void set_wrap(self, str x)
     cdef void reload(self)
+    cdef long get_gpu_size(self)
 
     cpdef flip_vertical(self)
     cpdef get_region(self, x, y, width, height)
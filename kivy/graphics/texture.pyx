@@ -56,6 +56,15 @@ You can create your own data and blit it on the texture using
     with self.canvas:
         Rectangle(texture=texture, pos=self.pos, size=(64, 64))
 
+Since 1.3.0, :func:`Texture.blit_buffer` accepts any object supporting the
+buffer protocol (str, bytearray, memoryview, array, mmap, numpy array...)
+without doing a copy. If the rows of your image are not contiguous, you can
+give the `stride` (length of a row in bytes)::
+
+    # frame is a numpy array of 480 rows of 1024 bytes, containing a 320x480
+    # rgb image
+    texture.blit_buffer(frame, size=(320, 480), colorfmt='rgb', stride=1024)
+
 
 BGR/BGRA support
 ----------------
@@ -144,6 +153,26 @@ information.
     actually creating the nearest POT texture and generate mipmap on it. This
     might change in the future.
 
+Streaming frames
+----------------
+
+.. versionadded:: 1.3.0
+
+If you are uploading a new image at every frame (video, camera...), blitting
+into the texture that is currently drawn can stall the rendering until the
+driver is done with the previous frame. Use a :class:`TextureStream` instead:
+it keeps multiple textures, uploads the new frame into a texture that is not
+drawn, and swaps. The frames can be pushed from any thread::
+
+    stream = TextureStream(colorfmt='rgb')
+
+    # in the decoding thread
+    stream.push(frame, size=(640, 480))
+
+    # in the main thread, for example in a Clock callback
+    if stream.update():
+        self.texture = stream.texture
+
 Reloading the Texture
 ---------------------
 
@@ -171,6 +200,18 @@ automatically called when needed::
 
 This way, you could use the same method for initialization and for reloading.
 
+.. versionchanged:: 1.3.0
+
+    The reloading is lazy: a texture is recreated the first time it is bound
+    after the context loss, and the remaining textures are reloaded in the
+    background, a few per frame. The observers of a texture are called when
+    the texture itself is reloaded, not after the whole context.
+
+    If `texture_reload_cache` is set in the graphics section of the
+    configuration, the decoded pixels of the last images are kept in the
+    `kv.imagedata` cache, so a texture with a source can be reloaded without
+    decoding the file again.
+
 .. note::
 
     For all text rendering with our core text renderer, texture is generated,
@@ -178,14 +219,14 @@ This way, you could use the same method for initialization and for reloading.
     the text to the texture. You have nothing to do on that case.
 '''
 
-__all__ = ('Texture', 'TextureRegion')
+__all__ = ('Texture', 'TextureRegion', 'TextureStream')
 
 include "config.pxi"
 include "common.pxi"
 include "opengl_utils_def.pxi"
 
 from os import environ
-from array import array
+from threading import Lock
 from kivy.weakmethod import WeakMethod
 from kivy.logger import Logger
 from kivy.cache import Cache
@@ -195,9 +236,17 @@ from kivy.graphics.c_opengl cimport *
 IF USE_OPENGL_DEBUG == 1:
     from kivy.graphics.c_opengl_debug cimport *
 from kivy.graphics.opengl_utils cimport *
+from cpython.buffer cimport PyObject_CheckBuffer, PyObject_GetBuffer, \
+    PyBuffer_Release, PyBUF_SIMPLE
+
+cdef extern from "Python.h":
+    ctypedef void *const_void_ptr "const void *"
+    int PyObject_AsReadBuffer(object obj, const_void_ptr *buffer,
+                              Py_ssize_t *buffer_len) except -1
 
 # compatibility layer
 cdef GLuint GL_BGR = 0x80E0
+cdef GLuint GL_UNPACK_ROW_LENGTH = 0x0CF2
 cdef GLuint GL_BGRA = 0x80E1
 cdef GLuint GL_COMPRESSED_RGBA_S3TC_DXT1_EXT = 0x83F1
 cdef GLuint GL_COMPRESSED_RGBA_S3TC_DXT3_EXT = 0x83F2
@@ -353,40 +402,56 @@ cdef inline str _convert_gl_format(str x):
     return x
 
 
-cdef inline _convert_buffer(bytes data, str fmt):
-    cdef bytes ret_buffer
-    cdef str ret_format
-
+cdef inline int _need_buffer_conversion(str fmt) except -1:
     # if native support of this format is available, use it
     if gl_has_texture_native_format(fmt):
-        return data, fmt
+        return 0
 
     # no native support, can we at least convert it ?
     if not gl_has_texture_conversion(fmt):
         raise Exception('Unimplemented texture conversion for %s' % fmt)
+    return 1
 
-    # do appropriate conversion, since we accepted it
-    ret_format = fmt
-    ret_buffer = data
-
-    # BGR -> RGB
-    if fmt == 'bgr':
-        ret_format = 'rgb'
-        a = array('b', data)
-        a[0::3], a[2::3] = a[2::3], a[0::3]
-        ret_buffer = a.tostring()
 
-    # BGRA -> RGBA
-    elif fmt == 'bgra':
-        ret_format = 'rgba'
-        a = array('b', data)
-        a[0::4], a[2::4] = a[2::4], a[0::4]
-        ret_buffer = a.tostring()
+cdef inline void _convert_buffer(char *dst, char *src, int w, int h,
+                                 int stride, int bpp) nogil:
+    # BGR -> RGB or BGRA -> RGBA, in one pass, and keep the same stride.
+    cdef int x, y
+    cdef char *psrc
+    cdef char *pdst
+    memcpy(dst, src, stride * (h - 1) + w * bpp)
+    for y in xrange(h):
+        psrc = src + y * stride
+        pdst = dst + y * stride
+        for x in xrange(w):
+            pdst[0] = psrc[2]
+            pdst[2] = psrc[0]
+            psrc += bpp
+            pdst += bpp
+
+
+cdef inline int _gl_prepare_pixels_stride(int row_size, int stride) nogil:
+    '''Set the pixel alignement matching the stride. Return 0 if the stride
+    can't be expressed with an alignement.
+    '''
+    cdef int align = 8
+    while align >= 1:
+        if (row_size + align - 1) & ~(align - 1) == stride:
+            glPixelStorei(GL_UNPACK_ALIGNMENT, align)
+            return 1
+        align >>= 1
+    return 0
 
-    else:
-        assert False, 'Non implemented texture conversion !' % fmt
 
-    return ret_buffer, ret_format
+cdef inline int _gl_prepare_pixels_row_length(int length) nogil:
+    '''Set the length of a row in pixels. Return 0 if not supported.
+    '''
+    IF USE_OPENGL_ES2:
+        return 0
+    ELSE:
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        glPixelStorei(GL_UNPACK_ROW_LENGTH, length)
+        return 1
 
 
 cdef inline void _gl_prepare_pixels_upload(int width) nogil:
@@ -647,6 +712,9 @@ cdef class Texture:
 
     cpdef bind(self):
         '''Bind the texture to current opengl state'''
+        if self._id == -1:
+            # the context have been lost, and we are not reloaded yet.
+            self.reload()
         glBindTexture(self._target, self._id)
 
     cdef void set_min_filter(self, str x):
@@ -683,14 +751,20 @@ cdef class Texture:
 
     def blit_buffer(self, pbuffer, size=None, colorfmt=None,
                     pos=None, bufferfmt=None, mipmap_level=0,
-                    mipmap_generation=True):
+                    mipmap_generation=True, stride=None):
         '''Blit a buffer into a texture.
 
         .. versionadded:: 1.0.7 added mipmap_level + mipmap_generation
 
+        .. versionchanged:: 1.3.0
+            `pbuffer` can be any object supporting the buffer protocol, and
+            `stride` have been added.
+
         :Parameters:
-            `pbuffer` : str
-                Image data
+            `pbuffer` : str or buffer
+                Image data. Any object supporting the buffer protocol can be
+                used (bytearray, memoryview, array, numpy array...), the data
+                are not copied.
             `size` : tuple, default to texture size
                 Size of the image (width, height)
             `colorfmt` : str, default to 'rgb'
@@ -705,6 +779,9 @@ cdef class Texture:
                 Indicate which mipmap level we are going to update
             `mipmap_generation`: bool, default to False
                 Indicate if we need to regenerate mipmap from level 0
+            `stride`: int, default to None
+                Length of a row in the buffer, in bytes. If None, the rows
+                are contiguous.
         '''
         cdef GLuint target = self._target
         if colorfmt is None:
@@ -715,40 +792,108 @@ cdef class Texture:
             pos = (0, 0)
         if size is None:
             size = self.size
-        bufferfmt = _buffer_fmt_to_gl(bufferfmt)
 
         # need conversion ?
-        cdef bytes data
-        data = pbuffer
-        data, colorfmt = _convert_buffer(data, colorfmt)
+        cdef int need_conversion = _need_buffer_conversion(colorfmt)
+        if need_conversion:
+            colorfmt = _convert_gl_format(colorfmt)
 
         # prepare nogil
         cdef int glfmt = _color_fmt_to_gl(colorfmt)
-        cdef int datasize = len(pbuffer)
         cdef int x = pos[0]
         cdef int y = pos[1]
         cdef int w = size[0]
         cdef int h = size[1]
-        cdef char *cdata = <char *>data
-        cdef int glbufferfmt = bufferfmt
+        cdef int glbufferfmt = _buffer_fmt_to_gl(bufferfmt)
+        cdef int bpp = _gl_format_size(glfmt) * _buffer_type_to_gl_size(bufferfmt)
+        cdef int row_size = w * bpp
+        cdef int cstride = row_size
         cdef int is_allocated = self._is_allocated
         cdef int is_compressed = _is_compressed_fmt(colorfmt)
         cdef int _mipmap_generation = mipmap_generation and self._mipmap
         cdef int _mipmap_level = mipmap_level
-
-        with nogil:
-            glBindTexture(target, self._id)
-            if is_compressed:
-                glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
-                glCompressedTexImage2D(target, _mipmap_level, glfmt, w, h, 0, datasize, cdata)
-            elif is_allocated:
-                _gl_prepare_pixels_upload(w)
-                glTexSubImage2D(target, _mipmap_level, x, y, w, h, glfmt, glbufferfmt, cdata)
-            else:
-                _gl_prepare_pixels_upload(w)
-                glTexImage2D(target, _mipmap_level, glfmt, w, h, 0, glfmt, glbufferfmt, cdata)
-            if _mipmap_generation:
-                glGenerateMipmap(target)
+        cdef int row, row_length = 0, done = 0
+        cdef char *cdata = NULL
+        cdef char *converted = NULL
+        cdef const_void_ptr pdata = NULL
+        cdef Py_ssize_t datasize = 0
+        cdef Py_buffer view
+        cdef int have_view = 0
+
+        if stride is not None and not is_compressed:
+            cstride = stride
+            if cstride < row_size:
+                raise ValueError('The stride must be at least %d' % row_size)
+            if cstride % bpp == 0:
+                row_length = cstride / bpp
+
+        # get a pointer on the data, without copy
+        if PyObject_CheckBuffer(pbuffer):
+            PyObject_GetBuffer(pbuffer, &view, PyBUF_SIMPLE)
+            have_view = 1
+            cdata = <char *>view.buf
+            datasize = view.len
+        else:
+            PyObject_AsReadBuffer(pbuffer, &pdata, &datasize)
+            cdata = <char *>pdata
+
+        try:
+            if not is_compressed and h > 0 and \
+                    datasize < cstride * (h - 1) + row_size:
+                raise ValueError('The buffer is too small, %d bytes are '
+                                 'needed' % (cstride * (h - 1) + row_size))
+
+            if need_conversion and h > 0:
+                converted = <char *>malloc(datasize)
+                if converted == NULL:
+                    raise MemoryError()
+                with nogil:
+                    _convert_buffer(converted, cdata, w, h, cstride, bpp)
+                cdata = converted
+
+            with nogil:
+                glBindTexture(target, self._id)
+                if is_compressed:
+                    glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+                    glCompressedTexImage2D(target, _mipmap_level, glfmt, w, h,
+                                           0, datasize, cdata)
+                    done = 1
+                elif cstride == row_size:
+                    _gl_prepare_pixels_upload(w)
+                    done = 1
+                elif _gl_prepare_pixels_stride(row_size, cstride):
+                    done = 1
+                elif row_length and _gl_prepare_pixels_row_length(row_length):
+                    done = 1
+
+                if is_compressed:
+                    pass
+                elif done:
+                    if is_allocated:
+                        glTexSubImage2D(target, _mipmap_level, x, y, w, h,
+                                        glfmt, glbufferfmt, cdata)
+                    else:
+                        glTexImage2D(target, _mipmap_level, glfmt, w, h, 0,
+                                     glfmt, glbufferfmt, cdata)
+                    if cstride != row_size:
+                        _gl_prepare_pixels_row_length(0)
+                else:
+                    # upload the rows one by one
+                    glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+                    if not is_allocated:
+                        glTexImage2D(target, _mipmap_level, glfmt, w, h, 0,
+                                     glfmt, glbufferfmt, NULL)
+                    for row in xrange(h):
+                        glTexSubImage2D(target, _mipmap_level, x, y + row, w,
+                                        1, glfmt, glbufferfmt,
+                                        cdata + row * cstride)
+                if _mipmap_generation:
+                    glGenerateMipmap(target)
+        finally:
+            if converted != NULL:
+                free(converted)
+            if have_view:
+                PyBuffer_Release(&view)
 
     cdef void reload(self):
         cdef Texture texture
@@ -760,11 +905,18 @@ cdef class Texture:
                     self.mipmap)
             self._id = texture.id
         else:
-            from kivy.core.image import Image
-            image = Image(self._source)
-            self._id = image.texture.id
-            texture = image.texture
-            texture._nofree = 1
+            # use the decoded data if we still have them, instead of reading
+            # and decoding the file again.
+            key = '%s|0' % self._source
+            data = Cache.get('kv.imagedata', key)
+            if data is not None:
+                texture = texture_create_from_data(data, mipmap=self._mipmap)
+                # uploaded, don't keep the pixels in memory anymore
+                Cache.remove('kv.imagedata', key)
+            else:
+                from kivy.core.image import Image
+                texture = Image(self._source).texture
+            self._id = texture.id
 
         # ensure the new opengl ID will not get through GC
         texture._nofree = 1
@@ -782,6 +934,23 @@ cdef class Texture:
                 continue
             callback()(self)
 
+    cdef long get_gpu_size(self):
+        # estimation of the memory used by the texture on the GPU, in bytes.
+        # the width/height are the real size of the texture, including the
+        # power-of-two padding.
+        cdef long size = self._width * self._height
+        cdef object colorfmt = self._colorfmt
+        cdef object bufferfmt = self._bufferfmt
+        if colorfmt == 's3tc_dxt1':
+            size /= 2
+        elif not _is_compressed_fmt(colorfmt):
+            size *= _gl_format_size(_color_fmt_to_gl(colorfmt)) * \
+                    _buffer_type_to_gl_size(bufferfmt)
+        # a complete mipmap chain take one third more
+        if self._mipmap:
+            size = size * 4 / 3
+        return size
+
     def __repr__(self):
         return '<Texture hash=%r id=%d size=%r colorfmt=%r bufferfmt=%r source=%r observers=%d>' % (
             id(self), self._id, self.size, self.colorfmt, self.bufferfmt,
@@ -954,6 +1123,25 @@ cdef class TextureRegion(Texture):
         self._uvh = (height / <float>origin._height) * origin._uvh
         self.update_tex_coords()
 
+    def blit_buffer(self, pbuffer, size=None, colorfmt=None,
+                    pos=None, bufferfmt=None, mipmap_level=0,
+                    mipmap_generation=True, stride=None):
+        '''Blit a buffer into the region. Check :meth:`Texture.blit_buffer` for
+        the parameters.
+
+        .. versionchanged:: 1.3.0
+            The `pos` is now relative to the region, not to the owner texture.
+        '''
+        cdef int x = self.x, y = self.y
+        if pos is not None:
+            x += pos[0]
+            y += pos[1]
+        if size is None:
+            size = self.size
+        Texture.blit_buffer(self, pbuffer, size=size, colorfmt=colorfmt,
+                pos=(x, y), bufferfmt=bufferfmt, mipmap_level=mipmap_level,
+                mipmap_generation=mipmap_generation, stride=stride)
+
     def __repr__(self):
         return '<TextureRegion of %r hash=%r id=%d size=%r colorfmt=%r bufferfmt=%r source=%r observers=%d>' % (
             self.owner, id(self), self._id, self.size, self.colorfmt,
@@ -964,10 +1152,105 @@ cdef class TextureRegion(Texture):
         # so that could work, except if it's a region of region
         # it's safe to retrigger a reload, since the owner texture will be not
         # really reloaded if its id is not -1.
+        if self._id != -1:
+            return
         self.owner.reload()
         self._id = self.owner.id
 
         # then update content again
-        for cb in self.observers:
-            cb(self)
+        for callback in self.observers[:]:
+            if callback.is_dead():
+                self.observers.remove(callback)
+                continue
+            callback()(self)
+
+
+
+class TextureStream(object):
+    '''Stream of frames uploaded into a set of textures. See the module
+    documentation for more information.
+
+    .. versionadded:: 1.3.0
+
+    :Parameters:
+        `colorfmt`: str, default to 'rgb'
+            Color format of the textures
+        `bufferfmt`: str, default to 'ubyte'
+            Buffer format of the textures
+        `count`: int, default to 2
+            Number of textures to use. Use 3 if the frames are still stalling
+            with 2.
+        `flip_vertical`: bool, default to False
+            If True, the textures are flipped vertically.
+    '''
 
+    def __init__(self, colorfmt='rgb', bufferfmt='ubyte', count=2,
+                 flip_vertical=False):
+        self.colorfmt = colorfmt
+        self.bufferfmt = bufferfmt
+        self.count = count
+        self.flip_vertical = flip_vertical
+        self.dropped = 0
+        self._lock = Lock()
+        self._frame = None
+        self._textures = []
+        self._size = None
+        self._index = -1
+
+    def push(self, pbuffer, size, colorfmt=None, stride=None):
+        '''Give a new frame to upload on the next :meth:`update`. This can be
+        called from any thread. If the previous frame have not been uploaded
+        yet, it's dropped.
+
+        The parameters are the same as :meth:`Texture.blit_buffer`.
+        '''
+        with self._lock:
+            if self._frame is not None:
+                self.dropped += 1
+            self._frame = (pbuffer, tuple(size), colorfmt, stride)
+
+    def update(self):
+        '''Upload the last frame pushed in the next texture, and make it the
+        current :data:`texture`. Must be called from the main thread. Return
+        True if a new frame have been uploaded.
+        '''
+        with self._lock:
+            frame = self._frame
+            self._frame = None
+        if frame is None:
+            return False
+        pbuffer, size, colorfmt, stride = frame
+
+        # (re)create the textures when the frame size change
+        if size != self._size:
+            self._size = size
+            self._textures = []
+            for x in xrange(self.count):
+                texture = texture_create(size, self.colorfmt, self.bufferfmt)
+                if self.flip_vertical:
+                    texture.flip_vertical()
+                self._textures.append(texture)
+
+        self._index = (self._index + 1) % len(self._textures)
+        texture = self._textures[self._index]
+        texture.blit_buffer(pbuffer, size=size,
+                colorfmt=colorfmt or self.colorfmt,
+                bufferfmt=self.bufferfmt, stride=stride)
+        return True
+
+    def clear(self):
+        '''Drop the pending frame and release the textures.
+        '''
+        with self._lock:
+            self._frame = None
+        self._textures = []
+        self._size = None
+        self._index = -1
+
+    @property
+    def texture(self):
+        '''Texture containing the last uploaded frame, or None (readonly)
+        '''
+        if self._index == -1:
+            return None
+        return self._textures[self._index]
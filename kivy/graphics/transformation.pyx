@@ -180,6 +180,25 @@ cdef class Matrix:
             tz = x * self.mat[2] + y * self.mat[6] + z * self.mat[10] + self.mat[14];
         return (tx, ty, tz)
 
+    def transform_points_2d(Matrix self, points):
+        '''Transform a list of 2d points, in the format [x1, y1, x2, y2, ...],
+        and return the transformed points in a new list, in the same format.
+
+        .. versionadded:: 1.3.0
+        '''
+        cdef double *m = self.mat
+        cdef int i, count = len(points)
+        cdef double x, y
+        cdef list result = [0.] * count
+        if count % 2 != 0:
+            raise ValueError('The points list must have an even length')
+        for i in xrange(0, count, 2):
+            x = points[i]
+            y = points[i + 1]
+            result[i] = x * m[0] + y * m[4] + m[12]
+            result[i + 1] = x * m[1] + y * m[5] + m[13]
+        return result
+
     cpdef Matrix identity(self):
         '''Reset matrix to identity matrix (inplace)
         '''
@@ -45,6 +45,8 @@ cdef class VertexBatch:
                        unsigned short *indices, int indices_count)
     cdef void append_data(self, vertex_t *vertices, int vertices_count,
                           unsigned short *indices, int indices_count)
+    cdef void pop_data(self, int vertices_count, int indices_count)
+    cdef void update_data(self, int index, vertex_t *vertices, int count)
     cdef void draw(self)
     cdef void set_mode(self, str mode)
     cdef str get_mode(self)
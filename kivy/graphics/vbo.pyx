@@ -172,15 +172,43 @@ cdef class VertexBatch:
         free(vi)
 
         # build element list for DrawElements using vbo indices
-        # TODO: remove buffer usage in this case, the memory is always one big
-        # block. no need to use add() everytime we need to reconstruct the list.
-        cdef int local_index
+        cdef int i, local_index
         cdef unsigned short *vbi = <unsigned short*>self.vbo_index.pointer()
+        cdef unsigned short *elements
+        if indices_count == 0:
+            return
+        elements = <unsigned short *>malloc(
+                sizeof(unsigned short) * indices_count)
+        if elements == NULL:
+            raise MemoryError('elements allocation')
         for i in xrange(indices_count):
             local_index = indices[i]
-            self.elements.add(&vbi[local_index], NULL, 1)
+            elements[i] = vbi[local_index]
+        self.elements.add(elements, NULL, indices_count)
+        free(elements)
         self.flags |= V_NEEDUPLOAD
 
+    cdef void pop_data(self, int vertices_count, int indices_count):
+        # remove the last vertices and indices added with append_data. The
+        # vbo_index and elements buffers are only appended or cleared, so
+        # their blocks are in order, and the last ones can just be released.
+        cdef unsigned short *vbi = <unsigned short*>self.vbo_index.pointer()
+        vertices_count = min(vertices_count, self.vbo_index.count())
+        indices_count = min(indices_count, self.elements.count())
+        self.vbo.remove_vertex_data(
+                vbi + self.vbo_index.count() - vertices_count, vertices_count)
+        self.vbo_index.i_free -= vertices_count
+        self.elements.i_free -= indices_count
+        self.flags |= V_NEEDUPLOAD
+
+    cdef void update_data(self, int index, vertex_t *vertices, int count):
+        # replace the content of count vertices, starting from the index in
+        # this batch. The vertices are not always contiguous in the vbo.
+        cdef unsigned short *vbi = <unsigned short*>self.vbo_index.pointer()
+        cdef int i
+        for i in xrange(count):
+            self.vbo.update_vertex_data(vbi[index + i], &vertices[i], 1)
+
     cdef void draw(self):
         # create when needed
         if self.flags & V_NEEDGEN:
@@ -6,11 +6,12 @@ This module include all the classes for drawing simple vertex object.
 '''
 
 __all__ = ('Triangle', 'Quad', 'Rectangle', 'BorderImage', 'Ellipse', 'Line',
-           'Point', 'Mesh', 'GraphicException', 'Bezier')
+           'Point', 'Mesh', 'InstancedMesh', 'GraphicException', 'Bezier')
 
 
 include "config.pxi"
 include "common.pxi"
+include "opcodes.pxi"
 
 from kivy.graphics.vbo cimport *
 from kivy.graphics.vertex cimport *
@@ -20,18 +21,546 @@ IF USE_OPENGL_DEBUG == 1:
     from kivy.graphics.c_opengl_debug cimport *
 from kivy.logger import Logger
 from kivy.graphics.texture import Texture
+from array import array
+from cpython.buffer cimport PyObject_CheckBuffer, PyObject_GetBuffer, \
+    PyBuffer_Release, PyBUF_FORMAT, PyBUF_C_CONTIGUOUS
+
+cdef extern from "Python.h":
+    ctypedef void *const_void_ptr "const void *"
+    int PyObject_AsReadBuffer(object obj, const_void_ptr *buffer,
+                              Py_ssize_t *buffer_len) except -1
 
 
 class GraphicException(Exception):
     '''Exception fired when a graphic error is fired.
     '''
 
-cdef class Line(VertexInstruction):
+
+cdef float *_read_floats(object values, int *count) except NULL:
+    # Read a list of numbers into a newly allocated float array. The caller
+    # must free it. The contiguous buffers of float or double (array.array,
+    # memoryview, numpy array...) are read directly, without creating a python
+    # object for each number.
+    cdef Py_buffer view
+    cdef int have_view = 0
+    cdef const_void_ptr pdata = NULL
+    cdef Py_ssize_t size = 0
+    cdef char *data = NULL
+    cdef int i, n = 0, itemsize = 0
+    cdef float *out = NULL
+    cdef bytes fmt
+
+    if isinstance(values, array):
+        if values.typecode in ('f', 'd'):
+            PyObject_AsReadBuffer(values, &pdata, &size)
+            data = <char *>pdata
+            itemsize = values.itemsize
+    elif PyObject_CheckBuffer(values):
+        try:
+            PyObject_GetBuffer(values, &view, PyBUF_FORMAT | PyBUF_C_CONTIGUOUS)
+            have_view = 1
+        except BufferError:
+            # not contiguous, read it as a sequence
+            pass
+        if have_view:
+            fmt = view.format.lstrip('@=<')
+            if (fmt == 'f' and view.itemsize == sizeof(float)) or \
+                    (fmt == 'd' and view.itemsize == sizeof(double)):
+                data = <char *>view.buf
+                size = view.len
+                itemsize = view.itemsize
+            else:
+                PyBuffer_Release(&view)
+                raise ValueError('Unsupported buffer format %r, only float '
+                                 'or double buffers are accepted' % fmt)
+
+    try:
+        if data != NULL:
+            n = size / itemsize
+            out = <float *>malloc(max(n, 1) * sizeof(float))
+            if out == NULL:
+                raise MemoryError('points')
+            if itemsize == sizeof(float):
+                memcpy(out, data, n * sizeof(float))
+            else:
+                for i in xrange(n):
+                    out[i] = (<double *>data)[i]
+        else:
+            if not isinstance(values, (list, tuple)):
+                values = list(values)
+            n = len(values)
+            out = <float *>malloc(max(n, 1) * sizeof(float))
+            if out == NULL:
+                raise MemoryError('points')
+            for i in xrange(n):
+                out[i] = values[i]
+    except:
+        free(out)
+        raise
+    finally:
+        if have_view:
+            PyBuffer_Release(&view)
+
+    count[0] = n
+    return out
+
+
+cdef float *_append_floats(float *dst, int dst_count, float *src,
+                           int src_count) except NULL:
+    # Append the src array at the end of the dst array, and return the new
+    # dst array.
+    cdef float *out = <float *>realloc(dst,
+            max(dst_count + src_count, 1) * sizeof(float))
+    if out == NULL:
+        raise MemoryError('points')
+    memcpy(out + dst_count, src, src_count * sizeof(float))
+    return out
+
+
+cdef list _floats_to_list(float *values, int count):
+    cdef int i
+    return [values[i] for i in xrange(count)]
+
+
+# Thick lines
+# -----------
+#
+# A line wider than 1 pixel is tesselated into triangles: a quad for each
+# segment, a joint between two segments and a cap on each end. The geometry is
+# enlarged by LINE_AA pixels on each side, and the texture of the line fade
+# these pixels to transparent to anti-alias the edges. The texture is
+# addressed with s along the line (for the dashes) and t across the line (0 on
+# the right side, 1 on the left side, .5 in the middle).
+
+cdef float LINE_AA = 1.
+
+# above this ratio between the length of a miter and the half width of the
+# line, a bevel joint is used instead.
+cdef float LINE_MITER_LIMIT = 4.
+
+cdef int LINE_CAP_NONE = 0
+cdef int LINE_CAP_SQUARE = 1
+cdef int LINE_CAP_ROUND = 2
+
+cdef int LINE_JOINT_NONE = 0
+cdef int LINE_JOINT_MITER = 1
+cdef int LINE_JOINT_BEVEL = 2
+cdef int LINE_JOINT_ROUND = 3
+
+cdef list _line_caps = ['none', 'square', 'round']
+cdef list _line_joints = ['none', 'miter', 'bevel', 'round']
+
+
+cdef struct _stroke_t:
+    # style
+    float width
+    float dash
+    int cap
+    int joint
+    int cap_precision
+    int joint_precision
+    # end of the line tesselated until now, for continuing it
+    int have_segment
+    float x, y
+    float dx, dy
+    float tex_x
+    # vertices in the batch, and how many of them are used by the end cap
+    int vcount
+    int tail_vcount
+    int tail_icount
+
+
+cdef struct _geom_t:
+    vertex_t *vertices
+    unsigned short *indices
+    int vcount, icount
+    int vsize, isize
+    int base
+
+
+cdef int _line_cap_from_str(str value) except -1:
+    if value not in _line_caps:
+        raise GraphicException('Invalid cap, must be one of %s' % (
+            ', '.join(_line_caps)))
+    return _line_caps.index(value)
+
+
+cdef int _line_joint_from_str(str value) except -1:
+    if value not in _line_joints:
+        raise GraphicException('Invalid joint, must be one of %s' % (
+            ', '.join(_line_joints)))
+    return _line_joints.index(value)
+
+
+cdef inline int _nearest_pow2(int v):
+    # From http://graphics.stanford.edu/~seander/bithacks.html#RoundUpPowerOf2
+    v -= 1
+    v |= v >> 1
+    v |= v >> 2
+    v |= v >> 4
+    v |= v >> 8
+    v |= v >> 16
+    return v + 1
+
+
+cdef Texture _line_texture(Texture texture, int dash_length, int dash_offset,
+                           float width):
+    # Fill the texture of a line, with the dashes along s and the
+    # anti-aliasing of the edges along t. The texture is reused if it have the
+    # right size. Return None if the line doesn't need a texture.
+    cdef int x, y, tex_width = 1, tex_height = 1
+    cdef float t, alpha, geom_width = width + 2 * LINE_AA
+    cdef unsigned char *buf = NULL
+    cdef unsigned char *pixel
+
+    if dash_offset == 0 and width <= 1:
+        return None
+    if dash_offset != 0:
+        tex_width = dash_length + dash_offset
+    if width > 1:
+        # one texel (or less) per pixel across the line
+        tex_height = _nearest_pow2(<int>ceil(geom_width))
+
+    if texture is None or texture._width != tex_width or \
+            texture._height != tex_height:
+        texture = Texture.create(size=(tex_width, tex_height))
+    texture.wrap = 'repeat' if dash_offset != 0 else 'clamp_to_edge'
+
+    buf = <unsigned char *>malloc(4 * tex_width * tex_height)
+    if buf == NULL:
+        raise MemoryError('line texture')
+    for y in xrange(tex_height):
+        alpha = 1.
+        if width > 1:
+            # distance to the edge of the geometry, in pixels
+            t = (y + .5) / tex_height
+            alpha = min(t, 1. - t) * geom_width - LINE_AA + .5
+            alpha = max(0., min(1., alpha))
+        for x in xrange(tex_width):
+            pixel = buf + (y * tex_width + x) * 4
+            if x < dash_length or dash_offset == 0:
+                memset(pixel, 255, 3)
+                pixel[3] = <unsigned char>(alpha * 255)
+            else:
+                memset(pixel, 0, 4)
+
+    p_str = PyString_FromStringAndSize(<char *>buf,
+                                       4 * tex_width * tex_height)
+    free(buf)
+    texture.blit_buffer(p_str, colorfmt='rgba', bufferfmt='ubyte')
+    return texture
+
+
+cdef int _geom_vertex(_geom_t *g, float x, float y, float s, float t) except -1:
+    # add a vertex, and return its index in the batch
+    cdef void *p
+    if g.vcount == g.vsize:
+        g.vsize = max(64, g.vsize * 2)
+        p = realloc(g.vertices, g.vsize * sizeof(vertex_t))
+        if p == NULL:
+            raise MemoryError('vertices')
+        g.vertices = <vertex_t *>p
+    g.vertices[g.vcount].x = x
+    g.vertices[g.vcount].y = y
+    g.vertices[g.vcount].s0 = s
+    g.vertices[g.vcount].t0 = t
+    g.vcount += 1
+    return g.base + g.vcount - 1
+
+
+cdef int _geom_triangle(_geom_t *g, int a, int b, int c) except -1:
+    cdef void *p
+    if g.icount + 3 > g.isize:
+        g.isize = max(96, g.isize * 2)
+        p = realloc(g.indices, g.isize * sizeof(unsigned short))
+        if p == NULL:
+            raise MemoryError('indices')
+        g.indices = <unsigned short *>p
+    g.indices[g.icount] = a
+    g.indices[g.icount + 1] = b
+    g.indices[g.icount + 2] = c
+    g.icount += 3
+    return 0
+
+
+cdef int _geom_fan(_geom_t *g, float x, float y, float s, float radius,
+                   double start, double angle, int steps, float t) except -1:
+    # add an arc around (x, y), from the start angle and spanning angle
+    # (radians), as a fan of triangles.
+    cdef int i, center, prev, cur
+    cdef double a
+    center = _geom_vertex(g, x, y, s, .5)
+    prev = _geom_vertex(g, x + cos(start) * radius, y + sin(start) * radius,
+                        s, t)
+    for i in xrange(1, steps + 1):
+        a = start + angle * i / steps
+        cur = _geom_vertex(g, x + cos(a) * radius, y + sin(a) * radius, s, t)
+        _geom_triangle(g, center, prev, cur)
+        prev = cur
+    return 0
+
+
+cdef int _stroke_cap(_stroke_t *s, _geom_t *g, float x, float y,
+                     float dx, float dy) except -1:
+    # add a cap at (x, y), (dx, dy) is the direction going out of the line.
+    cdef float hw = s.width / 2. + LINE_AA
+    cdef float ext = s.width / 2.
+    cdef float nx = -dy * hw, ny = dx * hw
+    cdef int a, b, c, d
+    if s.cap == LINE_CAP_SQUARE:
+        a = _geom_vertex(g, x + nx, y + ny, s.tex_x, 1)
+        b = _geom_vertex(g, x - nx, y - ny, s.tex_x, 0)
+        c = _geom_vertex(g, x + nx + dx * ext, y + ny + dy * ext, s.tex_x, 1)
+        d = _geom_vertex(g, x - nx + dx * ext, y - ny + dy * ext, s.tex_x, 0)
+        _geom_triangle(g, a, b, c)
+        _geom_triangle(g, b, d, c)
+    elif s.cap == LINE_CAP_ROUND:
+        # half circle from the left side to the right side
+        _geom_fan(g, x, y, s.tex_x, hw, atan2(ny, nx), -pi,
+                  s.cap_precision, 0)
+    return 0
+
+
+cdef int _stroke_joint(_stroke_t *s, _geom_t *g, float x, float y,
+                       float d1x, float d1y, float d2x, float d2y) except -1:
+    # fill the gap on the outer side of the turn at (x, y), between a segment
+    # going in the direction (d1x, d1y) and the next one in (d2x, d2y).
+    cdef float hw = s.width / 2. + LINE_AA
+    cdef double cross = d1x * d2y - d1y * d2x
+    cdef double dot = d1x * d2x + d1y * d2y
+    cdef double angle, n1x, n1y, n2x, n2y
+    cdef float side = 1, t = 1
+    cdef int center, o1, o2, m, steps
+
+    if s.joint == LINE_JOINT_NONE or (fabs(cross) < 1e-6 and dot > 0):
+        return 0
+
+    # a turn on the left leave a gap on the right side
+    if cross > 0:
+        side = -1
+        t = 0
+    n1x = -d1y * side
+    n1y = d1x * side
+    n2x = -d2y * side
+    n2y = d2x * side
+
+    if s.joint == LINE_JOINT_ROUND:
+        angle = atan2(fabs(cross), dot)
+        steps = max(1, <int>ceil(angle / pi * s.joint_precision))
+        return _geom_fan(g, x, y, s.tex_x, hw, atan2(n1y, n1x),
+                         -side * angle, steps, t)
+
+    center = _geom_vertex(g, x, y, s.tex_x, .5)
+    o1 = _geom_vertex(g, x + n1x * hw, y + n1y * hw, s.tex_x, t)
+    o2 = _geom_vertex(g, x + n2x * hw, y + n2y * hw, s.tex_x, t)
+
+    # the miter length is hw / cos(angle / 2), with cos(angle / 2) ** 2
+    # being (1 + dot) / 2.
+    if s.joint == LINE_JOINT_MITER and \
+            (1 + dot) / 2. > 1. / (LINE_MITER_LIMIT * LINE_MITER_LIMIT):
+        m = _geom_vertex(g, x + (n1x + n2x) * hw / (1 + dot),
+                         y + (n1y + n2y) * hw / (1 + dot), s.tex_x, t)
+        _geom_triangle(g, center, o1, m)
+        _geom_triangle(g, center, m, o2)
+    else:
+        _geom_triangle(g, center, o1, o2)
+    return 0
+
+
+cdef int _stroke_segment(_stroke_t *s, _geom_t *g, float ax, float ay,
+                         float bx, float by, float dx, float dy,
+                         float length) except -1:
+    cdef float hw = s.width / 2. + LINE_AA
+    cdef float nx = -dy * hw, ny = dx * hw
+    cdef float s0 = s.tex_x, s1 = s.tex_x
+    cdef int a, b, c, d
+    if s.dash != 0:
+        s1 += length / s.dash
+    a = _geom_vertex(g, ax + nx, ay + ny, s0, 1)
+    b = _geom_vertex(g, ax - nx, ay - ny, s0, 0)
+    c = _geom_vertex(g, bx + nx, by + ny, s1, 1)
+    d = _geom_vertex(g, bx - nx, by - ny, s1, 0)
+    _geom_triangle(g, a, b, c)
+    _geom_triangle(g, b, d, c)
+    s.tex_x = s1
+    return 0
+
+
+cdef void _stroke_reset(_stroke_t *s):
+    s.have_segment = 0
+    s.tex_x = 0
+    s.vcount = 0
+    s.tail_vcount = 0
+    s.tail_icount = 0
+
+
+cdef int _stroke_append(VertexBatch batch, _stroke_t *s, float *p, int start,
+                        int count) except -1:
+    # Tesselate the points [start, start + count) of p, and append the
+    # triangles to the batch. The line continue where the previous call
+    # stopped: its end cap is removed, and a joint is added instead.
+    cdef _geom_t g
+    cdef _stroke_t previous = s[0]
+    cdef int i, vcount, icount
+    cdef float ax, ay, bx, by, dx, dy, length
+
+    memset(&g, 0, sizeof(_geom_t))
+    # the end cap of the previous call is replaced by the new geometry
+    g.base = s.vcount - s.tail_vcount
+    try:
+        for i in xrange(max(start, 1), start + count):
+            ax = p[i * 2 - 2]
+            ay = p[i * 2 - 1]
+            bx = p[i * 2]
+            by = p[i * 2 + 1]
+            dx = bx - ax
+            dy = by - ay
+            length = sqrt(dx * dx + dy * dy)
+            if length == 0:
+                continue
+            dx /= length
+            dy /= length
+            if s.have_segment:
+                _stroke_joint(s, &g, ax, ay, s.dx, s.dy, dx, dy)
+            else:
+                _stroke_cap(s, &g, ax, ay, -dx, -dy)
+                s.have_segment = 1
+            _stroke_segment(s, &g, ax, ay, bx, by, dx, dy, length)
+            s.x = bx
+            s.y = by
+            s.dx = dx
+            s.dy = dy
+
+        if not s.have_segment:
+            return 0
+
+        vcount = g.vcount
+        icount = g.icount
+        _stroke_cap(s, &g, s.x, s.y, s.dx, s.dy)
+
+        if g.base + g.vcount > 65535:
+            # keep the line drawn so far with its end cap, the next points
+            # start a new line.
+            s[0] = previous
+            s.have_segment = 0
+            s.tail_vcount = s.tail_icount = 0
+            Logger.error('Line: too many vertices for a line of this width, '
+                         'the end of the line is not drawn')
+            return 0
+
+        if s.tail_vcount:
+            batch.pop_data(s.tail_vcount, s.tail_icount)
+        batch.append_data(g.vertices, g.vcount, g.indices, g.icount)
+        s.vcount = g.base + g.vcount
+        s.tail_vcount = g.vcount - vcount
+        s.tail_icount = g.icount - icount
+    finally:
+        free(g.vertices)
+        free(g.indices)
+    return 0
+
+
+cdef class _StrokeInstruction(VertexInstruction):
+    # Base of Line and Bezier: the parameters of the stroke drawing a wide
+    # line, and their properties.
+    cdef _stroke_t _stroke
+
+    def __init__(self, **kwargs):
+        VertexInstruction.__init__(self, **kwargs)
+        self._stroke.width = kwargs.get('width') or 1.
+        self._stroke.cap = _line_cap_from_str(kwargs.get('cap') or 'round')
+        self._stroke.joint = _line_joint_from_str(
+                kwargs.get('joint') or 'round')
+        self._stroke.cap_precision = kwargs.get('cap_precision') or 10
+        self._stroke.joint_precision = kwargs.get('joint_precision') or 10
+        self.batch.set_mode('line_strip' if self._stroke.width <= 1 else
+                            'triangles')
+
+    property width:
+        '''Width of the line. A line wider than 1 is drawn with triangles,
+        with anti-aliased edges.
+
+        .. versionadded:: 1.3.0
+        '''
+        def __get__(self):
+            return self._stroke.width
+
+        def __set__(self, value):
+            if value <= 0:
+                raise GraphicException('Invalid width value, must be > 0')
+            self._stroke.width = value
+            self.flag_update()
+
+    property cap:
+        '''Shape of the ends of a wide line, one of 'none', 'square' or
+        'round'.
+
+        .. versionadded:: 1.3.0
+        '''
+        def __get__(self):
+            return _line_caps[self._stroke.cap]
+
+        def __set__(self, value):
+            self._stroke.cap = _line_cap_from_str(value)
+            self.flag_update()
+
+    property joint:
+        '''Shape of the joints between the segments of a wide line, one of
+        'none', 'miter', 'bevel' or 'round'. A miter joint on a sharp angle is
+        drawn as a bevel.
+
+        .. versionadded:: 1.3.0
+        '''
+        def __get__(self):
+            return _line_joints[self._stroke.joint]
+
+        def __set__(self, value):
+            self._stroke.joint = _line_joint_from_str(value)
+            self.flag_update()
+
+    property cap_precision:
+        '''Number of segments used to draw a round cap.
+
+        .. versionadded:: 1.3.0
+        '''
+        def __get__(self):
+            return self._stroke.cap_precision
+
+        def __set__(self, value):
+            if value < 1:
+                raise GraphicException(
+                    'Invalid cap_precision value, must be >= 1')
+            self._stroke.cap_precision = value
+            self.flag_update()
+
+    property joint_precision:
+        '''Number of segments used to draw a round joint of a half turn.
+
+        .. versionadded:: 1.3.0
+        '''
+        def __get__(self):
+            return self._stroke.joint_precision
+
+        def __set__(self, value):
+            if value < 1:
+                raise GraphicException(
+                    'Invalid joint_precision value, must be >= 1')
+            self._stroke.joint_precision = value
+            self.flag_update()
+
+
+cdef class Line(_StrokeInstruction):
     '''A 2d line.
 
     .. versionadded:: 1.0.8
         `dash_offset` and `dash_length` have been added
 
+    .. versionchanged:: 1.3.0
+        `points` can be a buffer of floats or doubles (array.array,
+        memoryview, numpy array...). :func:`add_points` have been added.
+        `width`, `cap`, `joint`, `cap_precision` and `joint_precision` have
+        been added.
+
     :Parameters:
         `points`: list
             List of points in the format (x1, y1, x2, y2...)
@@ -40,51 +569,78 @@ cdef class Line(VertexInstruction):
         `dash_offset`: int
             offset between the end of a segments and the begining of the
             next one, default 0, changing this makes it dashed.
+        `width`: float
+            width of the line, default 1.
+        `cap`: str, default to 'round'
+            shape of the ends of the line, one of 'none', 'square' or
+            'round'.
+        `joint`: str, default to 'round'
+            shape of the joints between two segments, one of 'none',
+            'miter', 'bevel' or 'round'.
+        `cap_precision`: int, default to 10
+            number of segments used to draw a round cap.
+        `joint_precision`: int, default to 10
+            number of segments used to draw a round joint of a half turn.
+
+    A line with a `width` of 1 is drawn as a line strip. A wider line is
+    drawn with triangles, and its edges are anti-aliased.
+
+    .. warning::
+
+        A line cannot have more than 65535 points. A wide line is limited to
+        65535 vertices, so a lower number of points: each segment takes 4
+        vertices, plus the joints.
     '''
     cdef list _points
+    cdef float *_cpoints
+    cdef int _count
+    cdef float _tex_x
     cdef int _dash_offset, _dash_length
 
     def __init__(self, **kwargs):
-        VertexInstruction.__init__(self, **kwargs)
+        _StrokeInstruction.__init__(self, **kwargs)
         v = kwargs.get('points')
         self.points = v if v is not None else []
-        self.batch.set_mode('line_strip')
         self._dash_length = kwargs.get('dash_length') or 1
         self._dash_offset = kwargs.get('dash_offset') or 0
 
+    def __dealloc__(self):
+        free(self._cpoints)
+
     cdef void build(self):
-        cdef int i, count = len(self.points) / 2
-        cdef list p = self.points
-        cdef vertex_t *vertices = NULL
-        cdef unsigned short *indices = NULL
-        cdef float tex_x
-        cdef char *buf = NULL
-        cdef Texture texture = self.texture
+        cdef int count = self._count / 2
 
         if count < 2:
             self.batch.clear_data()
             return
 
-        if self._dash_offset != 0:
-            if texture is None or texture._width != \
-                (self._dash_length + self._dash_offset) or \
-                texture._height != 1:
+        self.texture = _line_texture(self.texture, self._dash_length,
+                self._dash_offset, self._stroke.width)
 
-                self.texture = texture = Texture.create(
-                        size=(self._dash_length + self._dash_offset, 1))
-                texture.wrap = 'repeat'
-
-            # create a buffer to fill our texture
-            buf = <char *>malloc(4 * (self._dash_length + self._dash_offset))
-            memset(buf, 255, self._dash_length * 4)
-            memset(buf + self._dash_length * 4, 0, self._dash_offset * 4)
-            p_str = PyString_FromStringAndSize(buf,  (self._dash_length + self._dash_offset) * 4)
-
-            self.texture.blit_buffer(p_str, colorfmt='rgba', bufferfmt='ubyte')
-            free(buf)
+        self.batch.clear_data()
+        if self._stroke.width <= 1:
+            self.batch.set_mode('line_strip')
+            self._tex_x = 0
+        else:
+            self.batch.set_mode('triangles')
+            self._stroke.dash = 0
+            if self._dash_offset != 0:
+                self._stroke.dash = self._dash_length + self._dash_offset
+            _stroke_reset(&self._stroke)
+        self.append_vertices(0, count)
+
+    cdef void append_vertices(self, int start, int count):
+        # add the vertices of the points [start, start + count) into the
+        # batch. The line continue from the previous points.
+        cdef int i, j
+        cdef float *p = self._cpoints
+        cdef vertex_t *vertices = NULL
+        cdef unsigned short *indices = NULL
+        cdef float dash = self._dash_length + self._dash_offset
 
-        elif texture is not None:
-            self.texture = None
+        if self._stroke.width > 1:
+            _stroke_append(self.batch, &self._stroke, p, start, count)
+            return
 
         vertices = <vertex_t *>malloc(count * sizeof(vertex_t))
         if vertices == NULL:
@@ -95,38 +651,82 @@ cdef class Line(VertexInstruction):
             free(vertices)
             raise MemoryError('indices')
 
-        tex_x = 0
         for i in xrange(count):
-            if self._dash_offset != 0 and i > 0:
-                tex_x += sqrt(
-                        pow(p[i * 2]     - p[(i - 1) * 2], 2)  +
-                        pow(p[i * 2 + 1] - p[(i - 1) * 2 + 1], 2)) / (
-                                self._dash_length + self._dash_offset)
+            j = start + i
+            if self._dash_offset != 0 and j > 0:
+                self._tex_x += sqrt(
+                        pow(p[j * 2]     - p[(j - 1) * 2], 2)  +
+                        pow(p[j * 2 + 1] - p[(j - 1) * 2 + 1], 2)) / dash
 
-                vertices[i].s0 = tex_x
-                vertices[i].t0 = 0
+            vertices[i].s0 = self._tex_x
+            vertices[i].t0 = 0
+            vertices[i].x = p[j * 2]
+            vertices[i].y = p[j * 2 + 1]
+            indices[i] = j
 
-            vertices[i].x = p[i * 2]
-            vertices[i].y = p[i * 2 + 1]
-            indices[i] = i
-
-        self.batch.set_data(vertices, count, indices, count)
+        self.batch.append_data(vertices, count, indices, count)
 
         free(vertices)
         free(indices)
 
+    def add_points(self, points):
+        '''Add points at the end of the line, in the format
+        (x1, y1, x2, y2...). The points can be a list or a buffer, like
+        :data:`points`.
+
+        Only the new points are uploaded to the GPU, the line is not
+        reconstructed. On a wide line, the end cap is replaced by the new
+        segments.
+
+        .. versionadded:: 1.3.0
+        '''
+        cdef int count = 0, start = self._count / 2
+        cdef float *new_points = _read_floats(points, &count)
+        try:
+            if count % 2 != 0:
+                raise GraphicException('Invalid points, the count must be even')
+            if (self._count + count) / 2 > 65535:
+                raise GraphicException('Too many points (limit is 65535)')
+            self._cpoints = _append_floats(self._cpoints, self._count,
+                                           new_points, count)
+        finally:
+            free(new_points)
+        self._count += count
+        self._points = None
+
+        # if the line was too short to be built, or is waiting for a rebuild,
+        # do it from scratch.
+        if start < 2 or self.flags & GI_NEEDS_UPDATE:
+            self.flag_update()
+            return
+        if count:
+            self.append_vertices(start, count / 2)
+            if self.parent is not None:
+                self.parent.flag_update()
+
     property points:
         '''Property for getting/settings points of the line
 
         .. warning::
 
             This will always reconstruct the whole graphics from the new points
-            list. It can be very CPU expensive.
+            list. It can be very CPU expensive. Use :func:`add_points` if you
+            only add points at the end of the line.
         '''
         def __get__(self):
+            if self._points is None:
+                self._points = _floats_to_list(self._cpoints, self._count)
             return self._points
         def __set__(self, points):
-            self._points = list(points)
+            cdef int count = 0
+            cdef float *new_points = _read_floats(points, &count)
+            if count / 2 > 65535:
+                free(new_points)
+                raise GraphicException('Too many points (limit is 65535)')
+            free(self._cpoints)
+            self._cpoints = new_points
+            self._count = count
+            self._points = None
             self.flag_update()
 
     property dash_length:
@@ -158,7 +758,7 @@ cdef class Line(VertexInstruction):
             self.flag_update()
 
 
-cdef class Bezier(VertexInstruction):
+cdef class Bezier(_StrokeInstruction):
     '''A 2d Bezier curve.
 
     .. versionadded:: 1.0.8
@@ -176,6 +776,12 @@ cdef class Bezier(VertexInstruction):
         `dash_offset`: int
             distance between the end of a segment and the start of the
             next one, default 0, changing this makes it dashed.
+        `width`, `cap`, `joint`, `cap_precision`, `joint_precision`:
+            same as for :class:`Line`.
+
+    .. versionchanged:: 1.3.0
+        `width`, `cap`, `joint`, `cap_precision` and `joint_precision` have
+        been added.
     '''
 
     # TODO: refactoring:
@@ -192,7 +798,7 @@ cdef class Bezier(VertexInstruction):
     cdef int _dash_offset, _dash_length
 
     def __init__(self, **kwargs):
-        VertexInstruction.__init__(self, **kwargs)
+        _StrokeInstruction.__init__(self, **kwargs)
         v = kwargs.get('points')
         self.points = v if v is not None else [0, 0, 0, 0, 0, 0, 0, 0]
         self._segments = kwargs.get('segments') or 10
@@ -201,51 +807,30 @@ cdef class Bezier(VertexInstruction):
             self.points.extend(self.points[:2])
         self._dash_length = kwargs.get('dash_length') or 1
         self._dash_offset = kwargs.get('dash_offset') or 0
-        self.batch.set_mode('line_strip')
 
     cdef void build(self):
-        cdef int x, i, j
-        cdef float l
-        cdef list T = self.points[:]
+        cdef int x, i, j, n = len(self._points)
+        cdef int count = self._segments + 1
+        cdef float l, tex_x = 0
+        cdef float *T = NULL
+        cdef float *p = NULL
         cdef vertex_t *vertices = NULL
         cdef unsigned short *indices = NULL
-        cdef float tex_x
-        cdef char *buf = NULL
-        cdef Texture texture = self.texture
-
-        if self._dash_offset != 0:
-            if texture is None or texture._width != \
-                (self._dash_length + self._dash_offset) or \
-                texture._height != 1:
-
-                self.texture = texture = Texture.create(
-                        size=(self._dash_length + self._dash_offset, 1))
-                texture.wrap = 'repeat'
-
-            # create a buffer to fill our texture
-            buf = <char *>malloc(4 * (self._dash_length + self._dash_offset))
-            memset(buf, 255, self._dash_length * 4)
-            memset(buf + self._dash_length * 4, 0, self._dash_offset * 4)
+        cdef float dash = self._dash_length + self._dash_offset
 
-            p_str = PyString_FromStringAndSize(buf,  (self._dash_length + self._dash_offset) * 4)
-
-            texture.blit_buffer(p_str, colorfmt='rgba', bufferfmt='ubyte')
-            free(buf)
-
-        elif texture is not None:
-            self.texture = None
-
-        vertices = <vertex_t *>malloc((self._segments + 1) * sizeof(vertex_t))
-        if vertices == NULL:
-            raise MemoryError('vertices')
+        self.texture = _line_texture(self.texture, self._dash_length,
+                self._dash_offset, self._stroke.width)
+        self.batch.clear_data()
+        if n < 2:
+            return
 
-        indices = <unsigned short *>malloc(
-                (self._segments + 1) * sizeof(unsigned short))
-        if indices == NULL:
-            free(vertices)
-            raise MemoryError('indices')
+        T = <float *>malloc(n * sizeof(float))
+        p = <float *>malloc(count * 2 * sizeof(float))
+        if T == NULL or p == NULL:
+            free(T)
+            free(p)
+            raise MemoryError('points')
 
-        tex_x = x = 0
         for x in xrange(self._segments):
             l = x / (1.0 * self._segments)
             # http://en.wikipedia.org/wiki/De_Casteljau%27s_algorithm
@@ -253,45 +838,56 @@ cdef class Bezier(VertexInstruction):
             # done on each item and the current item (xn or yn) in the list is
             # replaced with a calculation of "xn + x(n+1) - xn" x(n+1) is
             # placed at n+2. each iteration makes the list one item shorter
-            for i in range(1, len(T)):
-                for j in xrange(len(T) - 2*i):
-                    T[j] = T[j] + (T[j+2] - T[j]) * l
+            for i in xrange(n):
+                T[i] = self._points[i]
+            for i in xrange(1, n / 2):
+                for j in xrange(n - 2 * i):
+                    T[j] = T[j] + (T[j + 2] - T[j]) * l
 
             # we got the coordinates of the point in T[0] and T[1]
-            vertices[x].x = T[0]
-            vertices[x].y = T[1]
-            if self._dash_offset != 0 and x > 0:
-                tex_x += sqrt(
-                        pow(vertices[x].x - vertices[x-1].x, 2) +
-                        pow(vertices[x].y - vertices[x-1].y, 2)) / (
-                                self._dash_length + self._dash_offset)
-
-                vertices[x].s0 = tex_x
-                vertices[x].t0 = 0
-
-            indices[x] = x
+            p[x * 2] = T[0]
+            p[x * 2 + 1] = T[1]
 
         # add one last point to join the curve to the end
-        vertices[x+1].x = T[-2]
-        vertices[x+1].y = T[-1]
+        p[count * 2 - 2] = self._points[n - 2]
+        p[count * 2 - 1] = self._points[n - 1]
+        free(T)
+
+        if self._stroke.width > 1:
+            self.batch.set_mode('triangles')
+            self._stroke.dash = dash if self._dash_offset != 0 else 0
+            _stroke_reset(&self._stroke)
+            try:
+                _stroke_append(self.batch, &self._stroke, p, 0, count)
+            finally:
+                free(p)
+            return
 
-        tex_x += sqrt(
-                (vertices[x+1].x - vertices[x].x) ** 2 +
-                (vertices[x+1].y - vertices[x].y) ** 2) / (
-                        self._dash_length + self._dash_offset)
+        self.batch.set_mode('line_strip')
+        vertices = <vertex_t *>malloc(count * sizeof(vertex_t))
+        indices = <unsigned short *>malloc(count * sizeof(unsigned short))
+        if vertices == NULL or indices == NULL:
+            free(vertices)
+            free(indices)
+            free(p)
+            raise MemoryError('vertices')
 
-        vertices[x+1].s0 = tex_x
-        vertices[x+1].t0 = 0
-        indices[x+1] = x + 1
+        for x in xrange(count):
+            if self._dash_offset != 0 and x > 0:
+                tex_x += sqrt(
+                        pow(p[x * 2] - p[x * 2 - 2], 2) +
+                        pow(p[x * 2 + 1] - p[x * 2 - 1], 2)) / dash
+            vertices[x].x = p[x * 2]
+            vertices[x].y = p[x * 2 + 1]
+            vertices[x].s0 = tex_x
+            vertices[x].t0 = 0
+            indices[x] = x
 
-        self.batch.set_data(
-                vertices,
-                self._segments + 1,
-                indices,
-                self._segments + 1)
+        self.batch.set_data(vertices, count, indices, count)
 
         free(vertices)
         free(indices)
+        free(p)
 
     property points:
         '''Property for getting/settings points of the triangle
@@ -380,6 +976,10 @@ cdef class Mesh(VertexInstruction):
     '''
     cdef list _vertices
     cdef list _indices
+    cdef float *_cvertices
+    cdef float *_cindices
+    cdef int _vcount
+    cdef int _icount
 
     def __init__(self, **kwargs):
         VertexInstruction.__init__(self, **kwargs)
@@ -389,64 +989,79 @@ cdef class Mesh(VertexInstruction):
         self.indices = v if v is not None else []
         self.mode = kwargs.get('mode') or 'points'
 
+    def __dealloc__(self):
+        free(self._cvertices)
+        free(self._cindices)
+
     cdef void build(self):
-        cdef int i, vcount = len(self._vertices) / 4
-        cdef int icount = len(self._indices)
-        cdef vertex_t *vertices = NULL
+        cdef int i, vcount = self._vcount / 4
+        cdef int icount = self._icount
         cdef unsigned short *indices = NULL
-        cdef list lvertices = self._vertices
-        cdef list lindices = self._indices
+        cdef float *lindices = self._cindices
 
         if vcount == 0 or icount == 0:
             self.batch.clear_data()
             return
 
-        vertices = <vertex_t *>malloc(vcount * sizeof(vertex_t))
-        if vertices == NULL:
-            raise MemoryError('vertices')
-
         indices = <unsigned short *>malloc(icount * sizeof(unsigned short))
         if indices == NULL:
-            free(vertices)
             raise MemoryError('indices')
 
-        for i in xrange(vcount):
-            vertices[i].x = lvertices[i * 4]
-            vertices[i].y = lvertices[i * 4 + 1]
-            vertices[i].s0 = lvertices[i * 4 + 2]
-            vertices[i].t0 = lvertices[i * 4 + 3]
-
         for i in xrange(icount):
-            indices[i] = lindices[i]
+            indices[i] = <unsigned short>lindices[i]
 
-        self.batch.set_data(vertices, vcount, indices, icount)
+        # the vertices are already in the vertex_t format (x, y, u, v)
+        self.batch.set_data(<vertex_t *>self._cvertices, vcount, indices,
+                            icount)
 
-        free(vertices)
         free(indices)
 
     property vertices:
         '''List of x, y, u, v, ... used to construct the Mesh. Right now, the
         Mesh instruction doesn't allow you to change the format of the vertices,
         mean it's only x/y + one texture coordinate.
+
+        .. versionchanged:: 1.3.0
+            The vertices can be a buffer of floats or doubles (array.array,
+            memoryview, numpy array...).
         '''
         def __get__(self):
+            if self._vertices is None:
+                self._vertices = _floats_to_list(self._cvertices, self._vcount)
             return self._vertices
         def __set__(self, value):
-            self._vertices = list(value)
+            cdef int count = 0
+            cdef float *vertices = _read_floats(value, &count)
+            free(self._cvertices)
+            self._cvertices = vertices
+            self._vcount = count
+            self._vertices = None
             self.flag_update()
 
     property indices:
         '''Vertex indices used to know which order you wanna do for drawing the
         mesh.
+
+        .. versionchanged:: 1.3.0
+            The indices can be a buffer of floats or doubles.
         '''
         def __get__(self):
+            if self._indices is None:
+                self._indices = [int(x) for x in _floats_to_list(
+                    self._cindices, self._icount)]
             return self._indices
         def __set__(self, value):
-            if len(value) > 65535:
+            cdef int count = 0
+            cdef float *indices = _read_floats(value, &count)
+            if count > 65535:
+                free(indices)
                 raise GraphicException(
                     'Cannot upload more than 65535 indices'
                     '(OpenGL ES 2 limitation)')
-            self._indices = list(value)
+            free(self._cindices)
+            self._cindices = indices
+            self._icount = count
+            self._indices = None
             self.flag_update()
 
     property mode:
@@ -459,6 +1074,276 @@ cdef class Mesh(VertexInstruction):
             self.batch.set_mode(mode)
 
 
+cdef class InstancedMesh(VertexInstruction):
+    '''Draw many copies of the same mesh, in a single draw call.
+
+    The mesh is described like :class:`Mesh`, with `vertices` and `indices`
+    drawn as triangles. By default, it's a quad of size 1 centered on (0, 0),
+    covering the whole texture.
+
+    Each instance is described by :data:`INSTANCE_SIZE` numbers::
+
+        instances = [x, y, scale, rotation, u, v, tw, th, ...]
+
+    The mesh is scaled, rotated (in degrees, counterclockwise) and moved to
+    (x, y). The texture coordinates of the mesh are mapped to the region
+    (u, v, tw, th) of the texture, so a sprite sheet or an atlas can be used
+    to give another image to each instance.
+
+    All the instances are expanded in one batch of vertices. Use
+    :func:`add_instances` and :func:`update_instances` to change a few
+    instances without reconstructing the whole batch::
+
+        with self.canvas:
+            sprites = InstancedMesh(source='particle.png', instances=[
+                100, 100, 32, 0, 0, 0, 1, 1,
+                200, 150, 16, 45, 0, 0, 1, 1])
+
+        # move the second sprite
+        sprites.update_instances(1, (220, 160, 16, 50, 0, 0, 1, 1))
+
+    .. versionadded:: 1.3.0
+
+    :Parameters:
+        `instances`: list
+            List of instances in the format (x, y, scale, rotation, u, v, tw,
+            th, ...). It can be a buffer of floats or doubles (array.array,
+            memoryview, numpy array...).
+        `vertices`: list
+            List of vertices of the mesh, in the format (x1, y1, u1, v1, x2,
+            y2, u2, v2...).
+        `indices`: list
+            List of triangle indices of the mesh.
+
+    .. note::
+
+        The color is the same for all the instances: use one
+        :class:`InstancedMesh` per color.
+
+    .. warning::
+
+        The vertices of all the instances cannot exceed 65535: with the
+        default quad, you can have up to 16383 instances.
+    '''
+    cdef float *_cinstances
+    cdef int _icount
+    cdef list _instances
+    cdef float *_cvertices
+    cdef int _vcount
+    cdef unsigned short *_cindices
+    cdef int _indices_count
+
+    INSTANCE_SIZE = 8
+
+    def __init__(self, **kwargs):
+        VertexInstruction.__init__(self, **kwargs)
+        v = kwargs.get('vertices')
+        self.vertices = v if v is not None else [
+            -.5, -.5, 0, 0,  .5, -.5, 1, 0,  .5, .5, 1, 1,  -.5, .5, 0, 1]
+        v = kwargs.get('indices')
+        self.indices = v if v is not None else [0, 1, 2, 2, 3, 0]
+        v = kwargs.get('instances')
+        self.instances = v if v is not None else []
+        self.batch.set_mode('triangles')
+
+    def __dealloc__(self):
+        free(self._cinstances)
+        free(self._cvertices)
+        free(self._cindices)
+
+    cdef void build(self):
+        self.batch.clear_data()
+        self.append_instances(0, self._icount / 8)
+
+    cdef void fill_vertices(self, int start, int count, vertex_t *out):
+        # compute the vertices of the instances [start, start + count)
+        cdef int i, j, mcount = self._vcount / 4
+        cdef float *inst
+        cdef float *mv
+        cdef float c, s
+        cdef vertex_t *v
+        for i in xrange(count):
+            inst = self._cinstances + (start + i) * 8
+            c = cos(inst[3] * pi / 180.) * inst[2]
+            s = sin(inst[3] * pi / 180.) * inst[2]
+            for j in xrange(mcount):
+                mv = self._cvertices + j * 4
+                v = &out[i * mcount + j]
+                v.x = inst[0] + c * mv[0] - s * mv[1]
+                v.y = inst[1] + s * mv[0] + c * mv[1]
+                v.s0 = inst[4] + mv[2] * inst[6]
+                v.t0 = inst[5] + mv[3] * inst[7]
+
+    cdef void append_instances(self, int start, int count):
+        # add the instances [start, start + count) at the end of the batch
+        cdef int i, j, mcount = self._vcount / 4
+        cdef int icount = self._indices_count
+        cdef vertex_t *vertices = NULL
+        cdef unsigned short *indices = NULL
+
+        if count == 0 or mcount == 0 or icount == 0:
+            return
+
+        vertices = <vertex_t *>malloc(count * mcount * sizeof(vertex_t))
+        if vertices == NULL:
+            raise MemoryError('vertices')
+        indices = <unsigned short *>malloc(
+                count * icount * sizeof(unsigned short))
+        if indices == NULL:
+            free(vertices)
+            raise MemoryError('indices')
+
+        self.fill_vertices(start, count, vertices)
+        for i in xrange(count):
+            for j in xrange(icount):
+                indices[i * icount + j] = \
+                        (start + i) * mcount + self._cindices[j]
+
+        self.batch.append_data(vertices, count * mcount, indices,
+                               count * icount)
+        free(vertices)
+        free(indices)
+
+    cdef int check_limit(self, int icount, int vcount) except -1:
+        if icount / 8 * (vcount / 4) > 65535:
+            raise GraphicException('Too many vertices (limit is 65535)')
+        return 0
+
+    def add_instances(self, instances):
+        '''Add instances at the end, in the format (x, y, scale, rotation, u,
+        v, tw, th, ...). Only the new instances are uploaded to the GPU.
+        '''
+        cdef int count = 0, start = self._icount / 8
+        cdef float *values = _read_floats(instances, &count)
+        try:
+            if count % 8 != 0:
+                raise GraphicException(
+                    'Invalid instances, the count must be a multiple of 8')
+            self.check_limit(self._icount + count, self._vcount)
+            self._cinstances = _append_floats(self._cinstances,
+                                              self._icount, values, count)
+        finally:
+            free(values)
+        self._icount += count
+        self._instances = None
+
+        if self.flags & GI_NEEDS_UPDATE:
+            return
+        self.append_instances(start, count / 8)
+        if self.parent is not None:
+            self.parent.flag_update()
+
+    def update_instances(self, int index, instances):
+        '''Replace the instances starting at `index` with the new values, in
+        the format (x, y, scale, rotation, u, v, tw, th, ...). Only the
+        vertices of these instances are recomputed.
+        '''
+        cdef int count = 0, mcount = self._vcount / 4
+        cdef float *values = _read_floats(instances, &count)
+        cdef vertex_t *vertices = NULL
+        try:
+            if count % 8 != 0:
+                raise GraphicException(
+                    'Invalid instances, the count must be a multiple of 8')
+            if index < 0 or index * 8 + count > self._icount:
+                raise IndexError('instance index out of range')
+            memcpy(self._cinstances + index * 8, values,
+                   count * sizeof(float))
+        finally:
+            free(values)
+        self._instances = None
+
+        if self.flags & GI_NEEDS_UPDATE or count == 0 or mcount == 0:
+            return
+        vertices = <vertex_t *>malloc(count / 8 * mcount * sizeof(vertex_t))
+        if vertices == NULL:
+            raise MemoryError('vertices')
+        self.fill_vertices(index, count / 8, vertices)
+        self.batch.update_data(index * mcount, vertices, count / 8 * mcount)
+        free(vertices)
+        if self.parent is not None:
+            self.parent.flag_update()
+
+    property count:
+        '''Number of instances (read-only).
+        '''
+        def __get__(self):
+            return self._icount / 8
+
+    property instances:
+        '''List of the instances, in the format (x, y, scale, rotation, u, v,
+        tw, th, ...).
+
+        .. warning::
+
+            Setting the instances reconstruct the whole batch. Use
+            :func:`add_instances` or :func:`update_instances` to change only a
+            few of them.
+        '''
+        def __get__(self):
+            if self._instances is None:
+                self._instances = _floats_to_list(self._cinstances,
+                                                  self._icount)
+            return self._instances
+        def __set__(self, value):
+            cdef int count = 0
+            cdef float *instances = _read_floats(value, &count)
+            if count % 8 != 0:
+                free(instances)
+                raise GraphicException(
+                    'Invalid instances, the count must be a multiple of 8')
+            try:
+                self.check_limit(count, self._vcount)
+            except:
+                free(instances)
+                raise
+            free(self._cinstances)
+            self._cinstances = instances
+            self._icount = count
+            self._instances = None
+            self.flag_update()
+
+    property vertices:
+        '''List of x, y, u, v of the mesh drawn for each instance.
+        '''
+        def __get__(self):
+            return _floats_to_list(self._cvertices, self._vcount)
+        def __set__(self, value):
+            cdef int count = 0
+            cdef float *vertices = _read_floats(value, &count)
+            if count % 4 != 0:
+                free(vertices)
+                raise GraphicException(
+                    'Invalid vertices, the count must be a multiple of 4')
+            try:
+                self.check_limit(self._icount, count)
+            except:
+                free(vertices)
+                raise
+            free(self._cvertices)
+            self._cvertices = vertices
+            self._vcount = count
+            self.flag_update()
+
+    property indices:
+        '''Triangle indices of the mesh drawn for each instance.
+        '''
+        def __get__(self):
+            cdef int i
+            return [self._cindices[i] for i in xrange(self._indices_count)]
+        def __set__(self, value):
+            cdef int i, count = len(value)
+            cdef unsigned short *indices = <unsigned short *>malloc(
+                    max(count, 1) * sizeof(unsigned short))
+            if indices == NULL:
+                raise MemoryError('indices')
+            for i in xrange(count):
+                indices[i] = value[i]
+            free(self._cindices)
+            self._cindices = indices
+            self._indices_count = count
+            self.flag_update()
+
 
 cdef class Point(VertexInstruction):
     '''A 2d line.
@@ -469,6 +1354,10 @@ cdef class Point(VertexInstruction):
         `pointsize`: float, default to 1.
             Size of the point (1. mean the real size will be 2)
 
+    .. versionchanged:: 1.3.0
+        `points` can be a buffer of floats or doubles (array.array,
+        memoryview, numpy array...). :func:`add_points` have been added.
+
     .. warning::
 
         Starting from version 1.0.7, vertex instruction have a limit of 65535
@@ -478,6 +1367,8 @@ cdef class Point(VertexInstruction):
 
     '''
     cdef list _points
+    cdef float *_cpoints
+    cdef int _count
     cdef float _pointsize
 
     def __init__(self, **kwargs):
@@ -486,20 +1377,30 @@ cdef class Point(VertexInstruction):
         self.points = v if v is not None else []
         self.pointsize = kwargs.get('pointsize') or 1.
 
+    def __dealloc__(self):
+        free(self._cpoints)
+
     cdef void build(self):
-        cdef float t0, t1, t2, t3, t4, t5, t6, t7
-        cdef float x, y, ps = self._pointsize
-        cdef int i, iv, ii, count = <int>(len(self._points) * 0.5)
-        cdef list p = self.points
-        cdef list tc = self._tex_coords
-        cdef vertex_t *vertices = NULL
-        cdef unsigned short *indices = NULL
+        cdef int count = self._count / 2
 
         #if there is no points...nothing to do
         if count < 1:
             self.batch.clear_data()
             return
 
+        self.batch.clear_data()
+        self.append_vertices(0, count)
+
+    cdef void append_vertices(self, int start, int count):
+        # add the quads of the points [start, start + count) into the batch
+        cdef float t0, t1, t2, t3, t4, t5, t6, t7
+        cdef float x, y, ps = self._pointsize
+        cdef int i, iv, ii
+        cdef float *p = self._cpoints + start * 2
+        cdef list tc = self._tex_coords
+        cdef vertex_t *vertices = NULL
+        cdef unsigned short *indices = NULL
+
         vertices = <vertex_t *>malloc(count * 4 * sizeof(vertex_t))
         if vertices == NULL:
             raise MemoryError('vertices')
@@ -532,6 +1433,8 @@ cdef class Point(VertexInstruction):
             vertices[iv + 3].s0 = t6
             vertices[iv + 3].t0 = t7
 
+            # indices are relative to the whole batch
+            iv += start * 4
             ii = i * 6
             indices[ii] = iv
             indices[ii + 1] = iv + 1
@@ -540,7 +1443,7 @@ cdef class Point(VertexInstruction):
             indices[ii + 4] = iv + 3
             indices[ii + 5] = iv
 
-        self.batch.set_data(vertices, count * 4, indices, count * 6)
+        self.batch.append_data(vertices, count * 4, indices, count * 6)
 
         free(vertices)
         free(indices)
@@ -553,63 +1456,57 @@ cdef class Point(VertexInstruction):
         list will recalculate and reupload the whole buffer into GPU.
         If you use add_point, it will only upload the changes.
         '''
-        cdef float t0, t1, t2, t3, t4, t5, t6, t7
-        cdef float ps = self._pointsize
-        cdef int iv, count = <int>(len(self._points) * 0.5)
-        cdef list tc = self._tex_coords
-        cdef vertex_t vertices[4]
-        cdef unsigned short indices[6]
-
-        if len(self._points) > 2**15 - 2:
-            raise GraphicException('Cannot add elements (limit is 2^15-2)')
+        self.add_points((x, y))
 
-        self._points.append(x)
-        self._points.append(y)
+    def add_points(self, points):
+        '''Add many points at once, in the format (x1, y1, x2, y2...). The
+        points can be a list or a buffer, like :data:`points`. Only the new
+        points are uploaded to the GPU.
 
-        t0, t1, t2, t3, t4, t5, t6, t7 = tc
-        vertices[0].x = x - ps
-        vertices[0].y = y - ps
-        vertices[0].s0 = t0
-        vertices[0].t0 = t1
-        vertices[1].x = x + ps
-        vertices[1].y = y - ps
-        vertices[1].s0 = t2
-        vertices[1].t0 = t3
-        vertices[2].x = x + ps
-        vertices[2].y = y + ps
-        vertices[2].s0 = t4
-        vertices[2].t0 = t5
-        vertices[3].x = x - ps
-        vertices[3].y = y + ps
-        vertices[3].s0 = t6
-        vertices[3].t0 = t7
-
-        iv = count * 4
-        indices[0] = iv
-        indices[1] = iv + 1
-        indices[2] = iv + 2
-        indices[3] = iv + 2
-        indices[4] = iv + 3
-        indices[5] = iv
-
-        # append the vertices / indices to current vertex batch
-        self.batch.append_data(vertices, 4, indices, 6)
-
-        if self.parent is not None:
-            self.parent.flag_update()
+        .. versionadded:: 1.3.0
+        '''
+        cdef int count = 0, start = self._count / 2
+        cdef float *new_points = _read_floats(points, &count)
+        try:
+            if count % 2 != 0:
+                raise GraphicException('Invalid points, the count must be even')
+            if self._count + count > 2**15 - 2:
+                raise GraphicException('Cannot add elements (limit is 2^15-2)')
+            self._cpoints = _append_floats(self._cpoints, self._count,
+                                           new_points, count)
+        finally:
+            free(new_points)
+        self._count += count
+        self._points = None
+
+        if self.flags & GI_NEEDS_UPDATE:
+            return
+        if count:
+            self.append_vertices(start, count / 2)
+            if self.parent is not None:
+                self.parent.flag_update()
 
     property points:
         '''Property for getting/settings points of the triangle
         '''
         def __get__(self):
+            if self._points is None:
+                self._points = _floats_to_list(self._cpoints, self._count)
             return self._points
         def __set__(self, points):
-            if self._points == points:
+            cdef int count = 0
+            cdef float *new_points
+            if self._points is not None and isinstance(points, list) and \
+                    self._points == points:
                 return
-            cdef list _points = list(points)
-            if len(_points) > 2**15-2:
+            new_points = _read_floats(points, &count)
+            if count > 2**15-2:
+                free(new_points)
                 raise GraphicException('Too many elements (limit is 2^15-2)')
-            self._points = list(points)
+            free(self._cpoints)
+            self._cpoints = new_points
+            self._count = count
+            self._points = None
             self.flag_update()
 
     property pointsize:
@@ -5,12 +5,16 @@ Monitor module
 Monitor module is a toolbar that show activity of your current application :
 
 * FPS
+* Number of graphics states pushed / popped / restored during the last frame
+* Estimation of the GPU memory used by textures, vbos and fbos
 * Graph of input event
 
 '''
 
 from kivy.uix.label import Label
 from kivy.graphics import Rectangle, Color
+from kivy.graphics.instructions import get_frame_stats
+from kivy.graphics.context import get_context
 from kivy.clock import Clock
 from kivy.input.postproc import kivy_postproc_modules
 from functools import partial
@@ -20,7 +24,11 @@ _maxinput = -1
 
 
 def update_fps(ctx, *largs):
-    ctx.label.text = 'FPS: %f' % Clock.get_fps()
+    stats = get_frame_stats()
+    memory = get_context().get_memory_usage()
+    ctx.label.text = 'FPS: %f - States push: %d pop: %d restore: %d' \
+        ' - GPU: %.1fMB' % (Clock.get_fps(), stats['push'], stats['pop'],
+        stats['restore'], memory['total'] / 1048576.)
     ctx.rectangle.texture = ctx.label.texture
     ctx.rectangle.size = ctx.label.texture_size
 
@@ -0,0 +1,81 @@
+'''
+Atlas tests
+===========
+'''
+
+import unittest
+
+
+class ShelfPackerTestCase(unittest.TestCase):
+
+    def test_insert(self):
+        from kivy.atlas import ShelfPacker
+        packer = ShelfPacker(64, 64, padding=0)
+        self.assertEqual(packer.insert(32, 16), (0, 0))
+        self.assertEqual(packer.insert(32, 16), (32, 0))
+        self.assertEqual(packer.insert(32, 16), (0, 16))
+        self.assertEqual(packer.insert(65, 16), None)
+
+    def test_full(self):
+        from kivy.atlas import ShelfPacker
+        packer = ShelfPacker(64, 64, padding=0)
+        for i in xrange(4):
+            self.assertNotEqual(packer.insert(64, 16), None)
+        self.assertEqual(packer.insert(1, 1), None)
+        self.assertEqual(packer.occupancy, 1.)
+
+    def test_remove_reuse(self):
+        from kivy.atlas import ShelfPacker
+        packer = ShelfPacker(64, 64, padding=0)
+        packer.insert(32, 16)
+        packer.insert(32, 16)
+        packer.remove(0, 0, 32, 16)
+        self.assertEqual(packer.insert(16, 16), (0, 0))
+
+    def test_remove_merge_shelves(self):
+        from kivy.atlas import ShelfPacker
+        packer = ShelfPacker(64, 64, padding=0)
+        packer.insert(64, 16)
+        packer.insert(64, 16)
+        packer.insert(64, 16)
+        packer.remove(0, 0, 64, 16)
+        packer.remove(0, 16, 64, 16)
+        # the two empty shelves are merged, and can hold a taller rectangle
+        self.assertEqual(packer.insert(64, 32), (0, 0))
+        packer.remove(0, 0, 64, 32)
+        packer.remove(0, 32, 64, 16)
+        self.assertEqual(packer.shelves, [])
+        self.assertEqual(packer.count, 0)
+
+
+class MaxRectsPackerTestCase(unittest.TestCase):
+
+    def test_insert(self):
+        from kivy.atlas import MaxRectsPacker
+        packer = MaxRectsPacker(64, 64)
+        self.assertEqual(packer.insert(64, 32), (0, 0))
+        self.assertEqual(packer.insert(32, 32), (0, 32))
+        self.assertEqual(packer.insert(32, 32), (32, 32))
+        self.assertEqual(packer.insert(1, 1), None)
+        self.assertEqual(packer.occupancy, 1.)
+
+    def test_heuristics(self):
+        from kivy.atlas import MaxRectsPacker
+        sizes = [(30, 20), (20, 30), (10, 10), (40, 10), (16, 16), (8, 24)]
+        for heuristic in MaxRectsPacker.heuristics:
+            packer = MaxRectsPacker(64, 64, heuristic)
+            rects = []
+            for w, h in sizes:
+                pos = packer.insert(w, h)
+                self.assertNotEqual(pos, None)
+                rects.append((pos[0], pos[1], w, h))
+            # no overlap, and inside the area
+            for i, (x, y, w, h) in enumerate(rects):
+                self.assertTrue(x + w <= 64 and y + h <= 64)
+                for ox, oy, ow, oh in rects[i + 1:]:
+                    self.assertTrue(x >= ox + ow or ox >= x + w or
+                                    y >= oy + oh or oy >= y + h)
+
+    def test_invalid_heuristic(self):
+        from kivy.atlas import MaxRectsPacker
+        self.assertRaises(ValueError, MaxRectsPacker, 64, 64, 'unknown')
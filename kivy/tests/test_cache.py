@@ -0,0 +1,57 @@
+'''
+Cache tests
+===========
+'''
+
+import unittest
+
+
+class CacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        from kivy.cache import Cache
+        Cache.register('test.cache', limit=3)
+
+    def test_limit(self):
+        from kivy.cache import Cache
+        for x in xrange(5):
+            Cache.append('test.cache', x, x)
+        self.assertEqual(len(Cache._objects['test.cache']), 3)
+
+    def test_limit_purge_oldest(self):
+        from kivy.cache import Cache
+        for x in xrange(3):
+            Cache.append('test.cache', x, x)
+            Cache._objects['test.cache'][x]['lastaccess'] = x
+        Cache.append('test.cache', 3, 3)
+        self.assertEqual(Cache.get('test.cache', 0), None)
+        self.assertEqual(Cache.get('test.cache', 1), 1)
+        self.assertEqual(Cache.get('test.cache', 3), 3)
+
+    def test_limit_replace(self):
+        from kivy.cache import Cache
+        for x in xrange(3):
+            Cache.append('test.cache', x, x)
+        Cache.append('test.cache', 0, 'zero')
+        self.assertEqual(Cache.get('test.cache', 0), 'zero')
+        self.assertEqual(len(Cache._objects['test.cache']), 3)
+
+    def test_limit_purge_least_recent(self):
+        from kivy.cache import Cache
+        from kivy.clock import Clock
+
+        # the last access time is the time of the current frame
+        def access(func, *args):
+            Clock._last_tick += 1
+            return func('test.cache', *args)
+
+        for x in xrange(3):
+            access(Cache.append, x, x)
+        access(Cache.get, 0)
+        access(Cache.append, 3, 3)
+        self.assertEqual(access(Cache.get, 1), None)
+        self.assertEqual(access(Cache.get, 0), 0)
+        access(Cache.append, 2, 'two')
+        access(Cache.append, 4, 4)
+        self.assertEqual(access(Cache.get, 3), None)
+        self.assertEqual(access(Cache.get, 2), 'two')
@@ -73,3 +73,12 @@ class ClockTestCase(unittest.TestCase):
         Clock.unschedule(callback)
         Clock.tick()
         self.assertEqual(counter, 0)
+
+    def test_next_timeout(self):
+        from kivy.clock import Clock
+        self.assertEqual(Clock.get_next_timeout(), None)
+        Clock.schedule_once(callback, 5.)
+        timeout = Clock.get_next_timeout()
+        self.assertTrue(0 < timeout <= 5.)
+        Clock.schedule_once(callback, 0)
+        self.assertEqual(Clock.get_next_timeout(), 0)
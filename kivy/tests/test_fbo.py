@@ -0,0 +1,74 @@
+'''
+Framebuffer pool tests
+======================
+'''
+
+import unittest
+
+
+class FboPoolTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # the framebuffers need an OpenGL context
+        from kivy.core.window import Window
+        Window.create_window()
+
+    def test_reuse(self):
+        from kivy.graphics.fbo import FboPool
+        pool = FboPool()
+        fbo = pool.acquire((64, 64))
+        pool.release(fbo)
+        self.assertEqual(pool.stats, (0, 1, 1))
+        self.assertTrue(pool.acquire((64, 64)) is fbo)
+        self.assertEqual(pool.stats, (1, 1, 0))
+
+        # only the same size and format are reused
+        pool.release(fbo)
+        self.assertFalse(pool.acquire((32, 64)) is fbo)
+        self.assertFalse(pool.acquire((64, 64), colorfmt='rgb') is fbo)
+        self.assertFalse(pool.acquire((64, 64), with_depthbuffer=True)
+                         is fbo)
+        self.assertEqual(pool.stats, (1, 4, 1))
+
+    def test_limit(self):
+        from kivy.graphics.fbo import FboPool
+        pool = FboPool(limit=2)
+        fbos = [pool.acquire((x, x)) for x in (16, 32, 64)]
+        for fbo in fbos:
+            pool.release(fbo)
+        self.assertEqual(pool.stats, (0, 3, 2))
+
+        # the least recently released has been deleted
+        self.assertFalse(pool.acquire((16, 16)) is fbos[0])
+        self.assertTrue(pool.acquire((32, 32)) is fbos[1])
+        self.assertTrue(pool.acquire((64, 64)) is fbos[2])
+
+    def test_purge(self):
+        from kivy.clock import Clock
+        from kivy.graphics.fbo import FboPool
+        pool = FboPool(timeout=10)
+        old = pool.acquire((16, 16))
+        recent = pool.acquire((32, 32))
+        pool.release(old)
+        Clock._last_tick += 5
+        pool.release(recent)
+        Clock._last_tick += 6
+        pool.purge()
+        self.assertEqual(pool.stats[2], 1)
+        self.assertTrue(pool.acquire((32, 32)) is recent)
+
+    def test_transient(self):
+        from kivy.clock import Clock
+        from kivy.graphics.fbo import FboPool
+        pool = FboPool()
+        fbo = pool.acquire_transient((16, 16))
+
+        # still used until the current frame is drawn
+        pool.release_transients()
+        self.assertEqual(pool.stats[2], 0)
+
+        # released on the next frame
+        Clock._last_tick += 1
+        pool.release_transients()
+        self.assertEqual(pool.stats[2], 1)
+        self.assertTrue(pool.acquire((16, 16)) is fbo)
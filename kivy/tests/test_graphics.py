@@ -86,3 +86,160 @@ class VertexInstructionTestCase(GraphicUnitTest):
         p.add_point(50, 10)
 
         r(wid)
+
+    def test_line(self):
+        from kivy.uix.widget import Widget
+        from kivy.graphics import Line, Color
+        r = self.render
+
+        # thin and wide lines
+        wid = Widget()
+        with wid.canvas:
+            Color(1, 1, 1)
+            Line(points=(10, 10, 100, 10, 100, 100))
+            for i, joint in enumerate(('none', 'miter', 'bevel', 'round')):
+                Line(points=(10, 150 + i * 50, 100, 150 + i * 50, 50, 180 +
+                    i * 50), width=10, joint=joint, cap='square')
+        r(wid)
+
+    def test_line_dash(self):
+        from kivy.uix.widget import Widget
+        from kivy.graphics import Line, Color
+        r = self.render
+
+        # the texture of the dashed lines is created when they are built,
+        # after the canvas was compiled with the default textures.
+        wid = Widget()
+        with wid.canvas:
+            Color(1, 1, 1)
+            Line(points=(10, 10, 300, 10), dash_length=10, dash_offset=5)
+            Line(points=(10, 50, 300, 50), dash_length=2, dash_offset=20)
+            Line(points=(10, 90, 300, 90), width=5)
+            Line(points=(10, 130, 300, 130), width=5, dash_length=10,
+                 dash_offset=10)
+            Line(points=(10, 170, 300, 170), width=5)
+            Line(points=(10, 210, 300, 210), dash_length=10, dash_offset=5)
+        r(wid)
+
+    def test_line_add_points(self):
+        from kivy.uix.widget import Widget
+        from kivy.graphics import Line, Color
+        r = self.render
+
+        wid = Widget()
+        with wid.canvas:
+            Color(1, 1, 1)
+            line = Line(points=(10, 10, 50, 50), width=5)
+        r(wid)
+
+        line.add_points((90, 10, 130, 50))
+        line.add_points([x * 10 for x in xrange(10)])
+        self.assertEqual(len(line.points), 18)
+        r(wid)
+
+    def test_instanced_mesh(self):
+        from kivy.uix.widget import Widget
+        from kivy.graphics import InstancedMesh, Color, GraphicException
+        r = self.render
+
+        instances = []
+        for x in xrange(20):
+            instances.extend((x * 20, x * 10, 10, x * 10, 0, 0, 1, 1))
+
+        wid = Widget()
+        with wid.canvas:
+            Color(1, 1, 1)
+            mesh = InstancedMesh(instances=instances)
+        r(wid)
+
+        mesh.add_instances((300, 300, 50, 45, 0, 0, 1, 1))
+        mesh.update_instances(0, (10, 10, 20, 0, 0, 0, 1, 1))
+        self.assertEqual(mesh.count, 21)
+        self.assertEqual(mesh.instances[:3], [10, 10, 20])
+        r(wid)
+
+        # a bigger mesh must not exceed the limit of vertices
+        mesh = InstancedMesh(instances=[0, 0, 1, 0, 0, 0, 1, 1] * 16000)
+        vertices = mesh.vertices
+        self.assertRaises(GraphicException, setattr, mesh, 'vertices',
+                          vertices * 2)
+        self.assertEqual(mesh.vertices, vertices)
+
+    def test_cached_canvas(self):
+        from kivy.uix.widget import Widget
+        from kivy.graphics import CachedCanvas, Callback, Color, Rectangle
+        r = self.render
+
+        wid = Widget()
+        with wid.canvas:
+            color = Color(1, 0, 0)
+            cache = CachedCanvas()
+        with cache:
+            rect = Rectangle(pos=(10, 10), size=(100, 100))
+        r(wid, 2)
+        hits, misses = cache.stats
+        self.assertEqual(misses, 1)
+
+        # nothing changed, the framebuffer is drawn again
+        r(wid, 2)
+        self.assertEqual(cache.stats[1], misses)
+        self.assertTrue(cache.stats[0] > hits)
+
+        # a child changed
+        rect.pos = (50, 50)
+        r(wid)
+        self.assertEqual(cache.stats[1], misses + 1)
+
+        # the color inherited by the children changed
+        color.rgb = (0, 1, 0)
+        r(wid)
+        self.assertEqual(cache.stats[1], misses + 2)
+
+        # a child changed while the cache was drawn, it's drawn again on the
+        # next frame
+        moves = []
+
+        def move(instr):
+            if not moves:
+                moves.append(instr)
+                rect.pos = (100, 50)
+        with cache:
+            Callback(move)
+        r(wid, 3)
+        self.assertEqual(cache.stats[1], misses + 4)
+
+        cache.invalidate()
+        r(wid)
+        self.assertEqual(cache.stats[1], misses + 5)
+
+    def test_label_glyph_atlas(self):
+        from kivy.uix.label import Label
+        r = self.render
+
+        label = Label(text='Hello world', glyph_atlas=True, pos=(100, 100))
+        label.texture_update()
+        self.assertEqual(label.texture, None)
+        self.assertNotEqual(label.texture_size, [0, 0])
+        r(label)
+
+        label.text = 'World hello'
+        label.texture_update()
+        r(label)
+
+    def test_label_async_render(self):
+        from time import time, sleep
+        from kivy.clock import Clock
+        from kivy.uix.label import Label
+        r = self.render
+
+        label = Label(text='Hello async world', async_render=True,
+                      pos=(100, 100))
+        label.texture_update()
+        self.assertNotEqual(label.texture_size, [0, 0])
+        start = time()
+        while label.texture is None and time() - start < 5:
+            sleep(.01)
+            Clock.tick()
+        self.assertNotEqual(label.texture, None)
+        self.assertEqual(label.texture_size, list(label.texture.size))
+        r(label)
@@ -0,0 +1,68 @@
+'''
+Core label tests
+================
+'''
+
+import unittest
+
+
+class LabelTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # the textures need an OpenGL context
+        from kivy.core.window import Window
+        Window.create_window()
+
+    def test_shared_texture(self):
+        from kivy.core.text import Label
+        first = Label(text='shared texture')
+        first.refresh()
+        second = Label(text='shared texture')
+        second.refresh()
+        self.assertTrue(first.texture is not None)
+        self.assertTrue(second.texture is first.texture)
+        other = Label(text='shared texture', bold=True)
+        other.refresh()
+        self.assertTrue(other.texture is not first.texture)
+
+    def test_change_shared_texture(self):
+        from kivy.core.text import Label
+        first = Label(text='label 1234')
+        first.refresh()
+        second = Label(text='label 1234')
+        second.refresh()
+        texture = second.texture
+
+        # same size, the first label must not draw in the shared texture
+        first.text = 'label 4321'
+        first.refresh()
+        self.assertTrue(first.texture is not texture)
+        self.assertTrue(second.texture is texture)
+        second.refresh()
+        self.assertTrue(second.texture is texture)
+
+    def test_layout_cache(self):
+        from kivy.core.text import Label, LabelBase
+        passes = []
+
+        def render(label):
+            render = label.render
+
+            def spy(real=False):
+                passes.append(real)
+                return render(real)
+            label.render = spy
+
+        label = Label(text='cached layout')
+        render(label)
+        label.refresh()
+        self.assertEqual(passes, [False, True])
+
+        # the layout is taken from the cache, only the texture is rendered
+        del passes[:]
+        LabelBase._textures.clear()
+        label = Label(text='cached layout')
+        render(label)
+        label.refresh()
+        self.assertEqual(passes, [True])
+        self.assertEqual(label.size, Label(text='cached layout').render())
@@ -0,0 +1,52 @@
+'''
+Markup label tests
+==================
+'''
+
+import unittest
+
+PIECES = ('Hello [b]bold[/b] ', '[color=ff0000]red [i]italic',
+          '[/i][/color] plain\n', '[ref=one]a ref[/ref] and ',
+          '[anchor=here]an anchor ', '[size=20]big[/size]\n',
+          '&bl;brackets&br; ', '[ref=two]another\nref[/ref] end\n',
+          'a long line that should be wrapped in the text size ')
+
+
+class MarkupLabelTestCase(unittest.TestCase):
+
+    def rasterize(self, label):
+        sz = label._rasterize()[0]
+        data = label._data
+        return (sz, label.refs, label._anchors,
+                (data.width, data.height, data.data))
+
+    def test_append(self):
+        from kivy.core.text.markup import MarkupLabel
+        for text_size in ((None, None), (200, None)):
+            for halign in ('left', 'center', 'right'):
+                kw = dict(text_size=text_size, halign=halign)
+                label = MarkupLabel(**kw)
+                label._rasterize_only = True
+                reused = []
+                get_rendered_lines = label._get_rendered_lines
+
+                def spy(ah):
+                    count, top = get_rendered_lines(ah)
+                    reused.append(count)
+                    return count, top
+                label._get_rendered_lines = spy
+
+                text = ''
+                for piece in PIECES:
+                    text += piece
+                    label.text = text
+                    result = self.rasterize(label)
+                    self.assertEqual(label._appending, piece is not PIECES[0])
+
+                    fresh = MarkupLabel(text=text, **kw)
+                    fresh._rasterize_only = True
+                    self.assertEqual(result, self.rasterize(fresh))
+                    self.assertFalse(fresh._appending)
+
+                # the pixels of the first lines have been reused
+                self.assertTrue(max(reused) > 0)
@@ -0,0 +1,41 @@
+'''
+CodeInput unit test
+===================
+'''
+
+import unittest
+
+SOURCE = '''def f(x):
+    # [comment] & more
+    return x
+
+s = "[b]&amp;"\tf([0])
+'''
+
+
+class CodeInputTestCase(unittest.TestCase):
+
+    def test_lex_edit(self):
+        from kivy.uix.codeinput import CodeInput
+        ci = CodeInput(text=SOURCE)
+        # open a string in the first paragraph, then close it
+        ci.cursor = ci.get_cursor_from_index(0)
+        ci.insert_text('"""')
+        fresh = CodeInput(text=ci.text)
+        self.assertEqual(ci._paragraphs_tokens, fresh._paragraphs_tokens)
+        ci.cursor = ci.get_cursor_from_index(len(SOURCE) - 5)
+        ci.insert_text('"""')
+        fresh = CodeInput(text=ci.text)
+        self.assertEqual(ci._paragraphs_tokens, fresh._paragraphs_tokens)
+
+    def test_tiles_markup(self):
+        import re
+        from kivy.uix.codeinput import CodeInput
+        ci = CodeInput(text=SOURCE)
+        for row, line in enumerate(ci._lines):
+            tiles = ci._get_line_tiles(row)
+            text = u''.join([tile[2] for tile in tiles])
+            text = re.sub(r'\[.*?\]', '', text)
+            text = text.replace('&bl;', '[').replace('&br;', ']')
+            text = text.replace('&amp;', '&')
+            self.assertEqual(text, line.replace('\t', ' ' * ci.tab_width))
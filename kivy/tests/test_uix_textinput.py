@@ -0,0 +1,129 @@
+'''
+TextInput unit test
+===================
+'''
+
+import unittest
+
+
+class TextDocumentTestCase(unittest.TestCase):
+
+    def test_replace(self):
+        from kivy.uix.textinput import TextDocument
+        doc = TextDocument(['hello', 'world'], [1, 2])
+        self.assertEqual(len(doc), 2)
+        self.assertEqual(doc.text, 'hello\nworld')
+        self.assertEqual(doc.length, 11)
+        self.assertEqual(doc.rows, 3)
+
+        doc.replace(1, 1, ['new', 'lines'])
+        self.assertEqual(doc.text, 'hello\nnew\nlines\nworld')
+        self.assertEqual(doc.rows, 5)
+        doc.replace(0, 3, ['first'])
+        self.assertEqual(doc.paragraphs(), ['first', 'world'])
+        doc.replace(0, len(doc), [])
+        self.assertEqual(doc.text, '')
+        self.assertEqual(doc.length, 0)
+
+    def test_find(self):
+        from kivy.uix.textinput import TextDocument
+        paragraphs = ['paragraph %d' % x for x in xrange(1000)]
+        doc = TextDocument(paragraphs, [x % 3 + 1 for x in xrange(1000)])
+        text = '\n'.join(paragraphs)
+        self.assertEqual(doc.text, text)
+        self.assertEqual(doc.get(500), ('paragraph 500', 3))
+
+        # the newline separating two paragraphs belongs to the first one
+        start = text.index('paragraph 500')
+        rows = sum([x % 3 + 1 for x in xrange(500)])
+        self.assertEqual(doc.find_char(start), (500, start, rows))
+        self.assertEqual(doc.find_char(start + 13), (500, start, rows))
+        self.assertEqual(doc.find_char(start + 14),
+                         (501, start + 14, rows + 3))
+        self.assertEqual(doc.find_row(rows + 2), (500, start, rows))
+        self.assertEqual(doc.find_paragraph(500), (500, start, rows))
+        self.assertEqual(doc.get_text(start - 2, start + 9),
+                         text[start - 2:start + 9])
+
+
+class TextInputUndoTestCase(unittest.TestCase):
+
+    def test_undo_words(self):
+        from kivy.uix.textinput import TextInput
+        ti = TextInput()
+        for char in 'hello world':
+            ti.insert_text(char)
+        self.assertEqual(len(ti._undo), 2)
+        ti.do_undo()
+        self.assertEqual(ti.text, 'hello ')
+        ti.do_backspace()
+        ti.do_backspace()
+        ti.do_undo()
+        self.assertEqual(ti.text, 'hello ')
+        ti.do_redo()
+        self.assertEqual(ti.text, 'hell')
+        ti.do_undo()
+        ti.do_undo()
+        self.assertEqual(ti.text, '')
+        ti.do_redo()
+        self.assertEqual(ti.text, 'hello ')
+
+    def test_undo_limit(self):
+        from kivy.uix.textinput import TextInput
+        ti = TextInput(undo_limit=10)
+        for x in xrange(10):
+            ti.insert_text('word%d ' % x)
+        self.assertEqual(len(ti._undo), 1)
+        ti.do_undo()
+        ti.do_undo()
+        self.assertEqual(ti.text.split(), ['word%d' % x for x in xrange(9)])
+
+
+class TextInputGraphicsTestCase(unittest.TestCase):
+
+    def test_visible_lines(self):
+        from kivy.uix.textinput import TextInput
+        ti = TextInput(size=(200, 100))
+        ti.text = '\n'.join(['line %d' % x for x in xrange(100)])
+        dy = ti.line_height + ti._line_spacing
+        ti.scroll_y = 50 * dy
+        ti._update_graphics()
+        rows = sorted(ti._lines_labels)
+        visible = int((ti.height - ti.padding_y * 2) / dy) + 1
+        self.assertTrue(50 in rows)
+        self.assertTrue(len(rows) <= visible + 2)
+        self.assertEqual(rows, range(rows[0], rows[-1] + 1))
+        self.assertTrue(rows[0] >= 49 and rows[-1] <= 50 + visible)
+
+    def test_long_line_tiles(self):
+        from kivy.uix.textinput import TextInput, _TILE_WIDTH
+        ti = TextInput(multiline=False)
+        ti.text = 'a long line ' * 1000
+        width = ti._get_text_width(ti._lines[0])
+        tiles = ti._get_line_tiles(0)
+        self.assertTrue(width > _TILE_WIDTH)
+        self.assertTrue(len(tiles) > 1)
+        x = 0
+        for tile in tiles:
+            self.assertEqual(tile[0], x)
+            self.assertTrue(tile[1] <= _TILE_WIDTH)
+            x += tile[1]
+        self.assertEqual(x, width)
+        self.assertEqual(''.join([tile[2] for tile in tiles]), ti._lines[0])
+
+    def test_resize_wrap(self):
+        from kivy.uix.textinput import TextInput
+        text = '\n'.join([' '.join(['word%d' % x] * (x % 20 + 1))
+                          for x in xrange(200)])
+        ti = TextInput(size=(400, 300))
+        ti.text = text
+        ti.size = (200, 300)
+        ti._refresh_text(ti.text)
+        # the paragraphs are wrapped again when they are displayed
+        dy = ti.line_height + ti._line_spacing
+        while ti.scroll_y < len(ti._lines) * dy:
+            ti._update_graphics()
+            ti.scroll_y += ti.height
+        fresh = TextInput(size=(200, 300))
+        fresh.text = text
+        self.assertEqual(ti._lines, fresh._lines)
@@ -64,3 +64,76 @@ class WidgetTestCase(unittest.TestCase):
         self.assertEqual(wid.collide_point(100, 100), True)
         self.assertEqual(wid.collide_point(200, 0), False)
         self.assertEqual(wid.collide_point(500, 500), False)
+
+    def test_to_window(self):
+        from kivy.uix.scatter import Scatter
+        from kivy.graphics.transformation import Matrix
+        scatter = Scatter()
+        scatter.apply_transform(Matrix().scale(2, 2, 2))
+        scatter.apply_transform(Matrix().translate(10, 20, 0))
+        self.root.add_widget(scatter)
+        c1 = self.cls()
+        scatter.add_widget(c1)
+        self.assertEqual(c1.to_window(5, 5), (20, 30))
+        self.assertEqual(c1.to_widget(20, 30), (5, 5))
+        self.assertEqual(c1.to_window_points([5, 5, 0, 0]), [20, 30, 10, 20])
+        self.assertEqual(c1.to_widget_points([20, 30, 10, 20]), [5, 5, 0, 0])
+
+        # the cached matrices must follow the changes
+        scatter.apply_transform(Matrix().translate(10, 0, 0))
+        self.assertEqual(c1.to_window(5, 5), (30, 30))
+        self.assertEqual(c1.to_widget(30, 30), (5, 5))
+        scatter.remove_widget(c1)
+        self.assertEqual(c1.to_window(5, 5), (5, 5))
+        self.assertEqual(c1.to_widget(5, 5), (5, 5))
+
+    def test_to_window_nested(self):
+        from kivy.uix.scatter import Scatter
+        from kivy.graphics.transformation import Matrix
+        outer = Scatter()
+        outer.apply_transform(Matrix().scale(2, 2, 2))
+        outer.apply_transform(Matrix().translate(10, 20, 0))
+        inner = Scatter()
+        inner.apply_transform(Matrix().rotate(1, 0, 0, 1))
+        self.root.add_widget(outer)
+        outer.add_widget(inner)
+        c1 = self.cls()
+        inner.add_widget(c1)
+
+        def to_window(x, y):
+            # same as to_window(), without the cached matrix
+            widget = c1
+            while widget is not None:
+                x, y = widget.to_parent(x, y)
+                widget = widget.parent
+            return x, y
+
+        for x in xrange(2):
+            wx, wy = to_window(3, 4)
+            x, y = c1.to_window(3, 4)
+            self.assertAlmostEqual(x, wx, 3)
+            self.assertAlmostEqual(y, wy, 3)
+            x, y = c1.to_widget(wx, wy)
+            self.assertAlmostEqual(x, 3, 3)
+            self.assertAlmostEqual(y, 4, 3)
+            # move the outer scatter, the cached matrices must follow
+            outer.apply_transform(Matrix().translate(40, -30, 0))
+            outer.apply_transform(Matrix().rotate(.5, 0, 0, 1))
+
+    def test_to_window_custom_to_parent(self):
+        class Offset(self.cls):
+
+            def to_parent(self, x, y, **k):
+                return (x + 100, y)
+
+            def to_local(self, x, y, **k):
+                return (x - 100, y)
+
+        offset = Offset()
+        self.root.add_widget(offset)
+        c1 = self.cls()
+        offset.add_widget(c1)
+        self.assertEqual(c1.get_window_matrix(), None)
+        self.assertEqual(c1.to_window(5, 5), (105, 5))
+        self.assertEqual(c1.to_widget(105, 5), (5, 5))
+        self.assertEqual(c1.to_window_points([5, 5]), [105, 5])
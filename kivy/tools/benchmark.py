@@ -11,11 +11,14 @@ import sys
 import kivy
 import gc
 from time import clock, time, ctime
-from random import randint
+from random import randint, random
+from array import array
 
 from kivy.uix.label import Label
+from kivy.core.text import Label as CoreLabel
+from kivy.core.text.markup import MarkupLabel as CoreMarkupLabel
 from kivy.uix.widget import Widget
-from kivy.graphics import RenderContext
+from kivy.graphics import RenderContext, Line, InstancedMesh
 from kivy.input.motionevent import MotionEvent
 from kivy.cache import Cache
 from kivy.clock import Clock
@@ -114,6 +117,163 @@ class bench_label_creation_with_tick:
         Clock.tick()
 
 
+class bench_label_text_update:
+    '''Core: label text update (1000 * 10 digits)'''
+
+    glyph_atlas = False
+
+    def __init__(self):
+        self.label = CoreLabel(glyph_atlas=self.glyph_atlas)
+        self.texts = [str(randint(10 ** 9, 10 ** 10 - 1)) for x in xrange(1000)]
+
+    def run(self):
+        label = self.label
+        for text in self.texts:
+            label.text = text
+            label.refresh()
+
+
+class bench_label_text_update_glyph_atlas(bench_label_text_update):
+    '''Core: label text update with glyph atlas (1000 * 10 digits)'''
+
+    glyph_atlas = True
+
+
+class bench_label_identical:
+    '''Core: identical labels rendering (1000 * 10 labels of 10 a-z)'''
+
+    def __init__(self):
+        self.texts = [''.join([chr(randint(ord('a'), ord('z')))
+                      for x in xrange(10)]) for y in xrange(10)] * 1000
+
+    def run(self):
+        o = []
+        for text in self.texts:
+            label = CoreLabel(text=text)
+            label.refresh()
+            o.append(label)
+
+
+class bench_markup_label_append:
+    '''Core: markup label with appended lines (200 * 1 line)'''
+
+    def __init__(self):
+        self.lines = ['[b]user%d[/b]: [color=ff3333]message[/color] %d\n' %
+                      (x % 10, x) for x in xrange(200)]
+
+    def run(self):
+        label = CoreMarkupLabel(text_size=(400, None))
+        text = ''
+        for line in self.lines:
+            text += line
+            label.text = text
+            label.refresh()
+
+
+class bench_line_points_list:
+    '''Graphics: Line update from list (2 * 50000 points)'''
+
+    def __init__(self):
+        self.ctx = RenderContext()
+        self.lines = [Line() for x in xrange(2)]
+        for line in self.lines:
+            self.ctx.add(line)
+        self.points = [random() * 1000 for x in xrange(100000)]
+
+    def run(self):
+        for line in self.lines:
+            line.points = self.points
+        self.ctx.draw()
+
+
+class bench_line_points_array:
+    '''Graphics: Line update from array (2 * 50000 points)'''
+
+    def __init__(self):
+        self.ctx = RenderContext()
+        self.lines = [Line() for x in xrange(2)]
+        for line in self.lines:
+            self.ctx.add(line)
+        self.points = array('f', [random() * 1000 for x in xrange(100000)])
+
+    def run(self):
+        for line in self.lines:
+            line.points = self.points
+        self.ctx.draw()
+
+
+class bench_line_add_points:
+    '''Graphics: Line add_points (2 * 50 * 1000 points)'''
+
+    def __init__(self):
+        self.ctx = RenderContext()
+        self.lines = [Line(points=[0, 0, 1, 1]) for x in xrange(2)]
+        for line in self.lines:
+            self.ctx.add(line)
+        self.ctx.draw()
+        self.chunk = array('f', [random() * 1000 for x in xrange(2000)])
+
+    def run(self):
+        for x in xrange(50):
+            for line in self.lines:
+                line.add_points(self.chunk)
+            self.ctx.draw()
+
+
+class bench_line_wide_points:
+    '''Graphics: wide Line update (2 * 4000 points)'''
+
+    def __init__(self):
+        self.ctx = RenderContext()
+        self.lines = [Line(width=4, joint='bevel') for x in xrange(2)]
+        for line in self.lines:
+            self.ctx.add(line)
+        self.points = array('f', [random() * 1000 for x in xrange(8000)])
+
+    def run(self):
+        for line in self.lines:
+            line.points = self.points
+        self.ctx.draw()
+
+
+class bench_line_wide_add_points:
+    '''Graphics: wide Line add_points (2 * 40 * 100 points)'''
+
+    def __init__(self):
+        self.ctx = RenderContext()
+        self.lines = [Line(points=[0, 0, 1, 1], width=4, joint='bevel')
+                      for x in xrange(2)]
+        for line in self.lines:
+            self.ctx.add(line)
+        self.ctx.draw()
+        self.chunk = array('f', [random() * 1000 for x in xrange(200)])
+
+    def run(self):
+        for x in xrange(40):
+            for line in self.lines:
+                line.add_points(self.chunk)
+            self.ctx.draw()
+
+
+class bench_instanced_mesh_update:
+    '''Graphics: InstancedMesh update_instances (10000 instances)'''
+
+    def __init__(self):
+        self.ctx = RenderContext()
+        self.instances = array('f')
+        for x in xrange(10000):
+            self.instances.extend((random() * 1000, random() * 1000, 16,
+                                   random() * 360, 0, 0, 1, 1))
+        self.mesh = InstancedMesh(instances=self.instances)
+        self.ctx.add(self.mesh)
+        self.ctx.draw()
+
+    def run(self):
+        for x in xrange(10):
+            self.mesh.update_instances(0, self.instances)
+            self.ctx.draw()
+
+
 if __name__ == '__main__':
 
     report = []
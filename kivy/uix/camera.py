@@ -90,6 +90,8 @@ class Camera(Image):
         self._on_index()
 
     def on_tex(self, *l):
+        # the camera can use a new texture for each frame
+        self.texture = self._camera.texture
         self.canvas.ask_update()
 
     def _on_index(self, *largs):
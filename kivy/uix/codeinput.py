@@ -0,0 +1,341 @@
+'''
+Code Input
+==========
+
+.. versionadded:: 1.3.0
+
+The :class:`CodeInput` provides a box of editable highlighted text, like the
+ones used in code editors. It's a :class:`~kivy.uix.textinput.TextInput`,
+colorized by a `pygments <http://pygments.org>`_ lexer::
+
+    from kivy.uix.codeinput import CodeInput
+    from pygments.lexers import CythonLexer
+
+    codeinput = CodeInput(lexer=CythonLexer())
+
+The text is lexed paragraph by paragraph, and the state of the lexer at the
+end of each paragraph is kept. When the text is changed, only the paragraphs
+changed are lexed again, and then the next ones until the state of the lexer
+is the same as before: editing a long file stays fast. The highlighted lines
+are rendered in textures cached like the :class:`TextInput` ones.
+
+Only the colors of the pygments style are used. The bold or italic text would
+not have the width used for the cursor and the selection.
+
+.. note::
+
+    This widget requires pygments. The lexers based on
+    :class:`pygments.lexer.RegexLexer` are lexed incrementally, the others are
+    lexed without keeping a state between the paragraphs.
+'''
+
+__all__ = ('CodeInput', )
+
+from hashlib import md5
+from pygments.lexer import RegexLexer
+from pygments.lexers import PythonLexer
+from pygments.styles import get_style_by_name
+from pygments.token import Text, Error, _TokenType
+from kivy.cache import Cache
+from kivy.core.text.markup import MarkupLabel
+from kivy.properties import ObjectProperty, StringProperty, ListProperty
+from kivy.uix.textinput import TextInput
+from kivy.utils import escape_markup
+
+# the markup of the lines is rendered differently than the same text in a
+# TextInput, keep their textures apart.
+Cache.register('codeinput.label', timeout=60., limit=500)
+
+
+def _get_tokens(lexer, text, stack):
+    # Same as RegexLexer.get_tokens_unprocessed(), starting with the states in
+    # stack. Return the list of (text, token type), and the states at the end.
+    tokens = []
+    pos = 0
+    tokendefs = lexer._tokens
+    statestack = list(stack)
+    statetokens = tokendefs[statestack[-1]]
+    while 1:
+        for rexmatch, action, new_state in statetokens:
+            m = rexmatch(text, pos)
+            if m:
+                if action is not None:
+                    if type(action) is _TokenType:
+                        tokens.append((m.group(), action))
+                    else:
+                        tokens.extend([(value, ttype) for index, ttype, value
+                                       in action(lexer, m)])
+                pos = m.end()
+                if new_state is not None:
+                    # state transition
+                    if isinstance(new_state, tuple):
+                        for state in new_state:
+                            if state == '#pop':
+                                if len(statestack) > 1:
+                                    statestack.pop()
+                            elif state == '#push':
+                                statestack.append(statestack[-1])
+                            else:
+                                statestack.append(state)
+                    elif isinstance(new_state, int):
+                        if abs(new_state) >= len(statestack):
+                            del statestack[1:]
+                        else:
+                            del statestack[new_state:]
+                    elif new_state == '#push':
+                        statestack.append(statestack[-1])
+                    statetokens = tokendefs[statestack[-1]]
+                break
+        else:
+            if pos >= len(text):
+                break
+            if text[pos] == '\n':
+                # at the end of a line, go back to the root state
+                statestack = ['root']
+                statetokens = tokendefs['root']
+                tokens.append((u'\n', Text))
+            else:
+                tokens.append((text[pos], Error))
+            pos += 1
+    return tokens, tuple(statestack)
+
+
+class _CodeLabel(MarkupLabel):
+    # MarkupLabel puts each part of a line after the width of the previous
+    # parts, which is not the width of the text before it measured by the
+    # TextInput for the cursor and the selection: put it at this width.
+    def _pre_render(self):
+        w, h = super(_CodeLabel, self)._pre_render()
+        get_extents = self.get_extents
+        for line in self._lines:
+            text = u''
+            x = 0
+            parts = []
+            for pw, ph, part, options in line[2]:
+                text += part
+                right = get_extents(text)[0]
+                parts.append((right - x, ph, part, options))
+                x = right
+            line[0] = x
+            line[2] = parts
+        uw = self.text_size[0]
+        if self._lines and (uw is None or uw < 0):
+            w = max([line[0] for line in self._lines])
+        return w, h
+
+
+class CodeInput(TextInput):
+    '''CodeInput class, see module documentation for more information.
+    '''
+
+    lexer = ObjectProperty(None, allownone=True)
+    '''Pygments lexer used to highlight the text. If None, the text is not
+    highlighted. A `PythonLexer` is used if no lexer is given to the
+    constructor.
+
+    :data:`lexer` is a :class:`~kivy.properties.ObjectProperty`, default to
+    None.
+    '''
+
+    style_name = StringProperty('default')
+    '''Name of the pygments style used for the colors.
+
+    :data:`style_name` is a :class:`~kivy.properties.StringProperty`, default
+    to 'default'.
+    '''
+
+    text_color = StringProperty('000000')
+    '''Color of the text that have no color in the style, in the `rrggbb`
+    format.
+
+    :data:`text_color` is a :class:`~kivy.properties.StringProperty`, default
+    to '000000'.
+    '''
+
+    foreground_color = ListProperty([1, 1, 1, 1])
+    '''Color multiplied with the colors of the text, in (r, g, b, a) format.
+    Since the colors come from the style, the default is white.
+
+    :data:`foreground_color` is a :class:`~kivy.properties.ListProperty`,
+    default to [1, 1, 1, 1].
+    '''
+
+    def __init__(self, **kwargs):
+        # lexer output for each paragraph, as (tokens, state at the end)
+        self._paragraphs_tokens = []
+        self._styles = None
+        if 'lexer' not in kwargs:
+            kwargs['lexer'] = PythonLexer()
+        super(CodeInput, self).__init__(**kwargs)
+
+    def on_lexer(self, instance, value):
+        self._paragraphs_tokens = [None] * len(self._document)
+        self._lex_paragraphs(0, len(self._document))
+        self._lines_labels = {}
+        self._trigger_update_graphics()
+
+    def on_style_name(self, instance, value):
+        self._styles = None
+        self._lines_labels = {}
+        self._trigger_update_graphics()
+
+    def on_text_color(self, instance, value):
+        self.on_style_name(instance, value)
+
+    def _set_paragraphs(self, start, end, row_start, row_end, paragraphs):
+        super(CodeInput, self)._set_paragraphs(start, end, row_start, row_end,
+                                               paragraphs)
+        self._paragraphs_tokens[start:end] = [None] * len(paragraphs)
+        self._lex_paragraphs(start, start + len(paragraphs))
+
+    def _lex_paragraphs(self, start, end):
+        # Lex the paragraphs from start to end, then the next ones until the
+        # state of the lexer at the end of a paragraph is the same as before.
+        # The labels of the paragraphs highlighted differently are released.
+        paragraphs_tokens = self._paragraphs_tokens
+        if self.lexer is None:
+            return
+        document = self._document
+        labels = self._lines_labels
+        state = None
+        if start:
+            state = paragraphs_tokens[start - 1][1]
+        index = start
+        row = None
+        while index < len(paragraphs_tokens):
+            old = paragraphs_tokens[index]
+            text, rows = document.get(index)
+            paragraphs_tokens[index] = tokens, state = self._lex(text, state)
+            if index >= end and (old is None or tokens != old[0]):
+                if row is None:
+                    row = document.find_paragraph(index)[2]
+                for x in xrange(row, row + rows):
+                    labels.pop(x, None)
+            if row is not None:
+                row += rows
+            index += 1
+            if index >= end and old is not None and old[1] == state:
+                break
+
+    def _lex(self, text, state):
+        # Lex a paragraph, from the state of the lexer at the end of the
+        # previous one. Return its (tokens, state at the end).
+        lexer = self.lexer
+        # the newline ending the paragraph is needed by most of the lexers
+        text += u'\n'
+        if type(lexer).get_tokens_unprocessed.im_func is \
+                RegexLexer.get_tokens_unprocessed.im_func:
+            tokens, state = _get_tokens(lexer, text, state or ('root', ))
+        else:
+            tokens = [(value, ttype) for index, ttype, value in
+                      lexer.get_tokens_unprocessed(text)]
+            state = None
+        # remove the newline
+        while tokens and not tokens[-1][0]:
+            tokens.pop()
+        if tokens:
+            value, ttype = tokens.pop()
+            if len(value) > 1:
+                tokens.append((value[:-1], ttype))
+        return tokens, state
+
+    def _get_style(self, ttype):
+        # Return the markup (start, end) for a token type
+        styles = self._styles
+        if styles is None:
+            styles = self._styles = {}
+            for style_ttype, ndef in get_style_by_name(self.style_name):
+                if ndef['color']:
+                    styles[style_ttype] = ndef['color']
+        if ttype not in styles:
+            parent = ttype
+            while parent is not None and parent not in styles:
+                parent = parent.parent
+            styles[ttype] = styles.get(parent)
+        color = styles[ttype] or self.text_color
+        return '[color=#%s]' % color, '[/color]'
+
+    def _get_line_tiles(self, row):
+        # The text of the tiles is replaced with the markup of their tokens
+        tiles = super(CodeInput, self)._get_line_tiles(row)
+        if not tiles:
+            return tiles
+
+        # get the tokens of the row, the paragraph text is split in rows
+        index, char, first_row = self._document.find_row(row)
+        lines = self._lines
+        start = sum([len(x) for x in lines[first_row:row]])
+        end = start + len(lines[row])
+        tokens = self._paragraphs_tokens[index]
+        if tokens is None or self.password:
+            tokens = []
+        else:
+            tokens = tokens[0]
+
+        # length of the tokens in the tiles text, where tabs are replaced
+        tab_width = self.tab_width
+        parts = []
+        pos = 0
+        for value, ttype in tokens:
+            vstart = pos
+            pos += len(value)
+            if pos <= start:
+                continue
+            if vstart >= end:
+                break
+            value = value[max(0, start - vstart):end - vstart]
+            parts.append((len(value) + value.count('\t') * (tab_width - 1),
+                          ttype))
+
+        parts.reverse()
+        for tile in tiles:
+            text = tile[2]
+            # the consecutive tokens with the same style are merged
+            styled = []
+            pos = 0
+            while pos < len(text):
+                if parts:
+                    length, ttype = parts.pop()
+                else:
+                    length, ttype = len(text), Text
+                if pos + length > len(text):
+                    parts.append((pos + length - len(text), ttype))
+                style = self._get_style(ttype)
+                if styled and styled[-1][0] == style:
+                    styled[-1][1] += length
+                else:
+                    styled.append([style, length])
+                pos += length
+            markup = []
+            pos = 0
+            for (style_start, style_end), length in styled:
+                markup.append(style_start +
+                              escape_markup(text[pos:pos + length]) +
+                              style_end)
+                pos += length
+            tile[2] = u''.join(markup)
+        return tiles
+
+    def _create_line_label(self, text):
+        # Create a label from a markup text, using line options
+        kw = self._get_line_options()
+        if isinstance(text, unicode):
+            cid = md5(text.encode('utf-8'))
+        else:
+            cid = md5(text)
+        cid.update(self._line_options_key)
+        cid = cid.digest()
+        texture = Cache.get('codeinput.label', cid)
+
+        if not texture:
+            label = _CodeLabel(text=text, **kw)
+            label.refresh()
+            texture = label.texture
+            Cache.append('codeinput.label', cid, texture)
+        return texture
+
+
+if __name__ == '__main__':
+    from kivy.base import runTouchApp
+    import sys
+    runTouchApp(CodeInput(text=open(sys.argv[1]).read()))
@@ -99,6 +99,8 @@ from kivy.clock import Clock
 from kivy.uix.widget import Widget
 from kivy.core.text import Label as CoreLabel
 from kivy.core.text.markup import MarkupLabel as CoreMarkupLabel
+from kivy.graphics import InstructionGroup, Mesh, PushMatrix, PopMatrix, \
+        Translate
 from kivy.properties import StringProperty, OptionProperty, \
         NumericProperty, BooleanProperty, ReferenceListProperty, \
         ListProperty, ObjectProperty, DictProperty
@@ -115,10 +117,12 @@ class Label(Widget):
 
     _font_properties = ('text', 'font_size', 'font_name', 'bold', 'italic',
         'halign', 'valign', 'padding_x', 'padding_y', 'text_size', 'shorten',
-        'mipmap', 'markup')
+        'mipmap', 'markup', 'glyph_atlas')
 
     def __init__(self, **kwargs):
         self._trigger_texture = Clock.create_trigger(self.texture_update, -1)
+        self._glyph_group = None
+        self._glyph_meshes = []
         self.register_event_type('on_ref_press')
         super(Label, self).__init__(**kwargs)
 
@@ -147,6 +151,8 @@ class Label(Widget):
             # markup have change, we need to change our rendering method.
             d = Label._font_properties
             dkw = dict(zip(d, [getattr(self, x) for x in d]))
+            # small texts are put in a shared texture atlas
+            dkw['atlas'] = True
             if markup:
                 self._label = CoreMarkupLabel(**dkw)
             else:
@@ -173,16 +179,74 @@ class Label(Widget):
         '''
         self.texture = None
         if self._label.text.strip() == '':
+            self._update_glyphs(None)
             self.texture_size = (0, 0)
+        elif self.async_render:
+            size = self._label.refresh_async(self._label_update)
+            if size is not None:
+                # placeholder, until the texture is created
+                self._update_glyphs(None)
+                self.texture_size = list(size)
         else:
             self._label.refresh()
-            if self._label.__class__ is CoreMarkupLabel:
-                self.refs = self._label.refs
-                self.anchors = self._label.anchors
-            texture = self._label.texture
-            if texture is not None:
-                self.texture = self._label.texture
-                self.texture_size = list(self.texture.size)
+            self._label_update(self._label)
+
+    def _label_update(self, label):
+        # the core label have been rendered, use its texture or glyphs
+        if label is not self._label:
+            return
+        if label.__class__ is CoreMarkupLabel:
+            self.refs = label.refs
+            self.anchors = label.anchors
+        glyphs = label.glyphs
+        self._update_glyphs(glyphs)
+        if glyphs is not None:
+            self.texture_size = list(label.glyphs_size)
+            return
+        texture = label.texture
+        if texture is not None:
+            self.texture = texture
+            self.texture_size = list(texture.size)
+
+    def _update_glyphs(self, glyphs):
+        # draw the glyphs of the core label, with one mesh per page of the
+        # glyph atlas. The meshes are reused when the text changes.
+        meshes = self._glyph_meshes
+        if not glyphs and not meshes:
+            return
+        if self._glyph_group is None:
+            self._glyph_translate = Translate()
+            self._glyph_group = InstructionGroup()
+            group = InstructionGroup()
+            group.add(PushMatrix())
+            group.add(self._glyph_translate)
+            group.add(self._glyph_group)
+            group.add(PopMatrix())
+            self.canvas.add(group)
+            self.bind(pos=self._update_glyphs_pos,
+                      size=self._update_glyphs_pos,
+                      texture_size=self._update_glyphs_pos)
+
+        glyphs = glyphs or []
+        for i, (texture, vertices, indices) in enumerate(glyphs):
+            if i < len(meshes):
+                mesh = meshes[i]
+                mesh.texture = texture
+                mesh.vertices = vertices
+                mesh.indices = indices
+            else:
+                mesh = Mesh(texture=texture, vertices=vertices,
+                            indices=indices, mode='triangles')
+                meshes.append(mesh)
+                self._glyph_group.add(mesh)
+        for mesh in meshes[len(glyphs):]:
+            self._glyph_group.remove(mesh)
+        del meshes[len(glyphs):]
+
+    def _update_glyphs_pos(self, *largs):
+        w, h = self.texture_size
+        self._glyph_translate.xy = (int(self.center_x - w / 2.),
+                                    int(self.center_y - h / 2.))
 
     def on_touch_down(self, touch):
         if super(Label, self).on_touch_down(touch):
@@ -394,6 +458,38 @@ class Label(Widget):
     False.
     '''
 
+    glyph_atlas = BooleanProperty(False)
+    '''Draw the text with quads taken from a shared atlas of glyphs, instead
+    of rendering it in a texture. Each glyph is rasterized only once per font,
+    size and style, so changing the text is much faster: use it for labels
+    that change often, like counters or clocks. The :data:`texture` is None
+    when the glyphs are used.
+
+    This is not used for markup text, or when a glyph is too big for the
+    atlas: the texture is rendered instead. The glyphs are placed one by one,
+    so the kerning of the font is not applied.
+
+    .. versionadded:: 1.3.0
+
+    :data:`glyph_atlas` is a :class:`~kivy.properties.BooleanProperty`,
+    default to False.
+    '''
+
+    async_render = BooleanProperty(False)
+    '''Render the text in a worker thread, instead of blocking the main
+    thread. Only the texture is created on the main thread, a few per frame
+    (check :class:`~kivy.core.text.LabelRenderer`). Until then, the
+    :data:`texture` is None and the :data:`texture_size` is the size expected,
+    estimated from the font size if the same text have never been rendered.
+
+    Use it for creating many labels at once, like for filling a screen.
+
+    .. versionadded:: 1.3.0
+
+    :data:`async_render` is a :class:`~kivy.properties.BooleanProperty`,
+    default to False.
+    '''
+
     markup = BooleanProperty(False)
     '''
     .. versionadded:: 1.1.0
@@ -318,6 +318,7 @@ class Scatter(Widget):
 
     def on_transform(self, instance, value):
         self.transform_inv = value.inverse()
+        self.invalidate_window_matrix()
 
     def collide_point(self, x, y):
         x, y = self.to_local(x, y)
@@ -331,6 +332,9 @@ class Scatter(Widget):
         p = self.transform_inv.transform_point(x, y, 0)
         return (p[0], p[1])
 
+    def get_local_matrix(self):
+        return self.transform
+
     def apply_transform(self, trans, post_multiply=False, anchor=(0, 0)):
         '''
         Transforms scatter by trans (on top of its current transformation state)
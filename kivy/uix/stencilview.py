@@ -7,12 +7,18 @@ Stencil View
 :class:`StencilView` limits the drawing of child widgets to the StencilView's
 bounding box. Any drawing outside the bounding box will be clipped (trashed).
 
-The StencilView uses the stencil graphics instructions under the hood. It
-provides an efficient way to clip the drawing area of children.
+The StencilView uses the
+:class:`~kivy.graphics.stencil_instructions.ScissorPush` graphics instruction
+under the hood. It provides an efficient way to clip the drawing area of
+children: as long as the StencilView is not rotated, the clipping is done with
+the OpenGL scissor test, and the stencil buffer is used only otherwise.
+
+.. versionchanged:: 1.3.0
+    The scissor test is used when possible.
 
 .. note::
 
-    As with the stencil graphics instructions, you cannot stack more than 8
+    When the stencil buffer is used, you cannot stack more than 128
     stencil-aware widgets.
 
 '''
@@ -105,7 +105,9 @@ __all__ = ('TextInput', )
 
 import sys
 
+from collections import deque
 from functools import partial
+from hashlib import md5
 from kivy.logger import Logger
 from kivy.utils import boundary
 from kivy.utils import platform
@@ -114,19 +116,263 @@ from kivy.cache import Cache
 from kivy.core.text import Label
 from kivy.uix.widget import Widget
 from kivy.uix.bubble import Bubble
-from kivy.graphics import Color, Rectangle
+from kivy.graphics import Color, Rectangle, InstructionGroup
 from kivy.properties import StringProperty, NumericProperty, \
         ReferenceListProperty, BooleanProperty, AliasProperty, \
         ListProperty, ObjectProperty
 
-Cache.register('textinput.label', timeout=60.)
+# only the lines inside the viewport keep their textures, the cache is bounded
+# to release the textures of the lines scrolled away.
+Cache.register('textinput.label', timeout=60., limit=500)
 
 FL_IS_NEWLINE = 0x01
+FL_NEED_WRAP = 0x02
+
+# maximum number of text widths cached, and length of the texts cached
+_WIDTH_CACHE_SIZE = 10000
+_WIDTH_CACHE_LENGTH = 64
+
+# width of the tiles used to render the long lines, small enough to fit in a
+# texture on every GL implementation.
+_TILE_WIDTH = 2048
 
 # late binding
 Clipboard = None
 
 
+def _text_size(text):
+    # size of a text in bytes, used to bound the undo history
+    if isinstance(text, unicode):
+        return len(text.encode('utf-8'))
+    return len(text)
+
+
+# maximum number of entries in a node of the paragraphs tree
+_NODE_SIZE = 64
+
+
+class _TextNode(object):
+    # Node of the TextDocument tree. The leaves contain the paragraphs, as
+    # [text, rows] lists, and the other nodes contain nodes. The number of
+    # paragraphs, chars and rows of a node are kept for searching.
+
+    __slots__ = ('leaf', 'nodes', 'count', 'chars', 'rows')
+
+    def __init__(self, leaf, nodes):
+        self.leaf = leaf
+        self.nodes = nodes
+        self.update()
+
+    def update(self):
+        nodes = self.nodes
+        if self.leaf:
+            self.count = len(nodes)
+            self.chars = sum([len(item[0]) for item in nodes]) + len(nodes)
+            self.rows = sum([item[1] for item in nodes])
+        else:
+            self.count = sum([node.count for node in nodes])
+            self.chars = sum([node.chars for node in nodes])
+            self.rows = sum([node.rows for node in nodes])
+
+
+def _split_nodes(leaf, nodes):
+    # group the nodes in nodes of _NODE_SIZE entries at most
+    count = (len(nodes) + _NODE_SIZE - 1) / _NODE_SIZE
+    if count <= 1:
+        return [_TextNode(leaf, nodes)]
+    size = (len(nodes) + count - 1) / count
+    return [_TextNode(leaf, nodes[i:i + size])
+            for i in xrange(0, len(nodes), size)]
+
+
+def _replace_nodes(node, start, end, items):
+    # replace the paragraphs [start, end) of the node with the items, and
+    # return the nodes to put instead of it.
+    if node.leaf:
+        node.nodes[start:end] = items
+        return _split_nodes(True, node.nodes)
+
+    result = []
+    pos = 0
+    for child in node.nodes:
+        cstart = pos
+        pos += child.count
+        if items is not None and cstart <= start <= pos:
+            # first child of the range, the items are inserted here
+            result.extend(_replace_nodes(child, start - cstart,
+                                         min(end, pos) - cstart, items))
+            items = None
+        elif items is None and cstart < end and pos > start:
+            # next children of the range, only remove their paragraphs
+            result.extend(_replace_nodes(child, max(start, cstart) - cstart,
+                                         min(end, pos) - cstart, []))
+        else:
+            result.append(child)
+
+    # merge the small nodes with their neighbours
+    nodes = []
+    for child in result:
+        if not child.count:
+            continue
+        if nodes:
+            last = nodes[-1]
+            if (len(last.nodes) < _NODE_SIZE / 4 or
+                    len(child.nodes) < _NODE_SIZE / 4) and \
+                    len(last.nodes) + len(child.nodes) <= _NODE_SIZE:
+                last.nodes.extend(child.nodes)
+                last.update()
+                continue
+        nodes.append(child)
+    return _split_nodes(False, nodes)
+
+
+class TextDocument(object):
+    '''Text of a :class:`TextInput`, split in paragraphs (the text between
+    two newlines). The paragraphs are stored in a balanced tree, with the
+    number of rows used for displaying each of them: finding a paragraph from
+    a char index or a row, and replacing paragraphs, are done in O(log n).
+
+    .. versionadded:: 1.3.0
+    '''
+
+    def __init__(self, paragraphs=None, rows=None):
+        super(TextDocument, self).__init__()
+        self._root = _TextNode(True, [])
+        self._text = None
+        if paragraphs:
+            self.replace(0, 0, paragraphs, rows)
+
+    def __len__(self):
+        return self._root.count
+
+    @property
+    def length(self):
+        '''Number of chars of the text'''
+        return max(0, self._root.chars - 1)
+
+    @property
+    def rows(self):
+        '''Number of rows of the text'''
+        return self._root.rows
+
+    @property
+    def text(self):
+        '''Text of the document'''
+        if self._text is None:
+            self._text = u'\n'.join(self.paragraphs())
+        return self._text
+
+    def paragraphs(self, start=0, end=None):
+        '''Return the list of the paragraphs from start to end'''
+        if end is None:
+            end = self._root.count
+        result = []
+
+        def collect(node, start, end):
+            if node.leaf:
+                result.extend([item[0] for item in node.nodes[start:end]])
+                return
+            pos = 0
+            for child in node.nodes:
+                cstart = pos
+                pos += child.count
+                if pos > start and cstart < end:
+                    collect(child, max(start, cstart) - cstart,
+                            min(end, pos) - cstart)
+        collect(self._root, start, end)
+        return result
+
+    def get(self, index):
+        '''Return the (text, rows) of a paragraph'''
+        return tuple(self._find(0, index)[3])
+
+    def find_paragraph(self, index):
+        '''Return the (paragraph index, index of its first char, its first
+        row) of the paragraph at `index`.
+        '''
+        return self._find(0, index)[:3]
+
+    def find_char(self, index):
+        '''Return the (paragraph index, index of its first char, its first
+        row) of the paragraph containing the char at `index`. The newline
+        separating two paragraphs belongs to the first one.
+        '''
+        return self._find(1, index)[:3]
+
+    def find_row(self, row):
+        '''Return the (paragraph index, index of its first char, its first
+        row) of the paragraph displayed on the `row`.
+        '''
+        return self._find(2, row)[:3]
+
+    def get_text(self, start, end):
+        '''Return the text between the chars `start` and `end`'''
+        start = max(0, start)
+        end = min(self.length, end)
+        if start >= end:
+            return u''
+        pa, ca = self.find_char(start)[:2]
+        pb, cb = self.find_char(end)[:2]
+        text = u'\n'.join(self.paragraphs(pa, pb + 1))
+        return text[start - ca:end - ca]
+
+    def replace(self, start, end, paragraphs, rows=None):
+        '''Replace the paragraphs from `start` to `end` with new paragraphs,
+        displayed on `rows` rows each (1 by default).
+        '''
+        if rows is None:
+            rows = [1] * len(paragraphs)
+        items = [[text, count] for text, count in zip(paragraphs, rows)]
+        nodes = _replace_nodes(self._root, start, end, items)
+        if len(nodes) == 1:
+            root = nodes[0]
+        else:
+            root = _TextNode(False, nodes)
+        while not root.leaf and len(root.nodes) == 1:
+            root = root.nodes[0]
+        if not root.leaf and not root.nodes:
+            root = _TextNode(True, [])
+        self._root = root
+        self._text = None
+
+    def _find(self, key, value):
+        # search the paragraph by index (0), char (1) or row (2). Return
+        # (paragraph index, chars before, rows before, item)
+        node = self._root
+        index = chars = rows = 0
+        while not node.leaf:
+            for child in node.nodes[:-1]:
+                size = (child.count, child.chars, child.rows)[key]
+                if value < size:
+                    break
+                value -= size
+                index += child.count
+                chars += child.chars
+                rows += child.rows
+            else:
+                child = node.nodes[-1]
+            node = child
+        items = node.nodes
+        if not items:
+            return 0, 0, 0, [u'', 1]
+        for item in items[:-1]:
+            if key == 0:
+                size = 1
+            elif key == 1:
+                size = len(item[0]) + 1
+            else:
+                size = item[1]
+            if value < size:
+                break
+            value -= size
+            index += 1
+            chars += len(item[0]) + 1
+            rows += item[1]
+        else:
+            item = items[-1]
+        return index, chars, rows, item
+
+
 class TextInputCutCopyPaste(Bubble):
     # Internal class used for showing the little bubble popup when
     # copy/cut/paste happen.
@@ -164,12 +410,17 @@ class TextInput(Widget):
         self.selection_from = None
         self.selection_to = None
         self._bubble = None
+        self._document = TextDocument()
         self._lines_flags = []
-        self._lines_labels = []
-        self._lines_rects = []
+        self._lines_labels = {}
+        self._lines_rects = {}
+        self._lines_rects_pool = []
+        self._lines_group = None
         self._line_spacing = 0
         self._label_cached = None
+        self._text_widths = {}
         self._line_options = None
+        self._line_options_key = None
         self._keyboard = None
         self.reset_undo()
         self.interesting_keys = {
@@ -213,23 +464,15 @@ class TextInput(Widget):
     def cursor_index(self):
         '''Return the cursor index in the text/value.
         '''
-        try:
-            l = self._lines
-            if len(l) == 0:
-                return 0
-            lf = self._lines_flags
-            index, cr = self.cursor
-            for row in xrange(cr):
-                if row >= len(l):
-                    continue
-                index += len(l[row])
-                if lf[row] & FL_IS_NEWLINE:
-                    index += 1
-            if lf[cr] & FL_IS_NEWLINE:
-                index += 1
-            return index
-        except IndexError:
+        l = self._lines
+        if len(l) == 0:
             return 0
+        col, row = self.cursor
+        row = min(row, len(l) - 1)
+        index, first_row = self._document.find_row(row)[1:]
+        for line in l[first_row:row]:
+            index += len(line)
+        return index + col
 
     def cursor_offset(self):
         '''Get the cursor x offset on the current line
@@ -243,20 +486,18 @@ class TextInput(Widget):
     def get_cursor_from_index(self, index):
         '''Return the (row, col) of the cursor from text index
         '''
-        index = boundary(index, 0, len(self.text))
+        document = self._document
+        index = boundary(index, 0, document.length)
         if index <= 0:
             return 0, 0
-        lf = self._lines_flags
+        paragraph, start, row = document.find_char(index)
+        index -= start
+        # search the row of the paragraph
         l = self._lines
-        i = 0
-        for row in xrange(len(l)):
-            ni = i + len(l[row])
-            if lf[row] & FL_IS_NEWLINE:
-                ni += 1
-                i += 1
-            if ni >= index:
-                return index - i, row
-            i = ni
+        last_row = row + document.get(paragraph)[1] - 1
+        while row < last_row and index > len(l[row]):
+            index -= len(l[row])
+            row += 1
         return index, row
 
     def insert_text(self, substring, from_undo = False):
@@ -264,43 +505,14 @@ class TextInput(Widget):
         '''
         if self.readonly:
             return
-        cc, cr = self.cursor
-        sci = self.cursor_index
-        ci = sci()
-        text = self._lines[cr]
+        ci = self.cursor_index()
         len_str = len(substring)
-        new_text = text[:cc] + substring + text[cc:]
-        self._set_line_text(cr, new_text)
-        if len_str > 1 or substring == '\n':
-            # Avoid refreshing text on every keystroke.
-            # Allows for faster typing of text when the amount of text in
-            # TextInput gets large.
-            self._trigger_refresh_text()
+        self._replace_text(ci, ci, substring)
         #reset cursor
-        self.cursor = cursor = self.get_cursor_from_index(ci + len_str)
+        self.cursor = self.get_cursor_from_index(ci + len_str)
         #handle undo and redo
-        self._set_unredo_insert(cc, cr, ci, sci, substring, cursor, from_undo)
-
-    def _set_unredo_insert(self, cc, cr, ci, sci, substring, cursor, from_undo):
-        #handle undo and redo
-        if from_undo:
-            return
-        count = substring.count('\n')
-        if substring == '\n':
-            cursor = 0, cursor[1] + 1
-        elif count > 0:
-            cursor = cursor[0], cursor[1] + count
-
-        self._undo.append({'undo_command': \
-            'self.cursor = (%i, %i)\n' %(cursor[0], cursor[1]) +\
-            'self.selection_from = %i\nself.selection_to = %i\n' %(ci, sci())+
-            'self._selection = True\n'+\
-            'self.delete_selection(True)\n',\
-            'redo_command': \
-            'self.cursor = (%i, %i)\nself.insert_text(u\'%s\', True)'\
-            %(cc, cr, substring.replace('\n', '\\n').replace('\'', '\\\''))})
-        #reset redo when undo is appended to
-        self._redo = []
+        if not from_undo:
+            self._add_undo(ci, u'', substring)
 
     def reset_undo(self):
         '''Reset undo and redo lists from memory
@@ -308,7 +520,52 @@ class TextInput(Widget):
         .. versionadded:: 1.3.0
 
         '''
-        self._redo = self._undo = []
+        self._undo = deque()
+        self._redo = []
+        self._undo_size = 0
+
+    def _add_undo(self, index, removed, inserted):
+        # Record that the removed text at index was replaced by the inserted
+        # text. Consecutive typing or backspaces are merged into one entry per
+        # word, and the oldest entries are dropped when the history is bigger
+        # than undo_limit.
+        undo = self._undo
+        last = undo[-1] if undo else None
+        size = _text_size(removed) + _text_size(inserted)
+        merge = len(removed) + len(inserted) == 1
+        if merge and last is not None and last['merge']:
+            if not removed and not last['removed'] \
+                    and last['index'] + len(last['inserted']) == index \
+                    and (inserted.isspace() or
+                         not last['inserted'][-1].isspace()):
+                last['inserted'] += inserted
+                inserted = None
+            elif not inserted and not last['inserted'] \
+                    and index + 1 == last['index'] \
+                    and (not removed.isspace() or
+                         last['removed'][0].isspace()):
+                last['index'] = index
+                last['removed'] = removed + last['removed']
+                inserted = None
+        if inserted is not None:
+            undo.append({'index': index, 'removed': removed,
+                         'inserted': inserted, 'merge': merge})
+        #reset redo when undo is appended to
+        for item in self._redo:
+            size -= _text_size(item['removed']) + _text_size(item['inserted'])
+        self._redo = []
+        self._undo_size += size
+        while self._undo_size > self.undo_limit and len(undo) > 1:
+            item = undo.popleft()
+            self._undo_size -= _text_size(item['removed']) + \
+                               _text_size(item['inserted'])
+
+    def _apply_undo(self, index, removed, inserted):
+        # Replace the removed text at index with the inserted one, and put the
+        # cursor after it.
+        self._replace_text(index, index + len(removed), inserted)
+        self.cancel_selection()
+        self.cursor = self.get_cursor_from_index(index + len(inserted))
 
     def do_redo(self):
         '''Do redo operation
@@ -319,13 +576,13 @@ class TextInput(Widget):
         This function is automaticlly called when `ctrl+r` keys
         are pressed.
         '''
-        try:
-            x_item = self._redo.pop()
-            exec(x_item['redo_command'])
-            self._undo.append(x_item)
-        except IndexError:
-            # reached at top of undo list
-            pass
+        if self.readonly or not self._redo:
+            # reached at top of redo list
+            return
+        x_item = self._redo.pop()
+        self._apply_undo(x_item['index'], x_item['removed'],
+                         x_item['inserted'])
+        self._undo.append(x_item)
 
     def do_undo(self):
         '''Do undo operation
@@ -337,13 +594,13 @@ class TextInput(Widget):
         This function is automatically called when `ctrl+z` keys
         are pressed.
         '''
-        try:
-            x_item = self._undo.pop()
-            exec(x_item['undo_command'])
-            self._redo.append(x_item)
-        except IndexError:
+        if self.readonly or not self._undo:
             # reached at top of undo list
-            pass
+            return
+        x_item = self._undo.pop()
+        self._apply_undo(x_item['index'], x_item['inserted'],
+                         x_item['removed'])
+        self._redo.append(x_item)
 
     def do_backspace(self, from_undo = False):
         '''Do backspace operation from the current cursor position.
@@ -356,44 +613,15 @@ class TextInput(Widget):
         '''
         if self.readonly:
             return
-        cc, cr = self.cursor
-        text = self._lines[cr]
         cursor_index = self.cursor_index()
-        if cc == 0 and cr == 0:
+        if cursor_index == 0:
             return
-        if cc == 0:
-            text_last_line = self._lines[cr - 1]
-            self._set_line_text(cr - 1, text_last_line + text)
-            self._delete_line(cr)
-            substring = '\n'
-        else:
-            #ch = text[cc-1]
-            substring = text[cc-1]
-            new_text = text[:cc-1] + text[cc:]
-            self._set_line_text(cr, new_text)
-
-        # refresh_text seems to be unnecessary here
-        # plus removing it leads to a large improvement in editing text
-        # where large..ish text is involved.
-        #self._refresh_text_from_property()
-        self.cursor = cursor = self.get_cursor_from_index(cursor_index - 1)
+        substring = self._document.get_text(cursor_index - 1, cursor_index)
+        self._replace_text(cursor_index - 1, cursor_index, u'')
+        self.cursor = self.get_cursor_from_index(cursor_index - 1)
         #handle undo and redo
-        self._set_undo_redo_bkspc(cc, cr, cursor, substring, from_undo)
-
-    def _set_undo_redo_bkspc(self, cc, cr, cursor, substring, from_undo):
-        #handle undo and redo for backspace
-        if from_undo:
-            return
-
-        self._undo.append({'undo_command': \
-            'self.cursor = (%i, %i)\n' %(cursor[0], cursor[1]) +\
-            'self.insert_text(u\'%s\', True)'\
-            %(substring.replace('\n', '\\n').replace('\'', '\\\'')),
-            'redo_command': \
-            'self.cursor = (%i, %i)\n' %(cc, cr)+\
-            'self.do_backspace(True)'})
-        #reset redo when undo is appended to
-        self._redo = []
+        if not from_undo:
+            self._add_undo(cursor_index - 1, substring, u'')
 
     def do_cursor_movement(self, action):
         '''Move the cursor relative to it's current position.
@@ -474,42 +702,21 @@ class TextInput(Widget):
             return
         scrl_x = self.scroll_x
         scrl_y = self.scroll_y
-        cc, cr = self.cursor
-        sci = self.cursor_index
-        ci = sci()
         if not self._selection:
             return
-        v = self.text
         a, b = self.selection_from, self.selection_to
         if a > b:
             a, b = b, a
-        text = v[:a] + v[b:]
-        self.text = text
-        text = v[a:b]
-        self.cursor = cursor = self.get_cursor_from_index(a)
+        text = self._document.get_text(a, b)
+        self._replace_text(a, b, u'')
+        self.cursor = self.get_cursor_from_index(a)
         self.scroll_x = scrl_x
         self.scroll_y = scrl_y
         #handle undo and redo
-        self._set_unredo_delsel(cc, cr, a, b, cursor, text, from_undo)
+        if not from_undo:
+            self._add_undo(a, text, u'')
         self.cancel_selection()
 
-    def _set_unredo_delsel(self, cc, cr, ci, sci, cursor, substring, from_undo):
-        #handle undo and redo for backspace
-        if from_undo:
-            return
-
-        self._undo.append({'undo_command': \
-            'self.cursor = (%i, %i)\n' %(cursor[0], cursor[1]) +\
-            'self.insert_text(u\'%s\', True)'\
-            %(substring.replace('\n', '\\n').replace('\'', '\\\'')),
-            'redo_command': \
-            'self.selection_from = %i\nself.selection_to = %i\n' %(ci, sci)+
-            'self._selection = True\n'+\
-            'self.delete_selection(True)\n'+\
-            'self.cursor = (%i, %i)\n' %(cc, cr)})
-        #reset redo when undo is appended to
-        self._redo = []
-
     def _update_selection(self, finished=False):
         '''Update selection text and order of from/to if finished is True.
         Can be called multiple times until finished=True.
@@ -518,7 +725,7 @@ class TextInput(Widget):
         if a > b:
             a, b = b, a
         self._selection_finished = finished
-        self.selection_text = self.text[a:b]
+        self.selection_text = self._document.get_text(a, b)
         if not finished:
             self._selection = True
         else:
@@ -735,13 +942,23 @@ class TextInput(Widget):
         self.focus = False
 
     def _get_text_width(self, text):
-        # Return the width of a text, according to the current line options
+        # Return the width of a text, according to the current line options.
+        # The width of the short texts are cached, since the same words are
+        # measured again and again when wrapping the paragraphs.
         if not self._label_cached:
             self._get_line_options()
         text = text.replace('\t', ' ' * self.tab_width)
-        if not self.password:
+        if self.password:
+            text = '*' * len(text)
+        if len(text) > _WIDTH_CACHE_LENGTH:
             return self._label_cached.get_extents(text)[0]
-        return self._label_cached.get_extents('*' * len(text))[0]
+        widths = self._text_widths
+        width = widths.get(text)
+        if width is None:
+            if len(widths) >= _WIDTH_CACHE_SIZE:
+                widths.clear()
+            width = widths[text] = self._label_cached.get_extents(text)[0]
+        return width
 
     def _do_blink_cursor(self, dt):
         # Callback called by the timer to blink the cursor, according to the
@@ -755,18 +972,71 @@ class TextInput(Widget):
         self._cursor_blink_time = Clock.get_time()
         self._trigger_update_graphics()
 
-    def _delete_line(self, idx):
-        # Delete current line, and fix cursor position
-        assert(idx < len(self._lines))
-        self._lines.pop(idx)
-        self._lines_flags.pop(idx)
-        self._lines_labels.pop(idx)
-        self.cursor = self.cursor
+    def _replace_text(self, start, end, substring):
+        # Replace the text between the start and end indexes. Only the
+        # paragraphs changed are wrapped again.
+        document = self._document
+        pa, ca, ra = document.find_char(start)
+        pb, cb, rb = document.find_char(end)
+        rb += document.get(pb)[1]
+        text = u'\n'.join(document.paragraphs(pa, pb + 1))
+        text = text[:start - ca] + substring + text[end - ca:]
+        self._set_paragraphs(pa, pb + 1, ra, rb, text.split('\n'))
+
+    def _set_paragraphs(self, start, end, row_start, row_end, paragraphs):
+        # Replace the paragraphs between start and end, displayed on the rows
+        # between row_start and row_end, with new paragraphs.
+        lines = []
+        lines_flags = []
+        rows = []
+        wrap = self._wrap_paragraph
+        for index, paragraph in enumerate(paragraphs, start):
+            paragraph_lines = wrap(paragraph)
+            rows.append(len(paragraph_lines))
+            lines.extend(paragraph_lines)
+            lines_flags.append(FL_IS_NEWLINE if index else 0)
+            lines_flags.extend([0] * (len(paragraph_lines) - 1))
+        self._document.replace(start, end, paragraphs, rows)
+
+        # the labels are created only when the lines become visible, keep the
+        # ones of the unchanged lines, and move the one after the change.
+        delta = len(lines) - (row_end - row_start)
+        self._lines_labels = dict([
+            (row if row < row_start else row + delta, tiles)
+            for row, tiles in self._lines_labels.iteritems()
+            if row < row_start or row >= row_end])
+        self._lines_flags[row_start:row_end] = lines_flags
+        # the text is updated when the lines change, do it at last.
+        self._lines[row_start:row_end] = lines
+        self._trigger_update_graphics()
 
-    def _set_line_text(self, line_num, text):
-        # Set current line with other text than the default one.
-        self._lines[line_num] = text
-        self._lines_labels[line_num] = self._create_line_label(text)
+    def _wrap_rows(self, first_row, last_row):
+        # Wrap again the paragraphs displayed between first_row and last_row
+        # that were wrapped with a previous size or options. The rows before
+        # first_row are not changed.
+        flags = self._lines_flags
+        document = self._document
+        cursor_index = None
+        row = first_row
+        while row < min(last_row, len(self._lines)):
+            if not flags[row] & FL_NEED_WRAP:
+                row += 1
+                continue
+            index, char, row = document.find_row(row)
+            text, rows = document.get(index)
+            lines = self._wrap_paragraph(text)
+            if lines == self._lines[row:row + rows]:
+                for x in xrange(row, row + rows):
+                    flags[x] &= ~FL_NEED_WRAP
+            else:
+                if cursor_index is None:
+                    cursor_index = self.cursor_index()
+                self._set_paragraphs(index, index + 1, row, row + rows, [text])
+            row += len(lines)
+        if cursor_index is not None:
+            # keep the cursor at the same index, without scrolling
+            self._cursor = self.get_cursor_from_index(cursor_index)
+            self.property('cursor').dispatch(self)
 
     def _trigger_refresh_line_options(self, *largs):
         Clock.unschedule(self._refresh_line_options)
@@ -776,7 +1046,7 @@ class TextInput(Widget):
         self._line_options = None
         self._get_line_options()
         self._refresh_text(self.text)
-        self.cursor = self.get_cursor_from_index(len(self.text))
+        self.cursor = self.get_cursor_from_index(self._document.length)
 
     def _trigger_refresh_text(self, *largs):
         Clock.unschedule(self._refresh_text_from_property)
@@ -788,19 +1058,19 @@ class TextInput(Widget):
     def _refresh_text(self, text):
         # Refresh all the lines from a new text.
         # By using cache in internal functions, this method should be fast.
-        _lines, self._lines_flags = self._split_smart(text)
-        self._lines = _lines
-        _create_label = self._create_line_label
-        _lines_labels = self._lines_labels =\
-            [_create_label(x) for x in _lines]
-        self._lines_rects = [Rectangle(texture=x, size=( \
-                             x.size if x else (0, 0))) \
-                             for x in _lines_labels]
-        line_label = _lines_labels[0]
-        if line_label is None:
+        if self._lines and text == self._document.text:
+            # only the size or the options changed: the paragraphs are wrapped
+            # again when they are displayed, see _wrap_rows().
+            self._lines_flags = [x | FL_NEED_WRAP for x in self._lines_flags]
+            self._lines_labels = {}
+        else:
+            self._set_paragraphs(0, len(self._document), 0, len(self._lines),
+                                 text.split('\n'))
+        tiles = self._get_line_tiles(0)
+        if not tiles:
             self.line_height = max(1, self.font_size + self.padding_y)
         else:
-            self.line_height = line_label.height
+            self.line_height = self._create_line_label(tiles[0][2]).height
         self._line_spacing = 2
         # now, if the text change, maybe the cursor is not at the same place as
         # before. so, try to set the cursor on the good place
@@ -827,9 +1097,14 @@ class TextInput(Widget):
         #     - crop the texture coordinates to match the viewport
         #
         # This is the first step of graphics, the second is the selection.
+        # Only the lines inside the viewport get a texture and a rectangle,
+        # and the rectangles are reused from one update to another.
 
-        self.canvas.clear()
-        add = self.canvas.add
+        group = self._lines_group
+        if group is None:
+            group = self._lines_group = InstructionGroup()
+            self.canvas.add(group)
+        self.canvas.remove_group('selection')
 
         lh = self.line_height
         dy = self.line_height + self._line_spacing
@@ -839,73 +1114,109 @@ class TextInput(Widget):
         sy = self.scroll_y
 
         # draw labels
-        rects = self._lines_rects
-        labels = self._lines_labels
+        rects = {}
+        labels = {}
+        pool = self._lines_rects_pool
+        used = 0
         x = self.x + self.padding_x
-        y = self.top - self.padding_y + sy
         miny = self.y + self.padding_y
         maxy = self.top - self.padding_y
-        for line_num, value in enumerate(self._lines):
+
+        # search the lines inside the viewport, with a line of margin to
+        # handle the rounding. Each line is still tested in the loop.
+        first_row = max(0, int(sy / dy) - 1)
+        last_row = int((maxy - miny + sy) / dy) + 2
+        self._wrap_rows(first_row, last_row)
+        last_row = min(len(self._lines), last_row)
+        old_labels = self._lines_labels
+        y = maxy + sy - first_row * dy
+        vw = self.width - self.padding_x * 2
+        vh = self.height - self.padding_y * 2
+        for line_num in xrange(first_row, last_row):
             if miny <= y <= maxy + dy:
-                texture = labels[line_num]
-                if not texture:
+                if line_num in old_labels:
+                    tiles = old_labels[line_num]
+                else:
+                    tiles = self._get_line_tiles(line_num)
+                labels[line_num] = tiles
+                if not tiles:
                     y -= dy
                     continue
-                size = list(texture.size)
-                texc = texture.tex_coords[:]
-
-                # calcul coordinate
-                viewport_pos = sx, 0
-                vw = self.width - self.padding_x * 2
-                vh = self.height - self.padding_y * 2
-                tw, th = map(float, size)
-                oh, ow = tch, tcw = texc[1:3]
-                tcx, tcy = 0, 0
-
-                # adjust size/texcoord according to viewport
-                if vw < tw:
-                    tcw = (vw / tw) * tcw
-                    size[0] = vw
-                if vh < th:
-                    tch = (vh / th) * tch
-                    size[1] = vh
-                if viewport_pos:
-                    tcx, tcy = viewport_pos
-                    tcx = tcx / tw * ow
-                    tcy = tcy / th * oh
-
-                # cropping
-                mlh = lh
+
+                # vertical cropping, the same for all the tiles of the line.
+                # tcy and tch are relative to the texture height, and h is
+                # None if the tiles are not cropped.
+                ry = y
+                h = None
+                tcy, tch = 0, 1.
+                if vh < lh:
+                    tch = vh / float(lh)
+                    h = vh
                 if y > maxy:
-                    vh = (maxy - y + lh)
-                    tch = (vh / float(lh)) * oh
-                    tcy = oh - tch
-                    size[1] = vh
+                    h = (maxy - y + lh)
+                    tch = h / float(lh)
+                    tcy = 1. - tch
                 if y - lh < miny:
                     diff = miny - (y - lh)
-                    y += diff
-                    vh = lh - diff
-                    tch = (vh / float(lh)) * oh
-                    size[1] = vh
-
-                texc = (tcx, tcy+tch, tcx+tcw, tcy+tch, tcx+tcw, tcy, tcx, tcy)
-
-                # add rectangle.
-                r = rects[line_num]
-                r.pos = int(x), int(y - mlh)
-                r.size = size
-                r.texture = texture
-                r.tex_coords = texc
-                add(r)
+                    ry = y + diff
+                    h = lh - diff
+                    tch = h / float(lh)
+                th = lh
+
+                # horizontal cropping, add a rectangle for each tile inside
+                # the viewport.
+                for tile in tiles:
+                    tx, tw = tile[:2]
+                    left = max(tx, sx)
+                    right = min(tx + tw, sx + vw)
+                    if right <= left:
+                        continue
+                    texture = tile[3]
+                    if texture is None:
+                        texture = tile[3] = self._create_line_label(tile[2])
+                        if texture is None:
+                            continue
+                    oh, ow = texture.tex_coords[1:3]
+                    tw = float(texture.width)
+                    tcx = (left - tx) / tw * ow
+                    tcw = (right - left) / tw * ow
+                    ty0 = tcy * oh
+                    ty1 = ty0 + tch * oh
+                    texc = (tcx, ty1, tcx + tcw, ty1,
+                            tcx + tcw, ty0, tcx, ty0)
+
+                    # add rectangle.
+                    if used < len(pool):
+                        r = pool[used]
+                    else:
+                        r = Rectangle()
+                        pool.append(r)
+                        group.add(r)
+                    used += 1
+                    r.pos = int(x + left - sx), int(ry - lh)
+                    th = texture.height if h is None else h
+                    r.size = right - left, th
+                    r.texture = texture
+                    r.tex_coords = texc
+
+                # the line area, used to draw the selection
+                rects[line_num] = ((int(x), int(ry - lh)),
+                                   (min(vw, tiles[-1][0] + tiles[-1][1]), th))
 
             y -= dy
 
+        # release the textures and rectangles outside the viewport
+        for r in pool[used:]:
+            group.remove(r)
+        del pool[used:]
+        self._lines_labels = labels
+        self._lines_rects = rects
+
         self._update_graphics_selection()
 
     def _update_graphics_selection(self):
         if not self._selection:
             return
-        self.canvas.remove_group('selection')
         dy = self.line_height + self._line_spacing
         rects = self._lines_rects
         _padding_y = self.padding_y
@@ -926,9 +1237,9 @@ class TextInput(Widget):
         # passing all the lines can get slow when dealing with a lot of text
         y -= s1r * dy
         for line_num, value in enumerate(self._lines[s1r:s2r], start=s1r):
-            if miny <= y <= maxy + dy:
-                r = rects[line_num]
-                draw_selection(r.pos, r.size, line_num)
+            if miny <= y <= maxy + dy and line_num in rects:
+                pos, size = rects[line_num]
+                draw_selection(pos, size, line_num)
             y -= dy
 
     def _draw_selection(self, pos, size, line_num):
@@ -987,46 +1298,63 @@ class TextInput(Widget):
                 'padding_x': 0,
                 'padding_y': 0,
                 'padding': (0, 0)}
+            self._line_options_key = '\0' + str(kw)
             self._label_cached = Label(**kw)
+            self._text_widths = {}
         return self._line_options
 
+    def _get_line_tiles(self, row):
+        # Split the line of a row in tiles narrower than the maximum texture
+        # width, as a list of [x, width, text, texture]. The width of the text
+        # is measured without rendering it, and the texture of a tile is
+        # created with _create_line_label() only when the tile is displayed.
+        ntext = self._lines[row].replace('\n', '')
+        ntext = ntext.replace('\t', ' ' * self.tab_width)
+        if self.password:
+            ntext = '*' * len(ntext)
+        if not ntext:
+            return []
+        if not self._label_cached:
+            self._get_line_options()
+        get_extents = self._label_cached.get_extents
+        width = get_extents(ntext)[0]
+        if width <= _TILE_WIDTH:
+            return [[0, width, ntext, None]]
+        tiles = []
+        x = start = 0
+        length = len(ntext)
+        # guess the number of characters of a tile from the average width
+        step = max(1, int(length * _TILE_WIDTH / width))
+        while start < length:
+            size = min(step, length - start)
+            w = get_extents(ntext[start:start + size])[0]
+            while w > _TILE_WIDTH and size > 1:
+                size = max(1, int(size * .9))
+                w = get_extents(ntext[start:start + size])[0]
+            tiles.append([x, w, ntext[start:start + size], None])
+            x += w
+            start += size
+        return tiles
+
     def _create_line_label(self, text):
-        # Create a label from a text, using line options
+        # Create a label from a text, using line options. The text must fit
+        # in a texture, see _get_line_tiles().
         ntext = text.replace('\n', '').replace('\t', ' ' * self.tab_width)
         if self.password:
             ntext = '*' * len(ntext)
         kw = self._get_line_options()
-        cid = '%s\0%s' % (ntext, str(kw))
+        # use a digest as key, the text of a line can be very long
+        if isinstance(ntext, unicode):
+            cid = md5(ntext.encode('utf-8'))
+        else:
+            cid = md5(ntext)
+        cid.update(self._line_options_key)
+        cid = cid.digest()
         texture = Cache.get('textinput.label', cid)
 
         if not texture:
-            # FIXME right now, we can't render very long line...
-            # if we move on "VBO" version as fallback, we won't need to do this.
-            # try to found the maximum text we can handle
-            label = None
-            label_len = len(ntext)
-            ld = None
-            while True:
-                try:
-                    label = Label(text=ntext[:label_len], **kw)
-                    label.refresh()
-                    if ld is not None and ld > 2:
-                        ld = int(ld / 2)
-                        label_len += ld
-                    else:
-                        break
-                except:
-                    # exception happen when we tried to render the text
-                    # reduce it...
-                    if ld is None:
-                        ld = len(ntext)
-                    ld = int(ld / 2)
-                    if ld < 2 and label_len:
-                        label_len -= 1
-                    label_len -= ld
-                    continue
-
-            # ok, we found it.
+            label = Label(text=ntext, **kw)
+            label.refresh()
             texture = label.texture
             Cache.append('textinput.label', cid, texture)
         return texture
@@ -1046,48 +1374,35 @@ class TextInput(Widget):
             oldindex = index+1
         yield text[oldindex:]
 
-    def _split_smart(self, text):
-        # Do a "smart" split. If autowidth or autosize is set,
-        # we are not doing smart split, just a split on line break.
-        # Otherwise, we are trying to split as soon as possible, to prevent
+    def _wrap_paragraph(self, text):
+        # Split a paragraph in the lines to display. If the textinput is
+        # multiline, we are trying to split as soon as possible, to prevent
         # overflow on the widget.
-
-        # depend of the options, split the text on line, or word
         if not self.multiline:
-            lines = text.split('\n')
-            lines_flags = [0] + [FL_IS_NEWLINE] * (len(lines) - 1)
-            return lines, lines_flags
+            return [text]
 
-        # no autosize, do wordwrap.
-        x = flags = 0
+        # do wordwrap.
+        x = 0
         line = []
         lines = []
-        lines_flags = []
         width = self.width - self.padding_x * 2
         text_width = self._get_text_width
 
         # try to add each word on current line.
         for word in self._tokenize(text):
-            is_newline = (word == '\n')
+            if not word:
+                continue
             w = text_width(word)
-            # if we have more than the width, or if it's a newline,
-            # push the current line, and create a new one
-            if (x + w > width and line) or is_newline:
+            # if we have more than the width, push the current line, and
+            # create a new one
+            if x + w > width and line:
                 lines.append(''.join(line))
-                lines_flags.append(flags)
-                flags = 0
                 line = []
                 x = 0
-            if is_newline:
-                flags |= FL_IS_NEWLINE
-            else:
-                x += w
-                line.append(word)
-        if line or flags & FL_IS_NEWLINE:
-            lines.append(''.join(line))
-            lines_flags.append(flags)
-
-        return lines, lines_flags
+            x += w
+            line.append(word)
+        lines.append(''.join(line))
+        return lines
 
     def _key_down(self, key, repeat=False):
         displayed_str, internal_str, internal_action, scale = key
@@ -1153,7 +1468,7 @@ class TextInput(Widget):
                     self._paste()
                 elif key == ord('a'): # select all
                     self.selection_from = 0
-                    self.selection_to = len(self.text)
+                    self.selection_to = self._document.length
                     self._update_selection(True)
                 elif key == ord('z'): # undo
                     self.do_undo()
@@ -1421,16 +1736,24 @@ class TextInput(Widget):
     False
     '''
 
+    undo_limit = NumericProperty(1024 * 1024)
+    '''Maximum size of the text kept in the undo/redo history, in bytes. When
+    the history get bigger, the oldest changes are forgotten.
+
+    .. versionadded:: 1.3.0
+
+    :data:`undo_limit` is a :class:`~kivy.properties.NumericProperty`, default
+    to 1048576 (1MB).
+    '''
+
     def _get_text(self):
-        lf = self._lines_flags
-        l = self._lines
-        text = ''.join([('\n' if (lf[i] & FL_IS_NEWLINE) else '') + l[i] \
-                        for i in xrange(len(l))])
-        return text
+        return self._document.text
 
     def _set_text(self, text):
         if self.text == text:
             return
+        # the undo history is made of indexes in the previous text
+        self.reset_undo()
         self._refresh_text(text)
         self.cursor = self.get_cursor_from_index(len(text))
 
@@ -63,6 +63,7 @@ from kivy.properties import NumericProperty, StringProperty, \
         AliasProperty, ReferenceListProperty, ObjectProperty, \
         ListProperty
 from kivy.graphics import Canvas
+from kivy.graphics.transformation import Matrix
 from kivy.base import EventLoop
 from kivy.lang import Builder
 
@@ -73,6 +74,30 @@ class WidgetException(Exception):
     pass
 
 
+# cache of the classes where to_parent() / to_local() can be replaced by the
+# matrix returned by get_local_matrix()
+_matrix_classes = {}
+
+
+def _defining_class(cls, name):
+    for base in cls.__mro__:
+        if name in base.__dict__:
+            return base
+
+
+def _have_local_matrix(cls):
+    try:
+        return _matrix_classes[cls]
+    except KeyError:
+        # if a class override to_parent() or to_local(), it must override
+        # get_local_matrix() too, or we can't trust the matrix.
+        base = _defining_class(cls, 'get_local_matrix')
+        ret = _defining_class(cls, 'to_parent') is base and \
+              _defining_class(cls, 'to_local') is base
+        _matrix_classes[cls] = ret
+        return ret
+
+
 class Widget(EventDispatcher):
     '''Widget class. See module documentation for more information.
 
@@ -228,6 +253,7 @@ class Widget(EventDispatcher):
             raise WidgetException(
                 'add_widget() can be used only with Widget classes.')
         widget.parent = self
+        widget.invalidate_window_matrix()
         if index == 0 or len(self.children) == 0:
             self.children.insert(0, widget)
             self.canvas.add(widget.canvas)
@@ -265,6 +291,7 @@ class Widget(EventDispatcher):
         self.children.remove(widget)
         self.canvas.remove(widget.canvas)
         widget.parent = None
+        widget.invalidate_window_matrix()
 
     def clear_widgets(self):
         '''Remove all widgets added to this widget.
@@ -299,18 +326,67 @@ class Widget(EventDispatcher):
         '''Convert the given coordinate from window to local widget
         coordinates.
         '''
+        if not relative:
+            m = self.get_window_matrix_inv()
+            if m is not None:
+                x, y, z = m.transform_point(x, y, 0)
+                return (x, y)
         if self.parent:
             x, y = self.parent.to_widget(x, y)
         return self.to_local(x, y, relative=relative)
 
     def to_window(self, x, y, initial=True, relative=False):
         '''Transform local coordinates to window coordinates.'''
+        if not relative:
+            if initial:
+                parent = self.parent
+                if not isinstance(parent, Widget):
+                    return (x, y)
+                m = parent.get_window_matrix()
+            else:
+                m = self.get_window_matrix()
+            if m is not None:
+                x, y, z = m.transform_point(x, y, 0)
+                return (x, y)
         if not initial:
             x, y = self.to_parent(x, y, relative=relative)
         if self.parent:
             return self.parent.to_window(x, y, initial=False, relative=relative)
         return (x, y)
 
+    def to_window_points(self, points):
+        '''Same as :func:`to_window`, for a list of points in the format
+        [x1, y1, x2, y2, ...]. Return a new list in the same format.
+
+        .. versionadded:: 1.3.0
+        '''
+        parent = self.parent
+        if not isinstance(parent, Widget):
+            return list(points)
+        m = parent.get_window_matrix()
+        if m is not None:
+            return m.transform_points_2d(points)
+        result = []
+        to_window = self.to_window
+        for i in xrange(0, len(points), 2):
+            result.extend(to_window(points[i], points[i + 1]))
+        return result
+
+    def to_widget_points(self, points):
+        '''Same as :func:`to_widget`, for a list of points in the format
+        [x1, y1, x2, y2, ...]. Return a new list in the same format.
+
+        .. versionadded:: 1.3.0
+        '''
+        m = self.get_window_matrix_inv()
+        if m is not None:
+            return m.transform_points_2d(points)
+        result = []
+        to_widget = self.to_widget
+        for i in xrange(0, len(points), 2):
+            result.extend(to_widget(points[i], points[i + 1]))
+        return result
+
     def to_parent(self, x, y, relative=False):
         '''Transform local coordinates to parent coordinates.
 
@@ -335,6 +411,76 @@ class Widget(EventDispatcher):
             return (x - self.x, y - self.y)
         return (x, y)
 
+    #
+    # Transformation matrices
+    #
+    _window_matrix = None
+    _window_matrix_inv = None
+
+    def get_local_matrix(self):
+        '''Return the :class:`~kivy.graphics.transformation.Matrix` used by
+        :func:`to_parent`, or None if the widget doesn't transform its
+        children. A widget that override :func:`to_parent` and
+        :func:`to_local` must override this method too, and call
+        :func:`invalidate_window_matrix` when the matrix change.
+
+        .. versionadded:: 1.3.0
+        '''
+        return None
+
+    def get_window_matrix(self):
+        '''Return the :class:`~kivy.graphics.transformation.Matrix` that
+        transform the local coordinates of the children into window
+        coordinates, or None if it cannot be computed (one of the parents
+        override :func:`to_parent` without :func:`get_local_matrix`).
+
+        The matrix is cached, and computed again only when the widget or one
+        of its parents is moved in the tree, or change its transformation.
+
+        .. versionadded:: 1.3.0
+        '''
+        m = self._window_matrix
+        if m is not None:
+            return m
+        if not _have_local_matrix(self.__class__):
+            return None
+        parent = self.parent
+        if isinstance(parent, Widget):
+            m = parent.get_window_matrix()
+            if m is None:
+                return None
+        else:
+            m = Matrix()
+        local = self.get_local_matrix()
+        if local is not None:
+            m = m.multiply(local)
+        self._window_matrix = m
+        return m
+
+    def get_window_matrix_inv(self):
+        '''Return the inverse of :func:`get_window_matrix`, or None.
+
+        .. versionadded:: 1.3.0
+        '''
+        m = self._window_matrix_inv
+        if m is None:
+            m = self.get_window_matrix()
+            if m is None:
+                return None
+            m = self._window_matrix_inv = m.inverse()
+        return m
+
+    def invalidate_window_matrix(self):
+        '''Invalidate the cached matrices of the widget and its children.
+
+        .. versionadded:: 1.3.0
+        '''
+        # the children cannot have a cached matrix if we don't have one
+        if self._window_matrix is None:
+            return
+        self._window_matrix = self._window_matrix_inv = None
+        for child in self.children:
+            child.invalidate_window_matrix()
 
     x = NumericProperty(0)
     '''X position of the widget.